@@ -0,0 +1,30 @@
+import React from 'react';
+
+/**
+ * A card thumbnail cut from a set atlas built by scripts/build_atlases.py.
+ * One atlas request serves a whole page of cards, so opening a set costs a
+ * handful of image requests instead of one per card.
+ */
+const CardSprite = ({ sprite, alt, height = 160, className = '' }) => {
+  // Scale the atlas so the sprite renders at the requested height
+  const scale = height / sprite.h;
+
+  return (
+    <div className={`flex items-center justify-center ${className}`} style={{ height }}>
+      <div
+        role="img"
+        aria-label={alt}
+        style={{
+          width: Math.round(sprite.w * scale),
+          height,
+          backgroundImage: `url(${sprite.atlas})`,
+          backgroundPosition: `-${sprite.x * scale}px -${sprite.y * scale}px`,
+          backgroundSize: `${sprite.atlasWidth * scale}px ${sprite.atlasHeight * scale}px`,
+          backgroundRepeat: 'no-repeat'
+        }}
+      />
+    </div>
+  );
+};
+
+export default CardSprite;
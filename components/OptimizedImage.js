@@ -1,5 +1,11 @@
 import React, { useState, useRef, useEffect } from 'react';
-import { getOptimizedImageUrl, getPlaceholderImageUrl } from '../utils/imageUtils';
+import { getOptimizedImageUrl, getPlaceholderImageUrl, getRenditionSrcSet } from '../utils/imageUtils';
+
+// Preferred first; the browser picks the first type it supports
+const RENDITION_FORMATS = [
+  { format: 'avif', type: 'image/avif' },
+  { format: 'webp', type: 'image/webp' }
+];
 
 /**
  * Check if we're in a serverless environment
@@ -22,7 +28,10 @@ const OptimizedImage = ({
   placeholder = null,
   fallback = null,
   onLoad = null,
-  onError = null
+  onError = null,
+  renditions = null,
+  sizes = null,
+  preview = null
 }) => {
   const [isLoaded, setIsLoaded] = useState(false);
   const [isError, setIsError] = useState(false);
@@ -70,7 +79,7 @@ const OptimizedImage = ({
       return fallback || getPlaceholderImageUrl(width, height, 'Image Error');
     }
     if (!isInView) {
-      return placeholder || getPlaceholderImageUrl(width, height, 'Loading...');
+      return placeholder || preview?.dataUri || getPlaceholderImageUrl(width, height, 'Loading...');
     }
     
     // In serverless environments, we might want to be more conservative with image optimization
@@ -86,31 +95,64 @@ const OptimizedImage = ({
     return imageSrc;
   };
 
+  // Responsive renditions from scripts/build_renditions.py, once the image is in view
+  const useRenditions = renditions && isInView && !isError;
+  const jpegSrcSet = useRenditions ? getRenditionSrcSet(renditions, 'jpg') : null;
+  // Intrinsic size reserves the card's aspect ratio before anything loads
+  const intrinsic = useRenditions ? renditions : preview;
+
+  const image = (
+    <img
+      src={getDisplaySrc()}
+      srcSet={jpegSrcSet || undefined}
+      sizes={jpegSrcSet && sizes ? sizes : undefined}
+      width={intrinsic?.width}
+      height={intrinsic?.height}
+      alt={alt}
+      className={`transition-opacity duration-300 ${
+        isLoaded && !isError ? 'opacity-100' : 'opacity-70'
+      } ${className}`}
+      onLoad={handleLoad}
+      onError={handleError}
+      loading={lazy ? 'lazy' : 'eager'}
+      decoding="async"
+      style={{ 
+        maxWidth: '100%', 
+        height: 'auto',
+        // Add explicit dimensions to help with loading
+        width: width ? `${width}px` : 'auto'
+      }}
+    />
+  );
+
   return (
     <div 
       ref={imgRef}
       className={`relative overflow-hidden ${className}`}
-      style={{ minHeight: height }}
+      style={{
+        minHeight: height,
+        // Blurry preview (or its dominant color) until the real image has loaded
+        ...(preview && !isLoaded && {
+          backgroundColor: preview.color,
+          backgroundImage: `url(${preview.dataUri})`,
+          backgroundSize: 'contain',
+          backgroundPosition: 'center',
+          backgroundRepeat: 'no-repeat'
+        })
+      }}
     >
-      <img
-        src={getDisplaySrc()}
-        alt={alt}
-        className={`transition-opacity duration-300 ${
-          isLoaded && !isError ? 'opacity-100' : 'opacity-70'
-        } ${className}`}
-        onLoad={handleLoad}
-        onError={handleError}
-        loading={lazy ? 'lazy' : 'eager'}
-        style={{ 
-          maxWidth: '100%', 
-          height: 'auto',
-          // Add explicit dimensions to help with loading
-          width: width ? `${width}px` : 'auto'
-        }}
-      />
+      {useRenditions ? (
+        <picture>
+          {RENDITION_FORMATS.map(({ format, type }) => {
+            const srcSet = getRenditionSrcSet(renditions, format);
+            return srcSet && <source key={format} type={type} srcSet={srcSet} sizes={sizes || undefined} />;
+          })}
+          {image}
+        </picture>
+      ) : image}
       
       {/* Loading indicator */}
-      {!isLoaded && !isError && isInView && (
+      {!isLoaded && !isError && isInView && !preview && (
         <div className="absolute inset-0 flex items-center justify-center bg-gray-100">
           <div className="animate-spin rounded-full h-8 w-8 border-b-2 border-blue-600"></div>
         </div>
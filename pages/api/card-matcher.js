@@ -1,12 +1,22 @@
 // Card matching service
+import { analyzeTitle } from '../../utils/titleAnalyzer.mjs';
+
 const fs = require('fs').promises;
 const path = require('path');
 
+// Built by scripts/build_catalog_shards.py; optional
+const CATALOG_DIR = path.join(process.cwd(), 'public', 'catalog');
+
+// How much a perfect perceptual-hash match counts on its own (see combineImageCandidates)
+const IMAGE_MATCH_WEIGHT = 0.6;
+
 class CardMatcher {
   constructor() {
     this.cards = [];
     this.sets = {};
     this.initialized = false;
+    this.manifest = undefined;
+    this.cardsById = null;
   }
 
   normalizeMatchText(value = '') {
@@ -63,6 +73,8 @@ class CardMatcher {
       this.cards = [];
       this.sets = {};
       this.initialized = false;
+      this.manifest = undefined;
+      this.cardsById = null;
       console.log('Force reloading card database - cleared previous data');
     }
     
@@ -109,20 +121,125 @@ class CardMatcher {
     }
   }
 
+  // Load the shard manifest once; null when shards have not been built
+  async loadManifest() {
+    if (this.manifest !== undefined) return this.manifest;
+
+    try {
+      const fileData = await fs.readFile(path.join(CATALOG_DIR, 'manifest.json'), 'utf8');
+      this.manifest = JSON.parse(fileData);
+      console.log(`Loaded catalog manifest with ${this.manifest.setCount} sets`);
+    } catch (error) {
+      this.manifest = null;
+    }
+    return this.manifest;
+  }
+
+  // Load a single set shard on demand
+  async loadShard(setKey) {
+    if (this.sets[setKey]) return this.sets[setKey];
+
+    const entry = this.manifest?.sets?.[setKey];
+    if (!entry) return null;
+
+    try {
+      const fileData = await fs.readFile(path.join(CATALOG_DIR, entry.shard), 'utf8');
+      const cardDatabase = JSON.parse(fileData);
+      this.sets[setKey] = {
+        ...cardDatabase.setInfo,
+        cards: cardDatabase.cards.map(card => this.indexCard(card)),
+        fileName: `${setKey}.json`
+      };
+      return this.sets[setKey];
+    } catch (error) {
+      console.error(`Error loading shard ${setKey}:`, error);
+      return null;
+    }
+  }
+
+  // Sets a title most likely belongs to, using the manifest's name and code aliases
+  routeTitle(normalizedTitle) {
+    if (!this.manifest) return [];
+
+    // Aliases are stored as space-separated words and only match whole words
+    const titleWords = normalizedTitle.match(/[a-z0-9]+/g) || [];
+    const words = new Set(titleWords);
+    const padded = ` ${titleWords.join(' ')} `;
+    const matches = [];
+    for (const [setKey, entry] of Object.entries(this.manifest.sets)) {
+      const { names = [], codes = [] } = entry.aliases || {};
+      let best = 0;
+      for (const name of names) {
+        if (padded.includes(` ${name} `)) best = Math.max(best, name.length);
+      }
+      for (const code of codes) {
+        if (words.has(code)) best = Math.max(best, code.length);
+      }
+      if (best > 0) matches.push([best, setKey]);
+    }
+
+    return matches
+      .sort((a, b) => b[0] - a[0] || a[1].localeCompare(b[1]))
+      .map(([, setKey]) => setKey);
+  }
+
   // Get all available sets
   async getSets() {
     await this.loadCards();
     return this.sets;
   }
 
+  // Set headers without cards, from the manifest when available
+  async getSetHeaders() {
+    const manifest = await this.loadManifest();
+    if (manifest) {
+      return Object.fromEntries(
+        Object.entries(manifest.sets).map(([setKey, entry]) => [
+          setKey,
+          { ...entry.setInfo, cardCount: entry.cardCount, hash: entry.hash }
+        ])
+      );
+    }
+
+    await this.loadCards();
+    return Object.fromEntries(
+      Object.entries(this.sets).map(([setKey, { cards, ...setInfo }]) => [
+        setKey,
+        { ...setInfo, cardCount: cards.length }
+      ])
+    );
+  }
+
   // Get specific set
   async getSet(setKey) {
+    const manifest = await this.loadManifest();
+    if (manifest) {
+      return this.loadShard(setKey);
+    }
     await this.loadCards();
     return this.sets[setKey] || null;
   }
 
+  // Match against the shards a title routes to, falling back to the whole catalog.
+  // Sets named by image candidates are searched too and stand in for the fallback.
+  async matchCardRouted(saleTitle, candidateSetKeys = []) {
+    const manifest = await this.loadManifest();
+    if (manifest) {
+      const setKeys = [...new Set([...this.routeTitle(this.normalizeMatchText(saleTitle)), ...candidateSetKeys])];
+      if (setKeys.length > 0) {
+        const sets = await Promise.all(setKeys.map(setKey => this.loadShard(setKey)));
+        const candidates = sets.filter(Boolean).flatMap(set => set.cards);
+        const match = this.matchCard(saleTitle, candidates);
+        if (match || candidateSetKeys.length > 0) return match;
+      }
+    }
+
+    await this.loadCards();
+    return this.matchCard(saleTitle);
+  }
+
   // Fuzzy matching algorithm
-  matchCard(saleTitle) {
+  matchCard(saleTitle, candidates = this.cards) {
     const normalizedTitle = this.normalizeMatchText(saleTitle);
     let bestMatch = null;
     let bestScore = 0;
@@ -132,7 +249,7 @@ class CardMatcher {
       return null;
     }
 
-    for (const card of this.cards) {
+    for (const card of candidates) {
       const score = this.calculateMatchScore(normalizedTitle, card);
       if (score > bestScore && score > 0.5) { // 50% confidence threshold for better matching
         bestScore = score;
@@ -147,6 +264,70 @@ class CardMatcher {
     return bestMatch;
   }
 
+  getCardById(cardId) {
+    if (!this.cardsById) {
+      this.cardsById = new Map(this.cards.map(card => [card.id, card]));
+    }
+    return this.cardsById.get(cardId) || null;
+  }
+
+  // Set key of an image candidate: its own setKey, else the longest set key its id starts with
+  candidateSetKey({ cardId, setKey }) {
+    if (setKey && this.manifest.sets[setKey]) return setKey;
+    let best = null;
+    for (const key of Object.keys(this.manifest.sets)) {
+      if (cardId.startsWith(`${key}-`) && (!best || key.length > best.length)) best = key;
+    }
+    return best;
+  }
+
+  // Cards of image candidates by id, loading only their shards when the manifest exists
+  async getCandidateCards(imageCandidates, setKeys) {
+    if (!this.manifest) {
+      await this.loadCards();
+      return new Map(imageCandidates.map(({ cardId }) => [cardId, this.getCardById(cardId)]));
+    }
+
+    const sets = await Promise.all(setKeys.map(setKey => this.loadShard(setKey)));
+    const wanted = new Set(imageCandidates.map(({ cardId }) => cardId));
+    return new Map(
+      sets.filter(Boolean).flatMap(set => set.cards).filter(card => wanted.has(card.id)).map(card => [card.id, card])
+    );
+  }
+
+  // Blend a title match with perceptual-hash candidates from scripts/image_hash_index.py
+  // ([{ cardId, setKey, similarity }]). Text and image are treated as independent evidence, so a
+  // close photo match can carry a vague title such as "TAG 10 Pokemon card slab".
+  async combineImageCandidates(saleTitle, imageCandidates = [], imageWeight = IMAGE_MATCH_WEIGHT) {
+    if (imageCandidates.length === 0) return this.matchCardRouted(saleTitle);
+
+    const manifest = await this.loadManifest();
+    const setKeys = manifest
+      ? [...new Set(imageCandidates.map(candidate => this.candidateSetKey(candidate)).filter(Boolean))]
+      : [];
+    let bestMatch = await this.matchCardRouted(saleTitle, setKeys);
+    const candidateCards = await this.getCandidateCards(imageCandidates, setKeys);
+    const normalizedTitle = this.normalizeMatchText(saleTitle);
+
+    for (const { cardId, similarity } of imageCandidates) {
+      const card = candidateCards.get(cardId);
+      if (!card) continue;
+
+      const textScore = this.calculateMatchScore(normalizedTitle, card);
+      const confidence = 1 - (1 - textScore) * (1 - similarity * imageWeight);
+      if (confidence > 0.5 && confidence > (bestMatch?.confidence || 0)) {
+        bestMatch = {
+          card,
+          confidence,
+          matchedKeywords: this.getMatchedKeywords(normalizedTitle, card),
+          imageSimilarity: similarity
+        };
+      }
+    }
+
+    return bestMatch;
+  }
+
   calculateMatchScore(title, card) {
     let score = 0;
     let maxPossibleScore = 0;
@@ -254,36 +435,29 @@ class CardMatcher {
 
   // Detect variant from title
   detectVariant(title) {
-    const normalizedTitle = title.toLowerCase();
-    
-    if (normalizedTitle.includes('rainbow') || normalizedTitle.includes('secret')) {
-      return 'Rainbow Rare';
-    }
-    if (normalizedTitle.includes('full art') || normalizedTitle.includes('alt art')) {
-      return 'Full Art';
-    }
-    return 'Regular';
+    return analyzeTitle(title).variant;
   }
 
   // Group sales by card
   async groupSalesByCard(sales) {
-    await this.loadCards();
-    
     const cardSales = {};
     const unmatchedSales = [];
 
     for (const sale of sales) {
-      const match = this.matchCard(sale.title);
+      // Sales may carry imageCandidates looked up from their listing photo
+      const match = await this.combineImageCandidates(sale.title, sale.imageCandidates || []);
       
       if (match) {
         const cardId = match.card.id;
-        const variant = this.detectVariant(sale.title);
+        const analysis = analyzeTitle(sale.title);
+        const variant = analysis.variant;
         
         if (!cardSales[cardId]) {
           cardSales[cardId] = {
             card: match.card,
             sales: [],
-            variants: {}
+            variants: {},
+            grades: {}
           };
         }
         
@@ -292,9 +466,23 @@ class CardMatcher {
           ...sale,
           matchConfidence: match.confidence,
           matchedKeywords: match.matchedKeywords,
-          detectedVariant: variant
+          detectedVariant: variant,
+          grader: analysis.grader,
+          grade: analysis.grade,
+          gradeKey: analysis.gradeKey,
+          language: analysis.language,
+          isLot: analysis.isLot,
+          isProxy: analysis.isProxy
         });
 
+        // Group by grade; lots and proxies would skew a single card's prices
+        if (!analysis.isLot && !analysis.isProxy) {
+          if (!cardSales[cardId].grades[analysis.gradeKey]) {
+            cardSales[cardId].grades[analysis.gradeKey] = [];
+          }
+          cardSales[cardId].grades[analysis.gradeKey].push(sale);
+        }
+
         // Group by variant
         if (!cardSales[cardId].variants[variant]) {
           cardSales[cardId].variants[variant] = [];
@@ -315,6 +503,11 @@ class CardMatcher {
       Object.keys(cardData.variants).forEach(variant => {
         cardData.variants[variant + '_stats'] = this.calculateCardStats(cardData.variants[variant]);
       });
+
+      // Calculate stats per grader and grade ("TAG 10", "TAG 8.5", ...)
+      cardData.gradeStats = Object.fromEntries(
+        Object.entries(cardData.grades).map(([key, gradeSales]) => [key, this.calculateCardStats(gradeSales)])
+      );
     });
 
     return {
@@ -342,9 +535,9 @@ class CardMatcher {
       count: sales.length,
       averagePrice: sum / prices.length,
       medianPrice: sorted[Math.floor(sorted.length / 2)],
-      minPrice: Math.min(...prices),
-      maxPrice: Math.max(...prices),
-      priceRange: Math.max(...prices) - Math.min(...prices),
+      minPrice: sorted[0],
+      maxPrice: sorted[sorted.length - 1],
+      priceRange: sorted[sorted.length - 1] - sorted[0],
       lastSale: sales[0] // Assuming sales are ordered by date
     };
   }
@@ -361,7 +554,7 @@ export default async function handler(req, res) {
   try {
     if (req.method === 'GET') {
       // Return all sets information
-      const { set, action } = req.query;
+      const { set, action, view } = req.query;
       
       if (action === 'reload') {
         // Force reload the card database
@@ -373,6 +566,18 @@ export default async function handler(req, res) {
         });
       }
       
+      if (view === 'headers') {
+        // Set headers only, for listings that do not need cards
+        const headers = await matcher.getSetHeaders();
+        return res.status(200).json({
+          success: true,
+          sets: headers,
+          setCount: Object.keys(headers).length,
+          totalCards: Object.values(headers).reduce((sum, set) => sum + set.cardCount, 0),
+          timestamp: new Date().toISOString()
+        });
+      }
+
       if (set) {
         // Get specific set
         const setData = await matcher.getSet(set);
@@ -1,5 +1,6 @@
 import { getCardMatcher } from './card-matcher';
 import { getEbaySales } from './ebay';
+import { dedupeSales } from '../../utils/saleDedupe';
 
 const normalizeMarketplaceItems = (data, marketplace) =>
   (data.items || []).map(item => ({
@@ -65,7 +66,8 @@ export default async function handler(req, res) {
       fetchMarketplace('uk', debug),
       fetchMarketplace('us', debug)
     ]);
-    const allItems = [...ukData.items, ...usData.items];
+    // The same sold listing can come back from both marketplaces
+    const { sales: allItems, duplicates } = dedupeSales([...ukData.items, ...usData.items]);
     const timestamp = new Date().toISOString();
     const sources = [
       {
@@ -115,6 +117,7 @@ export default async function handler(req, res) {
       totalMatched: matchData.totalMatched,
       totalUnmatched: matchData.totalUnmatched,
       totalSales: allSales.length,
+      duplicatesRemoved: duplicates,
       timestamp,
       sources,
       ...(debug ? { marketplaces: { uk: ukData, us: usData } } : {})
@@ -1,6 +1,39 @@
 import fs from 'fs';
 import path from 'path';
 
+// Built by scripts/build_card_artifacts.py; optional
+const ARTIFACTS_DIR = path.join(process.cwd(), 'public', 'card-data');
+const DEFAULT_SET = 'destined-rivals';
+const SET_KEY_PATTERN = /^[a-z0-9-]+$/;
+const EMPTY_PRICE_STATS = { min: 0, max: 0, average: 0, count: 0 };
+
+// Prebuilt set file (same response shape, stats and recent sales from the sales store), or null
+function readSetArtifact(setKey) {
+  try {
+    return JSON.parse(fs.readFileSync(path.join(ARTIFACTS_DIR, 'sets', `${setKey}.json`), 'utf8'));
+  } catch (error) {
+    return null;
+  }
+}
+
+// An artifact answered as the request asked: without includeSales, cards carry no sales
+function artifactResponse(artifact, includeSales) {
+  if (!includeSales) {
+    return {
+      ...artifact,
+      cards: artifact.cards.map(card => ({
+        ...card,
+        recentSales: [],
+        priceStats: EMPTY_PRICE_STATS,
+        priceQuantiles: {},
+        lastSold: null
+      })),
+      salesMatched: false
+    };
+  }
+  return { ...artifact, salesMatched: artifact.cards.some(card => card.priceStats.count > 0) };
+}
+
 // Simple string similarity function for matching sales to cards
 function calculateSimilarity(str1, str2) {
   const s1 = str1.toLowerCase().replace(/[^a-z0-9\s]/g, '');
@@ -64,8 +97,8 @@ function matchSalesToCards(cards, salesData) {
     // Calculate price statistics
     const prices = matchingSales.map(sale => sale.price);
     const priceStats = prices.length > 0 ? {
-      min: Math.min(...prices),
-      max: Math.max(...prices),
+      min: prices.reduce((a, b) => Math.min(a, b), Infinity),
+      max: prices.reduce((a, b) => Math.max(a, b), -Infinity),
       average: prices.reduce((a, b) => a + b, 0) / prices.length,
       count: prices.length
     } : {
@@ -88,13 +121,31 @@ function matchSalesToCards(cards, salesData) {
 
 export default async function handler(req, res) {
   try {
+    const setKey = req.query.set || DEFAULT_SET;
+    if (!SET_KEY_PATTERN.test(setKey)) {
+      return res.status(400).json({ error: 'Invalid set' });
+    }
+
+    const dataPath = path.join(process.cwd(), 'data', 'cards', `${setKey}.json`);
+    if (!fs.existsSync(dataPath)) {
+      return res.status(404).json({ error: 'Set not found' });
+    }
+    const includeSales = req.query.includeSales === 'true';
+
+    // Serve the prebuilt artifact when there is one: no per-request matching.
+    // The file is also served directly as /card-data/sets/<set>.json
+    const artifact = readSetArtifact(setKey);
+    if (artifact) {
+      res.setHeader('Cache-Control', 'public, s-maxage=3600, stale-while-revalidate=86400');
+      return res.status(200).json(artifactResponse(artifact, includeSales));
+    }
+
     // Load card database
-    const dataPath = path.join(process.cwd(), 'data', 'cards', 'destined-rivals.json');
     const cardData = JSON.parse(fs.readFileSync(dataPath, 'utf8'));
     
     // Optionally fetch recent sales data to match against cards
     let salesData = null;
-    if (req.query.includeSales === 'true') {
+    if (includeSales) {
       try {
         // Fetch from our eBay API
         const salesResponse = await fetch(`${req.headers.origin || 'http://localhost:3000'}/api/ebay`);
@@ -112,7 +163,7 @@ export default async function handler(req, res) {
       cardData.cards.map(card => ({
         ...card,
         recentSales: [],
-        priceStats: { min: 0, max: 0, average: 0, count: 0 },
+        priceStats: EMPTY_PRICE_STATS,
         lastSold: null
       }));
     
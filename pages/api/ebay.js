@@ -1,3 +1,5 @@
+import { describeSources, runScheduled } from '../../utils/sourceScheduler';
+
 const cheerio = require('cheerio');
 
 const MAX_ITEMS = 60;
@@ -760,13 +762,23 @@ export async function getEbaySales({
       : [])
   ];
 
-  for (const [source, attempt] of lightweightAttempts) {
-    const result = await runAttempt(source, attempt, attempts);
-    if (result.data.length > 0) {
-      items = mergeItems([result]);
-      scraperUsed = source;
-      break;
+  // Sources are ordered by measured latency and yield, hedged past their p90
+  // and skipped while their circuit breaker is open (utils/sourceScheduler.js)
+  const scheduled = await runScheduled(marketplaceKey, lightweightAttempts, (attempt) => {
+    if (attempt.late) return;
+    attempts.push(
+      attempt.error
+        ? { source: attempt.source, error: attempt.error, ms: attempt.ms, hedged: attempt.hedged }
+        : { source: attempt.source, count: attempt.count, ms: attempt.ms, hedged: attempt.hedged }
+    );
+    if (attempt.error) {
+      console.log(`${attempt.source} failed:`, attempt.error);
     }
+  });
+  scheduled.skipped.forEach((source) => attempts.push({ source, skipped: 'Circuit breaker open' }));
+  if (scheduled.data.length > 0) {
+    items = mergeItems([scheduled]);
+    scraperUsed = scheduled.source;
   }
 
   if (items.length === 0 && allowBrowserFallback) {
@@ -814,7 +826,7 @@ export async function getEbaySales({
         'No current TAG graded Pokemon sold listings could be parsed from eBay. Recent sold listings do exist, so check scraper attempt logs for eBay access-denied or structure changes.',
       marketplace: marketplaceKey,
       scraperUsed,
-      ...(debug ? { attempts } : {})
+      ...(debug ? { attempts, sourceStats: describeSources(marketplaceKey) } : {})
     };
   }
 
@@ -824,7 +836,7 @@ export async function getEbaySales({
     count: items.length,
     marketplace: marketplaceKey,
     scraperUsed,
-    ...(debug ? { attempts } : {})
+    ...(debug ? { attempts, sourceStats: describeSources(marketplaceKey) } : {})
   };
 }
 
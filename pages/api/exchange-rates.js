@@ -1,71 +1,92 @@
-// API endpoint to fetch current exchange rates
-// This is a simple implementation that could be enhanced with real API calls
+// API endpoint serving exchange rates from the dated table in data/exchange-rates.json
+//
+// Rates are units per 1 GBP. `?date=YYYY-MM-DD` interpolates linearly
+// between the table's dates (nearest end outside it), the same way
+// scripts/exchange_rates.py converts stored sales at their sale date.
+// Without a date the newest table entry is used, so the answer only
+// changes when the table does and can be cached.
+
+const fs = require('fs');
+const path = require('path');
+
+const RATES_PATH = path.join(process.cwd(), 'data', 'exchange-rates.json');
+const DAY_MS = 86400000;
+const DATE_PATTERN = /^\d{4}-\d{2}-\d{2}$/;
+const FALLBACK_RATES = { GBP: 1.0, USD: 1.27 };
+
+let table = null;
+
+const loadTable = () => {
+  if (table) return table;
+  const data = JSON.parse(fs.readFileSync(RATES_PATH, 'utf8'));
+  const series = {};
+  let latest = 0;
+  Object.entries(data.rates || {}).forEach(([currency, points]) => {
+    series[currency] = Object.entries(points)
+      .map(([day, rate]) => [Date.parse(`${day}T00:00:00Z`), rate])
+      .sort((a, b) => a[0] - b[0]);
+    latest = Math.max(latest, series[currency][series[currency].length - 1][0]);
+  });
+  table = { base: data.base || 'GBP', series, latest };
+  return table;
+};
+
+// Linear interpolation between the surrounding points, clamped at the ends
+const interpolate = (points, time) => {
+  if (time <= points[0][0]) return points[0][1];
+  const last = points[points.length - 1];
+  if (time >= last[0]) return last[1];
+  let low = 0;
+  let high = points.length - 1;
+  while (high - low > 1) {
+    const middle = (low + high) >> 1;
+    if (points[middle][0] <= time) low = middle;
+    else high = middle;
+  }
+  const [t0, r0] = points[low];
+  const [t1, r1] = points[high];
+  return r0 + ((r1 - r0) * (time - t0)) / (t1 - t0);
+};
+
+export function ratesOn(time) {
+  const { base, series } = loadTable();
+  const rates = { [base]: 1.0 };
+  Object.entries(series).forEach(([currency, points]) => {
+    rates[currency] = Number(interpolate(points, time).toFixed(6));
+  });
+  return rates;
+}
 
 export default async function handler(req, res) {
   if (req.method !== 'GET') {
     return res.status(405).json({ error: 'Method not allowed' });
   }
 
+  const { date } = req.query;
+  if (date && (!DATE_PATTERN.test(date) || Number.isNaN(Date.parse(`${date}T00:00:00Z`)))) {
+    return res.status(400).json({ success: false, error: 'date must be YYYY-MM-DD' });
+  }
+
   try {
-    // In a real implementation, you would fetch from a currency API like:
-    // - https://api.exchangerate-api.com/v4/latest/GBP
-    // - https://api.fixer.io/latest?base=GBP
-    // - https://openexchangerates.org/api/latest.json
-    
-    // For now, return static rates with some variation to simulate real data
-    const baseRates = {
-      GBP: 1.0,
-      USD: 1.27
-    };
-    
-    // Add small random variation (±2%) to simulate real exchange rate fluctuations
-    const variation = 0.02;
-    const rates = {};
-    
-    Object.keys(baseRates).forEach(currency => {
-      if (currency === 'GBP') {
-        rates[currency] = 1.0; // Base currency
-      } else {
-        const baseRate = baseRates[currency];
-        const randomFactor = 1 + (Math.random() - 0.5) * 2 * variation;
-        rates[currency] = Number((baseRate * randomFactor).toFixed(4));
-      }
-    });
+    const { base, latest } = loadTable();
+    const time = date ? Date.parse(`${date}T00:00:00Z`) : latest;
+    const asOf = new Date(Math.floor(time / DAY_MS) * DAY_MS).toISOString().slice(0, 10);
 
+    res.setHeader('Cache-Control', 'public, s-maxage=86400, stale-while-revalidate=604800');
     res.status(200).json({
       success: true,
-      base: 'GBP',
-      rates,
-      timestamp: new Date().toISOString(),
-      // Add some metadata
-      source: 'simulated', // In production: 'exchangerate-api', 'fixer', etc.
-      lastUpdated: new Date().toISOString()
+      base,
+      rates: ratesOn(time),
+      date: asOf,
+      source: 'data/exchange-rates.json'
     });
-
   } catch (error) {
-    console.error('Error fetching exchange rates:', error);
-    res.status(500).json({ 
-      success: false, 
-      error: 'Failed to fetch exchange rates',
+    console.error('Error loading exchange rates:', error);
+    res.status(500).json({
+      success: false,
+      error: 'Failed to load exchange rates',
       // Fallback rates
-      rates: {
-        GBP: 1.0,
-        USD: 1.27
-      }
+      rates: FALLBACK_RATES
     });
   }
 }
-
-// Example of how to integrate with a real API:
-/*
-async function fetchRealExchangeRates() {
-  const API_KEY = process.env.EXCHANGE_RATE_API_KEY;
-  const response = await fetch(`https://api.exchangerate-api.com/v4/latest/GBP`);
-  const data = await response.json();
-  
-  return {
-    GBP: 1.0,
-    USD: data.rates.USD
-  };
-}
-*/ 
\ No newline at end of file
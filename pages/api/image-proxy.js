@@ -3,12 +3,21 @@ import path from 'path';
 import { createHash } from 'crypto';
 
 const CACHE_DIR = path.join(process.cwd(), 'public', 'cached-images');
+// Maintained by scripts/image_cache.py; see the layout described there
+const INDEX_PATH = path.join(CACHE_DIR, 'index.json');
+const JOURNAL_PATH = path.join(CACHE_DIR, 'journal.ndjson');
+const LEGACY_EXTENSIONS = ['.jpg', '.png', '.webp', '.gif', '.jpeg'];
+// Only journal a hit when the recorded access time is older than this
+const HIT_RESOLUTION_SECONDS = 3600;
 
 // Ensure cache directory exists
 if (!fs.existsSync(CACHE_DIR)) {
   fs.mkdirSync(CACHE_DIR, { recursive: true });
 }
 
+let cacheEntries = null;
+let indexMtime = null;
+
 function getImageHash(url) {
   return createHash('md5').update(url).digest('hex');
 }
@@ -27,6 +36,122 @@ function getImageExtension(url, contentType) {
   return '.jpg'; // Default fallback
 }
 
+function getContentType(filename) {
+  const ext = path.extname(filename).toLowerCase();
+  if (ext === '.png') return 'image/png';
+  if (ext === '.webp') return 'image/webp';
+  if (ext === '.gif') return 'image/gif';
+  return 'image/jpeg';
+}
+
+function nowSeconds() {
+  return Math.floor(Date.now() / 1000);
+}
+
+function appendJournal(record) {
+  fs.appendFile(JOURNAL_PATH, JSON.stringify(record) + '\n', error => {
+    if (error) console.error('Failed to update image cache journal:', error.message);
+  });
+}
+
+/**
+ * Index entries keyed by URL hash, with the journal replayed on top.
+ * Reloaded only when scripts/image_cache.py rewrites the index.
+ */
+function loadCacheEntries() {
+  let mtime = 0;
+  try {
+    mtime = fs.statSync(INDEX_PATH).mtimeMs;
+  } catch (e) {
+    // No index yet
+  }
+  if (cacheEntries && mtime === indexMtime) return cacheEntries;
+
+  let entries = {};
+  try {
+    entries = JSON.parse(fs.readFileSync(INDEX_PATH, 'utf8')).entries || {};
+  } catch (e) {
+    // Missing or unreadable index; start empty
+  }
+  try {
+    for (const line of fs.readFileSync(JOURNAL_PATH, 'utf8').split('\n')) {
+      if (!line) continue;
+      try {
+        const record = JSON.parse(line);
+        if (record.op === 'put') {
+          entries[record.key] = record.entry;
+        } else if (record.op === 'hit' && entries[record.key]) {
+          entries[record.key].lastAccess = Math.max(entries[record.key].lastAccess || 0, record.at || 0);
+        }
+      } catch (e) {
+        // Torn line from an interrupted write
+      }
+    }
+  } catch (e) {
+    // No journal yet
+  }
+
+  cacheEntries = entries;
+  indexMtime = mtime;
+  return entries;
+}
+
+/**
+ * Cached file for a URL hash: an index read, falling back to the flat
+ * <hash>.<ext> files written before the store existed
+ */
+function findCachedImage(imageHash) {
+  const entries = loadCacheEntries();
+  const entry = entries[imageHash];
+  if (entry) {
+    const filepath = path.join(CACHE_DIR, entry.path);
+    if (fs.existsSync(filepath)) {
+      if (nowSeconds() - (entry.lastAccess || 0) > HIT_RESOLUTION_SECONDS) {
+        entry.lastAccess = nowSeconds();
+        appendJournal({ op: 'hit', key: imageHash, at: entry.lastAccess });
+      }
+      return { filepath, contentType: entry.contentType || getContentType(entry.path) };
+    }
+    delete entries[imageHash]; // evicted since the index was loaded
+  }
+
+  for (const ext of LEGACY_EXTENSIONS) {
+    const filepath = path.join(CACHE_DIR, `${imageHash}${ext}`);
+    if (fs.existsSync(filepath)) {
+      return { filepath, contentType: getContentType(filepath) };
+    }
+  }
+  return null;
+}
+
+/**
+ * Store downloaded bytes under their content hash and journal the URL entry
+ */
+function storeCachedImage(imageHash, url, imageBuffer, contentType, etag) {
+  const digest = createHash('sha256').update(imageBuffer).digest('hex');
+  const relative = `objects/${digest.slice(0, 2)}/${digest}${getImageExtension(url, contentType)}`;
+  const filepath = path.join(CACHE_DIR, relative);
+
+  // Identical bytes from another URL are already stored
+  if (!fs.existsSync(filepath)) {
+    fs.mkdirSync(path.dirname(filepath), { recursive: true });
+    const tmpPath = `${filepath}.${process.pid}.tmp`;
+    fs.writeFileSync(tmpPath, imageBuffer);
+    fs.renameSync(tmpPath, filepath);
+  }
+
+  const entry = {
+    path: relative,
+    contentType: (contentType || getContentType(relative)).split(';')[0].trim(),
+    size: imageBuffer.length,
+    etag: etag || null,
+    url,
+    lastAccess: nowSeconds()
+  };
+  loadCacheEntries()[imageHash] = entry;
+  appendJournal({ op: 'put', key: imageHash, entry });
+}
+
 export default async function handler(req, res) {
   if (req.method !== 'GET') {
     return res.status(405).json({ error: 'Method not allowed' });
@@ -49,24 +174,14 @@ export default async function handler(req, res) {
   
   try {
     // Check if image is already cached
-    const existingFiles = fs.readdirSync(CACHE_DIR);
-    const cachedFile = existingFiles.find(file => file.startsWith(imageHash));
+    const cached = findCachedImage(imageHash);
     
-    if (cachedFile) {
-      const cachedPath = path.join(CACHE_DIR, cachedFile);
-      const stats = fs.statSync(cachedPath);
-      const imageBuffer = fs.readFileSync(cachedPath);
+    if (cached) {
+      const imageBuffer = fs.readFileSync(cached.filepath);
       
-      // Set appropriate headers
-      const ext = path.extname(cachedFile).toLowerCase();
-      let contentType = 'image/jpeg';
-      if (ext === '.png') contentType = 'image/png';
-      else if (ext === '.webp') contentType = 'image/webp';
-      else if (ext === '.gif') contentType = 'image/gif';
-      
-      res.setHeader('Content-Type', contentType);
+      res.setHeader('Content-Type', cached.contentType);
       res.setHeader('Cache-Control', 'public, max-age=31536000'); // Cache for 1 year
-      res.setHeader('Content-Length', stats.size);
+      res.setHeader('Content-Length', imageBuffer.length);
       return res.send(imageBuffer);
     }
 
@@ -85,13 +200,8 @@ export default async function handler(req, res) {
     const contentType = response.headers.get('content-type');
     const imageBuffer = Buffer.from(await response.arrayBuffer());
     
-    // Determine file extension
-    const extension = getImageExtension(url, contentType);
-    const filename = `${imageHash}${extension}`;
-    const filepath = path.join(CACHE_DIR, filename);
-    
     // Save to cache
-    fs.writeFileSync(filepath, imageBuffer);
+    storeCachedImage(imageHash, url, imageBuffer, contentType, response.headers.get('etag'));
     
     // Send response
     res.setHeader('Content-Type', contentType || 'image/jpeg');
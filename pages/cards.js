@@ -19,6 +19,7 @@ export default function Cards() {
   const [unmatchedSales, setUnmatchedSales] = useState([]);
   const [selectedCard, setSelectedCard] = useState(null);
   const [lastFetchTime, setLastFetchTime] = useState(null);
+  const [cardTrends, setCardTrends] = useState({});
   const { currency, setCurrency } = useCurrency();
 
   // Filter states
@@ -131,6 +132,18 @@ export default function Cards() {
     });
   }, []);
 
+  // Rolling 7/30/90-day aggregates of the opened card, prebuilt by scripts/rolling_aggregates.py
+  useEffect(() => {
+    const cardId = selectedCard?.card?.id;
+    if (!cardId || cardTrends[cardId]) return;
+    // Same escaping as catalog.card_filename: 'uf-?' -> 'uf-_3f.json'
+    const fileName = String(cardId).replace(/[^A-Za-z0-9._-]/gu, ch => `_${ch.codePointAt(0).toString(16)}`);
+    fetch(`/data/card-trends/${fileName}.json`)
+      .then(response => (response.ok ? response.json() : {}))
+      .catch(() => ({}))
+      .then(trends => setCardTrends(previous => ({ ...previous, [cardId]: trends })));
+  }, [selectedCard]);
+
   const formatPrice = (price) => {
     return convertAndFormatPrice(price, currency, 'GBP');
   };
@@ -354,6 +367,7 @@ export default function Cards() {
 
   const CardModal = ({ card, cardData, onClose }) => {
     if (!card || !cardData) return null;
+    const trends = cardTrends[card.id] || {};
     
     // Get fallback image from most recent eBay sale
     const fallbackImage = cardData.sales && cardData.sales.length > 0 
@@ -469,6 +483,54 @@ export default function Cards() {
                   </div>
                 )}
 
+                {/* Statistics per grade, so different grades aren't averaged together */}
+                {cardData.gradeStats && Object.keys(cardData.gradeStats).length > 0 && (
+                  <div className="bg-gray-50 rounded-lg p-4 mb-4">
+                    <h3 className="font-semibold mb-2">By Grade</h3>
+                    <div className="space-y-1 text-sm">
+                      {Object.entries(cardData.gradeStats)
+                        .filter(([, stats]) => stats)
+                        .sort(([, a], [, b]) => b.count - a.count)
+                        .map(([grade, stats]) => (
+                          <div key={grade} className="flex justify-between">
+                            <span className="font-medium">{grade}</span>
+                            <span className="text-gray-600">
+                              {stats.count} sold • median {formatPrice(stats.medianPrice)} • avg {formatPrice(stats.averagePrice)}
+                            </span>
+                          </div>
+                        ))}
+                    </div>
+                  </div>
+                )}
+
+                {/* Rolling trends per variant */}
+                {Object.keys(trends).length > 0 && (
+                  <div className="bg-gray-50 rounded-lg p-4 mb-4">
+                    <h3 className="font-semibold mb-2">Price Trends</h3>
+                    {Object.entries(trends).map(([variant, windows]) => (
+                      <div key={variant} className="mb-2 last:mb-0">
+                        <p className="text-xs font-medium text-gray-700 mb-1">{variant}</p>
+                        <div className="grid grid-cols-3 gap-2 text-xs">
+                          {['7d', '30d', '90d'].map(window => (
+                            <div key={window} className="bg-white border rounded p-2">
+                              <p className="text-gray-500">{window}</p>
+                              {windows[window] ? (
+                                <>
+                                  <p>Avg: <span className="font-medium">{formatPrice(windows[window].average)}</span></p>
+                                  <p>EWMA: <span className="font-medium">{formatPrice(windows[window].ewma)}</span></p>
+                                  <p>{windows[window].count} sold ({windows[window].perDay}/day)</p>
+                                </>
+                              ) : (
+                                <p className="text-gray-400">No sales</p>
+                              )}
+                            </div>
+                          ))}
+                        </div>
+                      </div>
+                    ))}
+                  </div>
+                )}
+
                 {/* Recent Sales */}
                 <div>
                   <h3 className="font-semibold mb-2">Recent Sales</h3>
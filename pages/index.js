@@ -658,8 +658,8 @@ export default function Home() {
                     }).filter(p => p > 0);
                     
                     if (prices.length === 0) return 'No valid prices';
-                    const min = Math.min(...prices);
-                    const max = Math.max(...prices);
+                    const min = prices.reduce((a, b) => Math.min(a, b), Infinity);
+                    const max = prices.reduce((a, b) => Math.max(a, b), -Infinity);
                     const avg = prices.reduce((a, b) => a + b, 0) / prices.length;
                     const symbol = currency === 'USD' ? '$' : '£';
                     return `Price range: ${symbol}${min.toFixed(2)} - ${symbol}${max.toFixed(2)} • Average: ${symbol}${avg.toFixed(2)}`;
@@ -4,10 +4,13 @@ import Footer from '../components/Footer';
 import CurrencySelector from '../components/CurrencySelector';
 import LanguageSelector from '../components/LanguageSelector';
 import SEOHead from '../components/SEOHead';
+import OptimizedImage from '../components/OptimizedImage';
+import CardSprite from '../components/CardSprite';
 import { useCurrency } from '../contexts/CurrencyContext';
 import { useLanguage } from '../contexts/LanguageContext';
+import { loadCatalogSet } from '../utils/catalogPatches';
 import { convertAndFormatPrice } from '../utils/currency';
-import { getCardImageUrl } from '../utils/imageUtils';
+import { getCardImageUrl, loadAtlasIndex, loadPlaceholderIndex, loadRenditionManifest } from '../utils/imageUtils';
 
 export default function Sets() {
   const [sets, setSets] = useState({});
@@ -19,6 +22,9 @@ export default function Sets() {
   const [cardSales, setCardSales] = useState({});
   const [salesLoading, setSalesLoading] = useState(false);
   const [sortBy, setSortBy] = useState('newest'); // newest, oldest, name-az, name-za
+  const [renditions, setRenditions] = useState({});
+  const [placeholders, setPlaceholders] = useState({});
+  const [sprites, setSprites] = useState({});
   const router = useRouter();
   const { currency } = useCurrency();
   const { language, isJapanese } = useLanguage();
@@ -26,7 +32,8 @@ export default function Sets() {
   const fetchSets = async () => {
     setLoading(true);
     try {
-      const response = await fetch('/api/card-matcher');
+      // Headers only; a set's cards are fetched when it is opened
+      const response = await fetch('/api/card-matcher?view=headers');
       const data = await response.json();
       
       if (data.success) {
@@ -42,6 +49,37 @@ export default function Sets() {
     }
   };
 
+  const openSet = async (setKey) => {
+    // Image sidecars are per set; merged so a slower earlier set can't replace a later one
+    loadRenditionManifest(setKey).then(cards => setRenditions(previous => ({ ...previous, ...cards })));
+    loadPlaceholderIndex(setKey).then(cards => setPlaceholders(previous => ({ ...previous, ...cards })));
+    loadAtlasIndex(setKey).then(cards => setSprites(previous => ({ ...previous, ...cards })));
+
+    try {
+      // Cached and patched locally when possible; the API is the fallback
+      const cached = await loadCatalogSet(setKey).catch(error => {
+        console.error('Error loading cached set:', error);
+        return null;
+      });
+      if (cached) {
+        setSelectedSet(cached);
+        return;
+      }
+
+      const response = await fetch(`/api/card-matcher?set=${encodeURIComponent(setKey)}`);
+      const data = await response.json();
+
+      if (data.success) {
+        setSelectedSet(data.set);
+      } else {
+        setError('Failed to load card set');
+      }
+    } catch (error) {
+      console.error('Error fetching set:', error);
+      setError('Failed to load card set');
+    }
+  };
+
   const fetchSalesData = async () => {
     setSalesLoading(true);
     try {
@@ -305,11 +343,25 @@ export default function Sets() {
               className="bg-white rounded-lg shadow hover:shadow-lg transition-shadow cursor-pointer p-3"
               onClick={() => setSelectedCard(card)}
             >
-              <img
-                src={getCardImage(card)}
-                alt={card.name}
-                className="w-full h-40 object-contain rounded mb-2"
-              />
+              {sprites[card.id] ? (
+                <CardSprite
+                  sprite={sprites[card.id]}
+                  alt={card.name}
+                  height={160}
+                  className="w-full rounded mb-2"
+                />
+              ) : (
+                <OptimizedImage
+                  src={getCardImage(card)}
+                  alt={card.name}
+                  className="w-full h-40 object-contain rounded mb-2"
+                  width={null}
+                  height={160}
+                  renditions={renditions[card.id]}
+                  preview={placeholders[card.id]}
+                  sizes="120px"
+                />
+              )}
               <h3 className="font-semibold text-sm mb-1 line-clamp-2 text-gray-900">{card.name}</h3>
               <p className="text-xs text-gray-600 mb-1">{card.fullNumber || card.cardNumber}</p>
               <p className="text-xs text-gray-500">{card.rarity}</p>
@@ -576,7 +628,7 @@ export default function Sets() {
                   <div
                     key={setKey}
                     className="bg-white rounded-xl shadow-lg hover:shadow-xl transition-shadow cursor-pointer overflow-hidden"
-                    onClick={() => setSelectedSet(setData)}
+                    onClick={() => openSet(setKey)}
                   >
                     <div className="p-6">
                       <div className="flex items-start justify-between mb-4">
@@ -610,7 +662,7 @@ export default function Sets() {
                       <div className="space-y-2 text-sm">
                         <div className="flex justify-between">
                           <span className="text-gray-600">Total Cards:</span>
-                          <span className="font-medium">{setData.cards.length}</span>
+                          <span className="font-medium">{setData.cardCount ?? setData.cards?.length ?? 0}</span>
                         </div>
                         
                         {setInfo.releaseDate && (
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""Benchmark the sold-listing parsers over the stored fixture corpus.
+
+Every page under data/fixtures/ebay/<marketplace>/ is parsed repeatedly
+with scripts/listings.py (HTML search pages and RSS feeds separately) to
+report pages/second and items/second. The parsed raw items are then
+compared with data/fixtures/ebay/expected.json, matched by listing URL, to
+report field-level extraction accuracy for title, price, sold date
+(`soldAt`), listing URL and location.
+
+Requires lxml (`pip install lxml`).
+
+Usage:
+    python3 scripts/bench_listings.py [--rounds 20] [--json]
+"""
+
+import argparse
+import json
+import os
+import time
+from collections import defaultdict
+
+from catalog import REPO_ROOT
+from listings import parse_rss, parse_search_html
+
+FIXTURES_DIR = os.path.join(REPO_ROOT, 'data', 'fixtures', 'ebay')
+FIELDS = ('title', 'price', 'soldAt', 'listingUrl', 'location')
+
+
+def load_corpus(fixtures_dir=FIXTURES_DIR):
+    """[(name, marketplace, kind, bytes)] for every fixture page"""
+    corpus = []
+    for marketplace in sorted(os.listdir(fixtures_dir)):
+        directory = os.path.join(fixtures_dir, marketplace)
+        if not os.path.isdir(directory):
+            continue
+        for name in sorted(os.listdir(directory)):
+            kind = 'rss' if name.endswith('.xml') else 'html' if name.endswith('.html') else None
+            if kind:
+                with open(os.path.join(directory, name), 'rb') as f:
+                    corpus.append((f"{marketplace}/{name}", marketplace, kind, f.read()))
+    return corpus
+
+
+def parse_page(kind, page, marketplace):
+    return parse_rss(page, marketplace) if kind == 'rss' else parse_search_html(page, marketplace)
+
+
+def measure(corpus, rounds):
+    """{kind: {'pages', 'items', 'seconds'}} over `rounds` passes of the corpus"""
+    totals = defaultdict(lambda: {'pages': 0, 'items': 0, 'seconds': 0.0})
+    for _ in range(rounds):
+        for _, marketplace, kind, page in corpus:
+            started = time.perf_counter()
+            items = parse_page(kind, page, marketplace)
+            totals[kind]['seconds'] += time.perf_counter() - started
+            totals[kind]['pages'] += 1
+            totals[kind]['items'] += len(items)
+    return dict(totals)
+
+
+def accuracy(corpus, expected):
+    """{field: (correct, total)}; an expected item that wasn't extracted misses every field"""
+    scores = {field: [0, 0] for field in FIELDS}
+    for name, marketplace, kind, page in corpus:
+        parsed = {item['listingUrl']: item for item in parse_page(kind, page, marketplace)}
+        for want in expected.get(name, []):
+            got = parsed.get(want['listingUrl'], {})
+            for field in FIELDS:
+                scores[field][1] += 1
+                scores[field][0] += int(got.get(field) == want[field])
+    return {field: tuple(score) for field, score in scores.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark sold-listing parsers on the fixture corpus')
+    parser.add_argument('--fixtures', default=FIXTURES_DIR)
+    parser.add_argument('--rounds', type=int, default=20, help='passes over the corpus')
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.fixtures)
+    with open(os.path.join(args.fixtures, 'expected.json'), 'r', encoding='utf-8') as f:
+        expected = json.load(f)
+
+    parse_page('html', corpus[0][3], corpus[0][1])  # warm up lazily compiled state
+    throughput = measure(corpus, args.rounds)
+    scores = accuracy(corpus, expected)
+
+    if args.json:
+        print(json.dumps({
+            'throughput': {
+                kind: {
+                    'pagesPerSecond': round(totals['pages'] / totals['seconds'], 1),
+                    'itemsPerSecond': round(totals['items'] / totals['seconds']),
+                }
+                for kind, totals in throughput.items()
+            },
+            'accuracy': {field: round(correct / total, 4) if total else None for field, (correct, total) in scores.items()},
+        }, indent=2))
+        return
+
+    size = sum(len(page) for _, _, _, page in corpus)
+    print(f"📄 {len(corpus)} fixture pages ({size / 1024:.0f} KB), {args.rounds} rounds")
+    for kind, totals in sorted(throughput.items()):
+        print(f"  {kind}: {totals['pages'] / totals['seconds']:.1f} pages/s, "
+              f"{totals['items'] / totals['seconds']:.0f} items/s "
+              f"({totals['seconds'] / totals['pages'] * 1000:.2f} ms/page)")
+    print("🎯 Field accuracy")
+    for field, (correct, total) in scores.items():
+        print(f"  {field}: {correct}/{total} ({correct / total:.1%})" if total else f"  {field}: no expectations")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env node
+
+// Throughput of utils/titleAnalyzer.mjs on the fixture titles in
+// data/fixtures/ebay/expected.json: titles/second for analyzeTitle alone,
+// plus the grade buckets it assigns so regressions in extraction show up.
+
+import fs from 'fs';
+import path from 'path';
+import { fileURLToPath } from 'url';
+import { analyzeTitle } from '../utils/titleAnalyzer.mjs';
+
+const ROOT = path.join(path.dirname(fileURLToPath(import.meta.url)), '..');
+const EXPECTED_PATH = path.join(ROOT, 'data', 'fixtures', 'ebay', 'expected.json');
+
+function parseArgs(argv) {
+  const args = { rounds: 200, json: false };
+
+  for (let i = 0; i < argv.length; i += 1) {
+    const arg = argv[i];
+
+    if (arg === '--rounds') {
+      args.rounds = parseInt(argv[++i], 10);
+    } else if (arg === '--json') {
+      args.json = true;
+    } else if (arg === '--help' || arg === '-h') {
+      console.log('Usage: node scripts/bench_title_analyzer.mjs [--rounds 200] [--json]');
+      process.exit(0);
+    } else {
+      throw new Error(`Unknown argument: ${arg}`);
+    }
+  }
+
+  return args;
+}
+
+function loadTitles() {
+  const expected = JSON.parse(fs.readFileSync(EXPECTED_PATH, 'utf8'));
+  return Object.values(expected).flatMap(items => items.map(item => item.title));
+}
+
+function measure(titles, rounds) {
+  let checksum = 0;
+  const started = process.hrtime.bigint();
+  for (let round = 0; round < rounds; round += 1) {
+    for (const title of titles) {
+      checksum += analyzeTitle(title).grade || 0;
+    }
+  }
+  const seconds = Number(process.hrtime.bigint() - started) / 1e9;
+  return { titles: titles.length * rounds, seconds, checksum };
+}
+
+const args = parseArgs(process.argv.slice(2));
+const titles = loadTitles();
+
+measure(titles, 5); // warm up the JIT
+const result = measure(titles, args.rounds);
+const buckets = {};
+for (const title of titles) {
+  const { gradeKey } = analyzeTitle(title);
+  buckets[gradeKey] = (buckets[gradeKey] || 0) + 1;
+}
+const titlesPerSecond = Math.round(result.titles / result.seconds);
+
+if (args.json) {
+  console.log(JSON.stringify({ titles: titles.length, rounds: args.rounds, titlesPerSecond, grades: buckets }, null, 2));
+} else {
+  console.log(`📄 ${titles.length} fixture titles, ${args.rounds} rounds`);
+  console.log(`  analyzeTitle: ${titlesPerSecond.toLocaleString()} titles/s ` +
+    `(${(result.seconds / result.titles * 1e6).toFixed(2)} µs/title)`);
+  console.log('🏷️ Grade buckets');
+  Object.entries(buckets)
+    .sort(([, a], [, b]) => b - a)
+    .forEach(([key, count]) => console.log(`  ${key}: ${count}`));
+}
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""Match accepted Best Offers to catalog cards and load them into the sales store.
+
+public/data/best-offers-accepted.json is compiled by hand (see
+BEST-OFFERS-UPDATE-GUIDE.md) and has no card ids. Each entry is matched
+once with scripts/card_match.py; the result is cached in
+data/best-offers-matches.json and only redone when the entry's title
+changes. A match is only linked when the title also quotes the card's
+number and total (card_match.number_agrees); any other candidate is
+reported for manual linking. An entry that carries its own `cardId` is
+taken as is.
+
+Linked entries are appended to scripts/sales_store.py with the `offer`
+flag set, one row per unit sold at `avgSold`, so a card's history,
+the price guide and the rolling aggregates include accepted offers through
+the same per-card index as scraped sales. The store manifest records what
+each ingested id was stored as (card, price, date, quantity). The store is
+append-only, so if an ingested entry later changes, ingest refuses with
+an error naming it instead of leaving the old rows silently in place.
+Placeholder entries, zero prices and dates without a day are skipped until
+they are filled in.
+
+Usage:
+    python3 scripts/best_offers.py match [--rematch]     # show matches, refresh the cache
+    python3 scripts/best_offers.py ingest                # append new matched offers to the store
+"""
+
+import argparse
+import json
+import os
+import re
+from datetime import datetime
+
+from card_match import CardMatcher, number_agrees
+from catalog import REPO_ROOT
+from sales import parse_sold_date
+from sales_store import STORE_DIR, SalesStore, sale_row
+
+OFFERS_PATH = os.path.join(REPO_ROOT, 'public', 'data', 'best-offers-accepted.json')
+MATCHES_PATH = os.path.join(REPO_ROOT, 'data', 'best-offers-matches.json')
+CURRENCY_SYMBOLS = {'GBP': '£', 'USD': '$', 'EUR': '€'}
+CURRENCY_MARKETPLACES = {'GBP': 'uk', 'USD': 'us'}
+# "Dec 15 2024", the other order BEST-OFFERS-UPDATE-GUIDE.md allows
+MONTH_FIRST_PATTERN = re.compile(r'([A-Za-z]{3})[a-z]*\s+(\d{1,2}),?\s+(\d{4})')
+
+
+def load_offers(path=OFFERS_PATH):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f).get('offers', [])
+
+
+def load_matches(path=MATCHES_PATH):
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_matches(matches, path=MATCHES_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(matches, f, indent=1, ensure_ascii=False, sort_keys=True)
+
+
+def offer_date(offer):
+    """Date an offer was accepted, or None when the day is missing or a placeholder"""
+    text = str(offer.get('dateLastSold') or '')
+    sold = parse_sold_date({'soldDate': text})
+    if sold:
+        return sold
+    match = MONTH_FIRST_PATTERN.search(text)
+    if match:
+        try:
+            return datetime.strptime(' '.join(match.groups()), '%b %d %Y').date()
+        except ValueError:
+            pass
+    return None
+
+
+def match_offers(offers, matches, matcher_factory=CardMatcher, rematch=False):
+    """Linked card id per offer id, reusing cached matches of unchanged titles.
+
+    Each entry is {'title', 'cardId', 'candidate', 'confidence'}: cardId is
+    set for a hand-set id or a match whose card number agrees with the
+    title, candidate for the best match otherwise. Returns the number of
+    offers that had to be matched"""
+    matcher = None
+    matched = 0
+    for offer in offers:
+        title = offer.get('listingTitle') or ''
+        cached = matches.get(offer['id'])
+        if offer.get('cardId'):
+            matches[offer['id']] = {'title': title, 'cardId': offer['cardId'], 'candidate': None,
+                                    'confidence': 1.0, 'manual': True}
+            continue
+        if cached and cached['title'] == title and not cached.get('manual') and 'candidate' in cached and not rematch:
+            continue
+        matcher = matcher or matcher_factory()
+        card, confidence = matcher.match(title)
+        linked = card is not None and number_agrees(title, card)
+        matches[offer['id']] = {'title': title, 'cardId': card['id'] if linked else None,
+                                'candidate': card['id'] if card and not linked else None,
+                                'confidence': round(confidence, 4)}
+        matched += 1
+    return matched
+
+
+def offer_sale(offer, match):
+    """Sale record for a matched offer, or None if it can't be stored yet"""
+    sold = offer_date(offer)
+    currency = (offer.get('currency') or 'GBP').upper()
+    if not match.get('cardId') or not sold or currency not in CURRENCY_SYMBOLS:
+        return None
+    try:
+        amount = float(str(offer.get('avgSold') or '').replace(',', ''))
+    except ValueError:
+        return None
+    marketplace = 'us' if 'ebay.com/' in (offer.get('listingUrl') or '') else CURRENCY_MARKETPLACES.get(currency, 'uk')
+    sale = {
+        'title': offer.get('listingTitle') or '',
+        'price': f"{CURRENCY_SYMBOLS[currency]}{amount:.2f}",
+        'soldAt': sold.isoformat(),
+        'listingUrl': offer.get('listingUrl') or '',
+        'marketplace': marketplace,
+        'cardId': match['cardId'],
+        'matchConfidence': match['confidence'],
+        'acceptedOffer': True,
+        'offerId': offer['id'],
+    }
+    return sale if sale_row(sale) else None
+
+
+def stored_as(sale, quantity):
+    """What an ingested offer was written as; a change means its rows are stale"""
+    return {'cardId': sale['cardId'], 'price': sale['price'], 'soldAt': sale['soldAt'], 'quantity': quantity}
+
+
+def offer_quantity(offer):
+    try:
+        return max(1, int(offer.get('quantity') or 1))
+    except (TypeError, ValueError):
+        return 1
+
+
+class OfferConflict(Exception):
+    """Ingested offers whose entry or match has changed since"""
+
+
+def ingest(store, offers, matches):
+    """Append offers not yet in the store; returns (offers ingested, rows written, offers skipped).
+
+    Raises OfferConflict, before writing anything, if an ingested offer now
+    resolves to a different card, price, date or quantity."""
+    ingested = store.manifest.setdefault('offers', {})
+    rows, pending, skipped, conflicts = [], {}, 0, []
+    for offer in offers:
+        sale = offer_sale(offer, matches.get(offer['id'], {}))
+        quantity = offer_quantity(offer)
+        if offer['id'] in ingested:
+            recorded = ingested[offer['id']]
+            if not isinstance(recorded, dict) or not sale or stored_as(sale, quantity) != recorded:
+                conflicts.append(offer['id'])
+            continue
+        if not sale:
+            skipped += 1
+            continue
+        rows.extend([sale_row(sale)] * quantity)
+        pending[offer['id']] = stored_as(sale, quantity)
+    if conflicts:
+        raise OfferConflict(conflicts)
+
+    # The manifest (with the ingested ids) is written by the append, or here when nothing was new
+    ingested.update(pending)
+    written = store.append_rows(rows)
+    if not written:
+        store._write_manifest()
+    return len(pending), written, skipped
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Match accepted Best Offers to cards and ingest them into the sales store')
+    parser.add_argument('--offers', default=OFFERS_PATH)
+    parser.add_argument('--matches', default=MATCHES_PATH)
+    parser.add_argument('--rematch', action='store_true', help='match every offer again, ignoring the cache')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('match', help='match offers to cards and print the result')
+    ingest_parser = subparsers.add_parser('ingest', help='append new matched offers to the sales store')
+    ingest_parser.add_argument('--store', default=STORE_DIR)
+    args = parser.parse_args()
+
+    offers = load_offers(args.offers)
+    matches = load_matches(args.matches)
+    matched = match_offers(offers, matches, rematch=args.rematch)
+    # Drop cached matches of entries that were removed
+    matches = {offer['id']: matches[offer['id']] for offer in offers}
+    save_matches(matches, args.matches)
+    linked = sum(1 for match in matches.values() if match['cardId'])
+    print(f"🔎 {linked}/{len(offers)} offers linked to cards ({matched} matched now, "
+          f"{len(offers) - matched} from cache or set by hand)")
+    unconfirmed = [offer for offer in offers if matches[offer['id']].get('candidate')]
+    if unconfirmed:
+        print(f"⚠️  {len(unconfirmed)} offers need a cardId set by hand (title and card number disagree):")
+        for offer in unconfirmed:
+            match = matches[offer['id']]
+            print(f"  {offer['id']}: best guess {match['candidate']} ({match['confidence']:.2f})  "
+                  f"{offer.get('listingTitle', '')[:70]}")
+
+    if args.command == 'match':
+        for offer in offers:
+            match = matches[offer['id']]
+            if match['cardId']:
+                print(f"  {offer['id']}: ✅ {match['cardId']} ({match['confidence']:.2f})  {offer.get('listingTitle', '')[:70]}")
+            elif not match.get('candidate'):
+                print(f"  {offer['id']}: ❌ unmatched  {offer.get('listingTitle', '')[:70]}")
+    elif args.command == 'ingest':
+        store = SalesStore(args.store)
+        try:
+            added, written, skipped = ingest(store, offers, matches)
+        except OfferConflict as conflict:
+            print(f"❌ Already ingested offers changed since: {', '.join(conflict.args[0])}")
+            print("   The sales store is append-only: give a corrected entry a new id, or rebuild the store "
+                  "(remove it, then run sales_store.py ingest and best_offers.py ingest)")
+            raise SystemExit(1)
+        print(f"✅ Ingested {added} accepted offers ({written} rows) into {args.store}; "
+              f"{skipped} unlinked or incomplete skipped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""Pack each set's card thumbnails into a few sprite atlases.
+
+Thumbnails of every local image in public/card-assets/<set-key>/cards/ are
+laid out on a fixed grid, a page of up to COLUMNS x ROWS cards per atlas:
+
+    public/card-assets/<set-key>/atlas-<page>-<hash>.webp
+    public/card-assets/atlases.json
+    public/card-assets/<set-key>/atlases.json
+
+The index maps card id -> {atlas, atlasWidth, atlasHeight, x, y, w, h} for
+CSS sprites (components/CardSprite.js), split per set for the sets page to
+load when a set is opened, and keeps each set's pages with a
+hash of the card ids and source hashes they were built from. A page is only re-rendered
+when one of its cards' images (or the layout) changes; the hash in its file
+name lets browsers cache atlases indefinitely.
+
+Requires Pillow (`pip install pillow`).
+
+Usage:
+    python3 scripts/build_atlases.py [--set base-set] [--height 240] [--workers 4]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+from PIL import Image
+
+from images import ASSETS_DIR, PUBLIC_DIR, local_card_ids, sha256_file, write_set_sidecars
+
+INDEX_VERSION = 1
+# Cells are sized for the sets grid (h-40) at 1.5x density
+CELL_HEIGHT = 240
+CARD_ASPECT = 63 / 88
+COLUMNS = 10
+ROWS = 8
+QUALITY = 72
+
+
+def index_path(assets_dir=ASSETS_DIR):
+    return os.path.join(assets_dir, 'atlases.json')
+
+
+def public_url(path):
+    return '/' + os.path.relpath(path, PUBLIC_DIR).replace(os.sep, '/')
+
+
+def cell_size(cell_height=CELL_HEIGHT):
+    return round(cell_height * CARD_ASPECT), cell_height
+
+
+def page_hash(members, cell_height):
+    """Hash of a page's layout inputs: its cards, their source hashes and the cell size"""
+    digest = hashlib.sha256(f"{cell_height}:{COLUMNS}:{QUALITY}".encode())
+    for card_id, _, source_hash in members:
+        digest.update(f"\n{card_id}:{source_hash}".encode())
+    return digest.hexdigest()
+
+
+def render_page(path, members, cell_height):
+    """Draw one atlas page (runs in a worker process); returns {card_id: (x, y, w, h)} and its size"""
+    cell_width, cell_height = cell_size(cell_height)
+    columns = min(COLUMNS, len(members))
+    rows = -(-len(members) // columns)
+    atlas = Image.new('RGBA', (columns * cell_width, rows * cell_height), (0, 0, 0, 0))
+
+    boxes = {}
+    for slot, (card_id, source, _) in enumerate(members):
+        with Image.open(source) as image:
+            thumb = image.convert('RGBA')
+        thumb.thumbnail((cell_width, cell_height), Image.LANCZOS)
+        # Centre inside the cell; the box records the thumbnail itself
+        x = (slot % columns) * cell_width + (cell_width - thumb.width) // 2
+        y = (slot // columns) * cell_height + (cell_height - thumb.height) // 2
+        atlas.paste(thumb, (x, y))
+        boxes[card_id] = (x, y, thumb.width, thumb.height)
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    atlas.save(tmp_path, format='WEBP', quality=QUALITY, method=5)
+    os.replace(tmp_path, path)
+    return boxes, atlas.size
+
+
+def load_index(assets_dir=ASSETS_DIR):
+    path = index_path(assets_dir)
+    if not os.path.exists(path):
+        return {'version': INDEX_VERSION, 'sets': {}, 'cards': {}}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def set_members(assets_dir, sets=None):
+    """{set_key: [(card_id, source path, source hash)]} in card-number order"""
+    members = defaultdict(list)
+    for path, card_id in local_card_ids(assets_dir).items():
+        key = os.path.relpath(path, assets_dir).split(os.sep)[0]
+        if not sets or key in sets:
+            members[key].append((card_id, path, sha256_file(path)))
+    for key in members:
+        members[key].sort(key=lambda member: os.path.basename(member[1]))
+    return members
+
+
+def build_atlases(assets_dir=ASSETS_DIR, sets=None, cell_height=CELL_HEIGHT, workers=None, force=False):
+    """Re-render changed atlas pages; returns (index, rendered pages, reused pages)"""
+    index = load_index(assets_dir)
+    previous_sets = index.get('sets', {})
+    per_page = COLUMNS * ROWS
+
+    pages = {}
+    jobs = {}
+    for key, members in sorted(set_members(assets_dir, sets).items()):
+        old_pages = {page['hash']: page for page in previous_sets.get(key, {}).get('pages', [])}
+        pages[key] = []
+        for number, start in enumerate(range(0, len(members), per_page)):
+            chunk = members[start:start + per_page]
+            digest = page_hash(chunk, cell_height)
+            old = old_pages.get(digest)
+            if not force and old and os.path.exists(os.path.join(PUBLIC_DIR, old['url'].lstrip('/'))):
+                pages[key].append(old)
+                continue
+            path = os.path.join(assets_dir, key, f"atlas-{number}-{digest[:10]}.webp")
+            pages[key].append({'hash': digest, 'url': public_url(path)})
+            jobs[(key, number)] = (path, chunk)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {job: pool.submit(render_page, path, chunk, cell_height) for job, (path, chunk) in jobs.items()}
+        for (key, number), future in futures.items():
+            boxes, (width, height) = future.result()
+            pages[key][number].update({'width': width, 'height': height, 'cards': boxes})
+
+    # Sets not rebuilt this run (filtered out with --set) keep their pages
+    for key, entry in previous_sets.items():
+        if key not in pages and sets and key not in sets:
+            pages[key] = entry['pages']
+
+    cards = {}
+    live_files = set()
+    for key, set_pages in pages.items():
+        for page in set_pages:
+            live_files.add(page['url'])
+            for card_id, (x, y, w, h) in page['cards'].items():
+                cards[card_id] = {
+                    'atlas': page['url'], 'atlasWidth': page['width'], 'atlasHeight': page['height'],
+                    'x': x, 'y': y, 'w': w, 'h': h,
+                }
+
+    # Remove superseded atlas files
+    for key in os.listdir(assets_dir):
+        set_dir = os.path.join(assets_dir, key)
+        if not os.path.isdir(set_dir):
+            continue
+        for name in os.listdir(set_dir):
+            path = os.path.join(set_dir, name)
+            if name.startswith('atlas-') and name.endswith('.webp') and public_url(path) not in live_files:
+                os.remove(path)
+
+    index = {
+        'version': INDEX_VERSION,
+        'cellHeight': cell_height,
+        'sets': {key: {'pages': set_pages} for key, set_pages in sorted(pages.items())},
+        'cards': dict(sorted(cards.items())),
+    }
+    with open(index_path(assets_dir), 'w', encoding='utf-8') as f:
+        json.dump(index, f, separators=(',', ':'))
+    write_set_sidecars('atlases.json', INDEX_VERSION, index['cards'], assets_dir)
+    return index, len(jobs), sum(len(set_pages) for set_pages in pages.values()) - len(jobs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Pack card thumbnails into per-set sprite atlases')
+    parser.add_argument('--assets-dir', default=ASSETS_DIR)
+    parser.add_argument('--set', action='append', dest='sets', help='only this set key (repeatable)')
+    parser.add_argument('--height', type=int, default=CELL_HEIGHT, help='thumbnail cell height in pixels')
+    parser.add_argument('--workers', type=int, help='worker processes (default: CPU count)')
+    parser.add_argument('--force', action='store_true', help='re-render unchanged pages')
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    index, rendered, reused = build_atlases(args.assets_dir, args.sets, args.height, args.workers, args.force)
+    print(f"✅ Rendered {rendered} atlas pages, {reused} unchanged, in {time.perf_counter() - started:.1f}s")
+    for key, entry in index['sets'].items():
+        size = sum(os.path.getsize(os.path.join(PUBLIC_DIR, page['url'].lstrip('/'))) for page in entry['pages'])
+        cards = sum(len(page['cards']) for page in entry['pages'])
+        print(f"  {key}: {cards} cards in {len(entry['pages'])} atlases ({size / 1024:.0f} KB)")
+    print(f"📁 Index: {index_path(args.assets_dir)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""Prebuild static per-set and per-card JSON with stats and recent sales.
+
+/api/cards matched every sale against every card on each request. This
+builds the same data ahead of time from the catalog and the columnar sales
+store (scripts/sales_store.py), so set and card views are plain files the
+CDN can serve:
+
+    public/card-data/manifest.json              {"version", "setCount", "cardCount", "sets": {key: {"hash", "cardCount", "salesCount"}}}
+    public/card-data/sets/<set-key>.json        /api/cards shape: {"setInfo", "cards": [card + priceStats, priceQuantiles, recentSales, lastSold], ...}
+    public/card-data/cards/<set-key>/<id>.json  {"card", "priceStats", "priceQuantiles", "trends", "recentSales", "lastSold"}
+
+Stats for every card come from grouped passes over the store (prices in
+GBP at sale-date rates, as scripts/price_guide.py): priceStats pools all of
+a card's sales as a summary and carries the same figures per variant
+("variants") and per grade ("grades"), since a Holo PSA 10 and a Regular
+ungraded copy are different markets. The RECENT_SALES
+newest sales of every card from one sort by card and date. Trends are
+copied from public/data/card-trends.json (scripts/rolling_aggregates.py)
+and priceQuantiles, {"<variant>|<grade>": p10-p90, IQR fences, ...}, from
+the summaries in data/price-sketches.json (scripts/price_sketches.py), when
+they exist. Artifacts carry no build timestamp and are only rewritten
+when their content hash changes, so an unchanged card keeps its file (and
+its CDN cache entry) across builds.
+
+Requires NumPy (`pip install numpy`).
+
+Usage:
+    python3 scripts/build_card_artifacts.py [--output public/card-data] [--store data/sales-store] [--sketches data/price-sketches.json]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import time
+
+import numpy as np
+
+from catalog import CARDS_DIR, REPO_ROOT, card_filename, iter_catalog, normalize_set
+from price_guide import gbp_prices, group_stats
+from price_sketches import SKETCHES_PATH, grade_label
+from rolling_aggregates import TRENDS_PATH
+from sales_store import STORE_DIR, SalesStore
+
+DEFAULT_OUTPUT = os.path.join(REPO_ROOT, 'public', 'card-data')
+MANIFEST_VERSION = 1
+RECENT_SALES = 10
+LISTING_ORIGINS = {'uk': 'https://www.ebay.co.uk', 'us': 'https://www.ebay.com'}
+EMPTY_STATS = {'min': 0, 'max': 0, 'average': 0, 'count': 0, 'variants': {}, 'grades': {}}
+
+
+def artifact_bytes(data):
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def write_if_changed(path, payload):
+    """Write payload unless the file already holds the same bytes; returns (hash, changed)"""
+    digest = hashlib.sha256(payload).hexdigest()[:16]
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            if hashlib.sha256(f.read()).hexdigest()[:16] == digest:
+                return digest, False
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(payload)
+    os.replace(tmp_path, path)
+    return digest, True
+
+
+def stats_entry(stats, i):
+    return {
+        'min': round(float(stats['min'][i]), 2),
+        'max': round(float(stats['max'][i]), 2),
+        'average': round(float(stats['mean'][i]), 2),
+        'median': round(float(stats['median'][i]), 2),
+        'trimmedMean': round(float(stats['trimmed_mean'][i]), 2),
+        'count': int(stats['count'][i]),
+    }
+
+
+def card_stats(store, columns, prices):
+    """{card code: priceStats}: all sales pooled, plus per-variant and per-grade breakdowns"""
+    pooled = group_stats(columns['card'], np.zeros(len(columns['card']), dtype=np.int64), prices)
+    offers = np.bincount(columns['card'], weights=columns['offer'], minlength=len(store.values['card']))
+    result = {
+        int(pooled['card'][i]): {
+            **stats_entry(pooled, i),
+            'acceptedOffers': int(offers[pooled['card'][i]]),
+            'currency': 'GBP',
+            'variants': {},
+            'grades': {},
+        }
+        for i in range(len(pooled['card']))
+    }
+    # Grades group on grader and grade together: a PSA 10 is not a TAG 10
+    grades = columns['grader'].astype(np.int64) * 1000 + columns['grade']
+    for field, groups, label in (('variants', columns['variant'], lambda code: store.values['variant'][code]),
+                                 ('grades', grades, lambda code: grade_label(code // 1000, code % 1000))):
+        stats = group_stats(columns['card'], groups.astype(np.int64), prices)
+        for i in range(len(stats['card'])):
+            result[int(stats['card'][i])][field][label(int(stats['variant'][i]))] = stats_entry(stats, i)
+    return result
+
+
+def recent_sales(store, columns, prices, limit=RECENT_SALES):
+    """{card code: newest `limit` sales}, from one sort by card and descending date"""
+    order = np.lexsort((-columns['ts'], columns['card']))
+    cards = columns['card'][order]
+    starts = np.concatenate([[0], np.flatnonzero(np.diff(cards)) + 1]) if len(cards) else np.empty(0, dtype=np.int64)
+    ranks = np.arange(len(cards)) - np.repeat(starts, np.diff(np.append(starts, len(cards))))
+    selected = order[ranks < limit]
+    records = store.decode({column: values[selected] for column, values in columns.items()})
+    sales = {}
+    for row, record in zip(selected.tolist(), records):
+        listing = record['listingId']
+        sales.setdefault(int(columns['card'][row]), []).append({
+            'soldDate': record['soldAt'],
+            'price': record['price'],
+            'currency': record['currency'],
+            'priceGBP': None if np.isnan(prices[row]) else round(float(prices[row]), 2),
+            'variant': record['variant'],
+            'grader': record['grader'],
+            'grade': record['grade'],
+            'marketplace': record['marketplace'],
+            'listingUrl': f"{LISTING_ORIGINS.get(record['marketplace'], LISTING_ORIGINS['uk'])}/itm/{listing}" if listing else None,
+            'acceptedOffer': record['acceptedOffer'],
+            'matchConfidence': record['matchConfidence'],
+        })
+    return sales
+
+
+def load_trends(path=TRENDS_PATH):
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f).get('cards', {})
+
+
+def load_quantiles(path=SKETCHES_PATH):
+    """{card id: {"<variant>|<grade>": summary}} from the price sketches"""
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        summaries = json.load(f).get('summary', {})
+    quantiles = {}
+    for key, summary in sorted(summaries.items()):
+        card_id, variant_grade = key.split('|', 1)
+        quantiles.setdefault(card_id, {})[variant_grade] = summary
+    return quantiles
+
+
+def build_artifacts(output=DEFAULT_OUTPUT, cards_dir=CARDS_DIR, store_dir=STORE_DIR, trends_path=TRENDS_PATH,
+                    sketches_path=SKETCHES_PATH):
+    """Write changed artifacts and the manifest; returns (manifest, changed file count)"""
+    store = SalesStore(store_dir)
+    columns = store.scan()
+    prices = gbp_prices(store, columns)
+    stats = card_stats(store, columns, prices)
+    sales = recent_sales(store, columns, prices)
+    trends = load_trends(trends_path)
+    quantiles = load_quantiles(sketches_path)
+
+    sets = {}
+    changed = 0
+    expected = set()
+    for key, data in iter_catalog(cards_dir):
+        data = normalize_set(data, key)
+        set_cards = []
+        sales_count = 0
+        for card in data['cards']:
+            code = store.codes['card'].get(card['id'])
+            card_sales = sales.get(code, [])
+            price_stats = stats.get(code, EMPTY_STATS)
+            sales_count += price_stats['count']
+            artifact = f"cards/{key}/{card_filename(card['id'])}"
+            entry = {
+                'priceStats': price_stats,
+                'priceQuantiles': quantiles.get(card['id'], {}),
+                'recentSales': card_sales,
+                'lastSold': card_sales[0]['soldDate'] if card_sales else None,
+            }
+            path = os.path.join(output, artifact)
+            expected.add(path)
+            changed += write_if_changed(path, artifact_bytes(
+                {'card': card, **entry, 'trends': trends.get(card['id'])}))[1]
+            set_cards.append({**card, **entry, 'artifact': artifact})
+
+        path = os.path.join(output, 'sets', f"{key}.json")
+        expected.add(path)
+        digest, was_changed = write_if_changed(path, artifact_bytes({
+            'setInfo': data['setInfo'],
+            'cards': set_cards,
+            'totalCards': len(set_cards),
+            'salesMatched': True,
+        }))
+        changed += was_changed
+        sets[key] = {'hash': digest, 'cardCount': len(set_cards), 'salesCount': sales_count}
+
+    # Drop artifacts of removed sets and cards
+    for folder in ('sets', 'cards'):
+        for root, _, names in os.walk(os.path.join(output, folder)):
+            for name in names:
+                path = os.path.join(root, name)
+                if path not in expected:
+                    os.remove(path)
+                    changed += 1
+
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'setCount': len(sets),
+        'cardCount': sum(entry['cardCount'] for entry in sets.values()),
+        'sets': sets,
+    }
+    changed += write_if_changed(os.path.join(output, 'manifest.json'), artifact_bytes(manifest))[1]
+    return manifest, changed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Prebuild static per-set and per-card JSON artifacts')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT)
+    parser.add_argument('--cards-dir', default=CARDS_DIR)
+    parser.add_argument('--store', default=STORE_DIR)
+    parser.add_argument('--trends', default=TRENDS_PATH, help='rolling aggregates snapshot to copy trends from')
+    parser.add_argument('--sketches', default=SKETCHES_PATH, help='price sketches to copy quantile summaries from')
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    manifest, changed = build_artifacts(args.output, args.cards_dir, args.store, args.trends, args.sketches)
+    elapsed = time.perf_counter() - started
+    print(f"✅ Built artifacts for {manifest['setCount']} sets and {manifest['cardCount']:,} cards "
+          f"in {elapsed:.1f}s, {changed:,} files changed")
+    print(f"📁 Output: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
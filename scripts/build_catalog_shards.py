@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""Build per-set catalog shards and a small manifest under public/catalog.
+
+The manifest carries each set's setInfo, card count, shard hash and the name
+and code aliases used to route a sale title to its likely sets, so consumers
+(CardMatcher, the sets page) load it once and fetch shards on demand. Its
+catalogVersion is the scripts/publish_catalog_deltas.py version the shards
+match (null while the catalog has unpublished changes): a client caches
+shards at that version and later patches them forward with
+utils/catalogPatches.js.
+
+    public/catalog/manifest.json
+    public/catalog/sets/<set-key>.json
+
+Shards are only rewritten when their content hash changes.
+
+Usage:
+    python3 scripts/build_catalog_shards.py [--output public/catalog]
+    python3 scripts/build_catalog_shards.py --route "TAG 10 Pikachu ex Surging Sparks 057/191"
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+from datetime import datetime, timezone
+
+from catalog import CARDS_DIR, REPO_ROOT, iter_catalog, normalize_set, normalize_text
+
+DEFAULT_OUTPUT = os.path.join(REPO_ROOT, 'public', 'catalog')
+MANIFEST_VERSION = 1
+
+# Codes shorter than this (SM, PL, AR, ...) collide with ordinary title words
+MIN_ROUTING_CODE_LENGTH = 3
+WORD_PATTERN = re.compile(r'[a-z0-9]+')
+
+
+def title_words(text):
+    """'Sword & Shield' -> 'sword shield', the form aliases are stored and matched in"""
+    return ' '.join(WORD_PATTERN.findall(normalize_text(text)))
+
+
+def name_variants(name):
+    """Same variations CardMatcher.buildMatchIndex checks for a set name"""
+    name = normalize_text(name)
+    if not name:
+        return []
+    variants = [
+        name,
+        name.replace(' ', ''),
+        re.sub(r'[^a-z0-9]', '', name),
+        name.replace('&', 'and'),
+    ]
+    # "EX Emerald" is usually listed as just "Emerald"
+    if name.startswith('ex ') and len(name) > 6:
+        variants.append(name[3:])
+    return variants
+
+
+def set_aliases(key, info, card_name_words=frozenset()):
+    """Name and code aliases of a set; a one-word name that is also a word of
+    some card's name ('deoxys', 'dragon') would route every title about that
+    card, so it is left out"""
+    names = {title_words(name) for name in name_variants(info.get('name', ''))}
+    names.update(title_words(name) for name in name_variants(key.replace('-', ' ')))
+    codes = [
+        normalize_text(info[field])
+        for field in ('setCode', 'code', 'ptcgoCode', 'symbol')
+        if isinstance(info.get(field), str) and info.get(field)
+    ]
+    return {
+        'names': sorted(name for name in names if len(name) > 3 and not (' ' not in name and name in card_name_words)),
+        'codes': sorted({code for code in codes if len(code) >= MIN_ROUTING_CODE_LENGTH and not code.isdigit()}),
+    }
+
+
+def shard_bytes(data):
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def build_shards(output=DEFAULT_OUTPUT, cards_dir=CARDS_DIR, catalog_version=None):
+    """Write changed shards and the manifest; returns (manifest, changed set keys)"""
+    shard_dir = os.path.join(output, 'sets')
+    os.makedirs(shard_dir, exist_ok=True)
+
+    sets = {}
+    changed = []
+    card_name_words = set()
+    for key, data in iter_catalog(cards_dir):
+        data = normalize_set(data, key)
+        for card in data['cards']:
+            card_name_words.update(title_words(card.get('name')).split())
+        payload = shard_bytes(data)
+        digest = hashlib.sha256(payload).hexdigest()[:16]
+        shard = f"sets/{key}.json"
+        path = os.path.join(output, shard)
+
+        existing = None
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                existing = hashlib.sha256(f.read()).hexdigest()[:16]
+        if existing != digest:
+            with open(path, 'wb') as f:
+                f.write(payload)
+            changed.append(key)
+
+        sets[key] = {
+            'setInfo': data['setInfo'],
+            'cardCount': len(data['cards']),
+            'hash': digest,
+            'shard': shard,
+        }
+    for key, entry in sets.items():
+        entry['aliases'] = set_aliases(key, entry['setInfo'], card_name_words)
+
+    # Drop shards for sets that no longer exist
+    for name in os.listdir(shard_dir):
+        if name.endswith('.json') and name[:-len('.json')] not in sets:
+            os.remove(os.path.join(shard_dir, name))
+            changed.append(name[:-len('.json')])
+
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'catalogVersion': catalog_version,
+        'generatedAt': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'setCount': len(sets),
+        'cardCount': sum(entry['cardCount'] for entry in sets.values()),
+        'sets': sets,
+    }
+    with open(os.path.join(output, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, separators=(',', ':'))
+    return manifest, changed
+
+
+def load_manifest(output=DEFAULT_OUTPUT):
+    with open(os.path.join(output, 'manifest.json'), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def route_title(manifest, title):
+    """Set keys a sale title most likely belongs to, longest alias match first.
+    Aliases only match whole words ('emerald' not in 'emeralds')."""
+    padded = f" {title_words(title)} "
+    words = set(padded.split())
+    matches = []
+    for key, entry in manifest['sets'].items():
+        aliases = entry['aliases']
+        best = max((len(name) for name in aliases['names'] if f" {name} " in padded), default=0)
+        best = max([best] + [len(code) for code in aliases['codes'] if code in words])
+        if best:
+            matches.append((best, key))
+    return [key for _, key in sorted(matches, key=lambda match: (-match[0], match[1]))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build catalog shards and manifest')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT)
+    parser.add_argument('--cards-dir', default=CARDS_DIR)
+    parser.add_argument('--route', help='print the sets a title routes to using an existing manifest')
+    args = parser.parse_args()
+
+    if args.route:
+        print(route_title(load_manifest(args.output), args.route))
+        return
+
+    from publish_catalog_deltas import published_version  # imports this module
+
+    manifest, changed = build_shards(args.output, args.cards_dir, published_version(args.cards_dir))
+    size = os.path.getsize(os.path.join(args.output, 'manifest.json'))
+    print(f"✅ Built {manifest['setCount']} shards ({manifest['cardCount']} cards), {len(changed)} changed, "
+          f"catalog version {manifest['catalogVersion'] if manifest['catalogVersion'] is not None else 'unpublished'}")
+    print(f"📁 Manifest: {os.path.join(args.output, 'manifest.json')} ({size / 1024:.1f} KB)")
+
+
+if __name__ == "__main__":
+    main()
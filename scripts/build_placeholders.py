@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""Compute low-quality placeholders for local card art.
+
+For every image under public/card-assets/<set-key>/cards/ this writes a
+16px-wide WebP data URI, the dominant color and the intrinsic size into a
+sidecar keyed by card id, and splits it per set:
+
+    public/card-assets/placeholders.json              all sets, the state re-runs start from
+    public/card-assets/<set-key>/placeholders.json    {"version", "cards": {card_id: {"hash", "width", "height", "color", "dataUri"}}}
+
+The sets page loads a set's sidecar when the set is opened and
+components/OptimizedImage.js paints the preview and reserves the card's
+aspect ratio before the real image arrives. Images are processed in a
+process pool; sources whose sha256 matches the sidecar are skipped.
+
+Requires Pillow (`pip install pillow`).
+
+Usage:
+    python3 scripts/build_placeholders.py [--workers 8] [--force]
+"""
+
+import argparse
+import base64
+import io
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from PIL import Image
+
+from images import ASSETS_DIR, local_card_ids, sha256_file, write_set_sidecars
+
+SIDECAR_VERSION = 1
+PREVIEW_WIDTH = 16
+PREVIEW_QUALITY = 40
+PALETTE_SIZE = 5
+
+
+def sidecar_path(assets_dir=ASSETS_DIR):
+    return os.path.join(assets_dir, 'placeholders.json')
+
+
+def dominant_color(image):
+    """Most common color of a small adaptive palette, as #rrggbb"""
+    sample = image.convert('RGB')
+    sample.thumbnail((64, 64))
+    quantized = sample.quantize(colors=PALETTE_SIZE, method=Image.Quantize.MEDIANCUT)
+    palette = quantized.getpalette()
+    _, index = max(quantized.getcolors())
+    red, green, blue = palette[index * 3:index * 3 + 3]
+    return f"#{red:02x}{green:02x}{blue:02x}"
+
+
+def placeholder(source):
+    """Placeholder fields for one image (runs in a worker process)"""
+    with Image.open(source) as image:
+        image.load()
+        width, height = image.size
+        image = image.convert('RGBA' if image.mode in ('RGBA', 'LA', 'P') else 'RGB')
+
+        preview = image.resize((PREVIEW_WIDTH, max(1, round(height * PREVIEW_WIDTH / width))), Image.BOX)
+        buffer = io.BytesIO()
+        preview.save(buffer, format='WEBP', quality=PREVIEW_QUALITY, method=6)
+
+        return {
+            'width': width,
+            'height': height,
+            'color': dominant_color(image),
+            'dataUri': 'data:image/webp;base64,' + base64.b64encode(buffer.getvalue()).decode('ascii'),
+        }
+
+
+def load_sidecar(assets_dir=ASSETS_DIR):
+    path = sidecar_path(assets_dir)
+    if not os.path.exists(path):
+        return {'version': SIDECAR_VERSION, 'cards': {}}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def build_placeholders(assets_dir=ASSETS_DIR, workers=None, force=False):
+    """Compute placeholders for changed images; returns (sidecar, computed count, skipped count)"""
+    previous = load_sidecar(assets_dir).get('cards', {})
+    cards = {}
+    jobs = {}
+    for path, card_id in local_card_ids(assets_dir).items():
+        digest = sha256_file(path)
+        entry = previous.get(card_id)
+        if not force and entry and entry.get('hash') == digest:
+            cards[card_id] = entry
+        else:
+            jobs[card_id] = (path, digest)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {card_id: pool.submit(placeholder, path) for card_id, (path, _) in jobs.items()}
+        for card_id, future in futures.items():
+            cards[card_id] = {'hash': jobs[card_id][1], **future.result()}
+
+    sidecar = {'version': SIDECAR_VERSION, 'cards': dict(sorted(cards.items()))}
+    with open(sidecar_path(assets_dir), 'w', encoding='utf-8') as f:
+        json.dump(sidecar, f, separators=(',', ':'))
+    write_set_sidecars('placeholders.json', SIDECAR_VERSION, sidecar['cards'], assets_dir)
+    return sidecar, len(jobs), len(cards) - len(jobs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compute card image placeholders')
+    parser.add_argument('--assets-dir', default=ASSETS_DIR)
+    parser.add_argument('--workers', type=int, help='worker processes (default: CPU count)')
+    parser.add_argument('--force', action='store_true', help='recompute unchanged images')
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    sidecar, computed, skipped = build_placeholders(args.assets_dir, args.workers, args.force)
+    size = os.path.getsize(sidecar_path(args.assets_dir))
+    print(f"✅ Computed {computed} placeholders, {skipped} unchanged ({len(sidecar['cards'])} cards) "
+          f"in {time.perf_counter() - started:.1f}s")
+    print(f"📁 Sidecar: {sidecar_path(args.assets_dir)} ({size / 1024:.1f} KB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""Generate responsive WebP/AVIF (and optional JPEG) renditions of local card art.
+
+Every image under public/card-assets/<set-key>/cards/ is resized to the
+fixed widths below (never upscaled) in a process pool:
+
+    public/card-assets/<set-key>/renditions/<number>-<width>.<format>
+    public/card-assets/renditions.json
+    public/card-assets/<set-key>/renditions.json
+
+The manifest maps card id -> source path, source hash, intrinsic size and
+the available renditions per format and width, and is split per set for
+the sets page to load when a set is opened; components/OptimizedImage.js
+turns an entry into <picture> sources. Images whose source hash matches the
+manifest and whose renditions all exist are skipped.
+
+Requires Pillow with WebP and AVIF support (`pip install pillow`).
+
+Usage:
+    python3 scripts/build_renditions.py [--jpeg] [--workers 8] [--force]
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from PIL import Image
+
+from images import ASSETS_DIR, PUBLIC_DIR, local_card_ids, sha256_file, write_set_sidecars
+
+MANIFEST_VERSION = 1
+WIDTHS = (160, 320, 480)
+FORMATS = ('avif', 'webp')
+SAVE_OPTIONS = {
+    'avif': {'format': 'AVIF', 'quality': 55, 'speed': 6},
+    'webp': {'format': 'WEBP', 'quality': 80, 'method': 4},
+    'jpg': {'format': 'JPEG', 'quality': 82, 'optimize': True, 'progressive': True},
+}
+
+
+def manifest_path(assets_dir=ASSETS_DIR):
+    return os.path.join(assets_dir, 'renditions.json')
+
+
+def public_url(path):
+    return '/' + os.path.relpath(path, PUBLIC_DIR).replace(os.sep, '/')
+
+
+def public_path(url):
+    return os.path.join(PUBLIC_DIR, url.lstrip('/'))
+
+
+def rendition_widths(source_width, widths=WIDTHS):
+    """Requested widths that don't upscale; the source width stands in if all would"""
+    fitting = [width for width in widths if width <= source_width]
+    return fitting or [source_width]
+
+
+def render(source, formats, widths):
+    """Write every rendition of one source image (runs in a worker process)"""
+    stem = os.path.splitext(os.path.basename(source))[0]
+    out_dir = os.path.join(os.path.dirname(os.path.dirname(source)), 'renditions')
+    os.makedirs(out_dir, exist_ok=True)
+
+    with Image.open(source) as image:
+        image.load()
+        source_width, source_height = image.size
+        has_alpha = image.mode in ('RGBA', 'LA') or 'transparency' in image.info
+        image = image.convert('RGBA' if has_alpha else 'RGB')
+
+        renditions = {fmt: {} for fmt in formats}
+        for width in rendition_widths(source_width, widths):
+            height = round(source_height * width / source_width)
+            resized = image.resize((width, height), Image.LANCZOS) if width != source_width else image
+            for fmt in formats:
+                path = os.path.join(out_dir, f"{stem}-{width}.{fmt}")
+                frame = resized.convert('RGB') if fmt == 'jpg' else resized
+                tmp_path = f"{path}.{os.getpid()}.tmp"
+                frame.save(tmp_path, **SAVE_OPTIONS[fmt])
+                os.replace(tmp_path, path)
+                renditions[fmt][str(width)] = public_url(path)
+
+    return {'width': source_width, 'height': source_height, 'renditions': renditions}
+
+
+def load_manifest(assets_dir=ASSETS_DIR):
+    path = manifest_path(assets_dir)
+    if not os.path.exists(path):
+        return {'version': MANIFEST_VERSION, 'cards': {}}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def is_current(entry, digest, formats, widths):
+    """Manifest entry already covers this source hash, format list and width list"""
+    if not entry or entry.get('hash') != digest:
+        return False
+    renditions = entry.get('renditions', {})
+    if set(renditions) != set(formats):
+        return False
+    expected = {str(width) for width in rendition_widths(entry['width'], widths)}
+    return all(
+        set(by_width) == expected and all(os.path.exists(public_path(url)) for url in by_width.values())
+        for by_width in renditions.values()
+    )
+
+
+def build_renditions(assets_dir=ASSETS_DIR, formats=FORMATS, widths=WIDTHS, workers=None, force=False):
+    """Render changed images; returns (manifest, rendered count, skipped count)"""
+    manifest = load_manifest(assets_dir)
+    previous = manifest.get('cards', {})
+    cards = {}
+    jobs = {}
+    for path, card_id in local_card_ids(assets_dir).items():
+        digest = sha256_file(path)
+        entry = previous.get(card_id)
+        if not force and is_current(entry, digest, formats, widths):
+            cards[card_id] = entry
+        else:
+            jobs[card_id] = (path, digest)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {card_id: pool.submit(render, path, formats, widths) for card_id, (path, _) in jobs.items()}
+        for card_id, future in futures.items():
+            path, digest = jobs[card_id]
+            cards[card_id] = {'source': public_url(path), 'hash': digest, **future.result()}
+
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'generatedAt': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'widths': list(widths),
+        'formats': list(formats),
+        'cards': dict(sorted(cards.items())),
+    }
+    with open(manifest_path(assets_dir), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, separators=(',', ':'))
+    write_set_sidecars('renditions.json', MANIFEST_VERSION, manifest['cards'], assets_dir)
+    return manifest, len(jobs), len(cards) - len(jobs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate responsive card image renditions')
+    parser.add_argument('--assets-dir', default=ASSETS_DIR)
+    parser.add_argument('--jpeg', action='store_true', help='also write JPEG fallbacks')
+    parser.add_argument('--workers', type=int, help='worker processes (default: CPU count)')
+    parser.add_argument('--force', action='store_true', help='re-render unchanged images')
+    args = parser.parse_args()
+
+    formats = FORMATS + ('jpg',) if args.jpeg else FORMATS
+    started = time.perf_counter()
+    manifest, rendered, skipped = build_renditions(args.assets_dir, formats, WIDTHS, args.workers, args.force)
+    print(f"✅ Rendered {rendered} images, {skipped} unchanged ({len(manifest['cards'])} cards) "
+          f"in {time.perf_counter() - started:.1f}s")
+
+    sources = sum(os.path.getsize(public_path(entry['source'])) for entry in manifest['cards'].values())
+    smallest = sum(
+        os.path.getsize(public_path(entry['renditions'][fmt][min(entry['renditions'][fmt], key=int)]))
+        for entry in manifest['cards'].values() for fmt in ('webp',)
+    )
+    print(f"📦 Sources {sources / (1024 * 1024):.1f} MB; smallest WebP renditions {smallest / (1024 * 1024):.1f} MB")
+    print(f"📁 Manifest: {manifest_path(args.assets_dir)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""Match listing titles to catalog card ids, for offline jobs.
+
+Scores are the same as CardMatcher.calculateMatchScore in
+pages/api/card-matcher.js (keywords, name words, card number, set; a wrong
+grading company in the title is penalised), with the same 0.5 threshold.
+Instead of scoring every card in the catalog, a title is only scored
+against the cards that share a name word or card number with it, found
+through an inverted index built once per catalog load.
+
+A score above the threshold is not proof: titles that share a name and a
+set word with the wrong printing score well. number_agrees is the stricter
+check for jobs that write results somewhere permanent: the title's
+"number/total" must be the card's own.
+
+Usage:
+    python3 scripts/card_match.py "Umbreon VMAX 215/203 Alt Art Evolving Skies (TAG 8 NM)"
+"""
+
+import argparse
+import re
+import unicodedata
+
+from catalog import CARDS_DIR, iter_catalog, normalize_set, same_number, split_number
+
+MATCH_THRESHOLD = 0.5
+WORD_PATTERN = re.compile(r'[a-z0-9]+')
+OTHER_GRADERS = ('psa', 'cgc', 'bgs')
+# "215/203", "#082/078", "GG50/GG70", "TG12/TG30"
+NUMBER_PATTERN = re.compile(r'\b#?([a-z]*\d+[a-z]*)\s*/\s*([a-z]*\d+)\b')
+
+
+def normalize_match_text(value):
+    """Same normalization as CardMatcher.normalizeMatchText"""
+    value = unicodedata.normalize('NFKD', str(value or '').lower())
+    value = ''.join(ch for ch in value if not unicodedata.combining(ch))
+    return re.sub(r'\s+', ' ', value).strip()
+
+
+def match_index(card):
+    """Normalized matching fields of one card, as CardMatcher.buildMatchIndex"""
+    name_words = [word for word in normalize_match_text(card.get('name')).split(' ') if len(word) > 2]
+    japanese_words = normalize_match_text(card.get('nameJapanese')).split() if card.get('nameJapanese') else []
+    set_name = normalize_match_text(card.get('setName'))
+    return {
+        'keywords': [normalize_match_text(keyword) for keyword in card.get('matchingKeywords') or []],
+        'name_words': name_words,
+        'japanese_words': japanese_words,
+        'full_number': normalize_match_text(card.get('fullNumber')),
+        'card_number': normalize_match_text(card.get('cardNumber')),
+        'set_code': normalize_match_text(card.get('setCode')),
+        'set_names': [set_name, re.sub(r'\s+', '', set_name), re.sub(r'[^a-z0-9]', '', set_name),
+                      set_name.replace('&', 'and', 1)] if set_name else [],
+    }
+
+
+def match_score(title, index):
+    """calculateMatchScore for a normalized title: 0..1"""
+    keyword_matches = sum(keyword in title for keyword in index['keywords'])
+    japanese_matches = sum(word in title for word in index['japanese_words'])
+    score = 2 * (keyword_matches + japanese_matches) / len(index['keywords']) if index['keywords'] else 0
+
+    total_name_words = len(index['name_words']) + len(index['japanese_words'])
+    if total_name_words:
+        score += 4 * (sum(word in title for word in index['name_words']) + japanese_matches) / total_name_words
+
+    if index['full_number'] and index['full_number'] in title:
+        score += 2
+    elif index['card_number'] and index['card_number'] + '/' in title:
+        score += 1.5
+
+    if (index['set_code'] and index['set_code'] in title) or any(name in title for name in index['set_names']):
+        score += 1
+
+    if any(grader in title for grader in OTHER_GRADERS):
+        score *= 0.1
+    return score / 9
+
+
+def number_agrees(title, card):
+    """True if the title quotes the card's number and total, e.g. '216/167' for 216/167"""
+    number, total = split_number(normalize_match_text(card.get('fullNumber') or card.get('cardNumber')))
+    if not number:
+        return False
+    for quoted, quoted_total in NUMBER_PATTERN.findall(normalize_match_text(title)):
+        if same_number(quoted, number) and (total is None or same_number(quoted_total, total)):
+            return True
+    return False
+
+
+class CardMatcher:
+    def __init__(self, cards_dir=CARDS_DIR):
+        self.cards = []
+        self.indexes = []
+        # title word -> positions of cards with that name word or card number
+        self.postings = {}
+        for key, data in iter_catalog(cards_dir):
+            for card in normalize_set(data, key).get('cards', []):
+                position = len(self.cards)
+                index = match_index(card)
+                self.cards.append({**card, 'setKey': key})
+                self.indexes.append(index)
+                words = {word for name in index['name_words'] + index['japanese_words'] for word in WORD_PATTERN.findall(name)}
+                number = index['card_number']
+                if number:
+                    words.update((number, number.lstrip('0') or '0'))
+                for word in words:
+                    self.postings.setdefault(word, []).append(position)
+
+    def candidates(self, title):
+        """Cards sharing a name word or card number with a normalized title"""
+        positions = set()
+        for word in set(WORD_PATTERN.findall(title)):
+            positions.update(self.postings.get(word, ()))
+            if word.isdigit() and word != word.lstrip('0'):
+                positions.update(self.postings.get(word.lstrip('0') or '0', ()))
+        return sorted(positions)
+
+    def match(self, title):
+        """(card, confidence) for the best card above MATCH_THRESHOLD, else (None, best score)"""
+        title = normalize_match_text(title)
+        # Same early filter as CardMatcher.matchCard
+        if 'pokemon' not in title and 'tag' not in title:
+            return None, 0.0
+        best, best_score = None, 0.0
+        for position in self.candidates(title):
+            score = match_score(title, self.indexes[position])
+            if score > best_score:
+                best, best_score = self.cards[position], score
+        if best_score > MATCH_THRESHOLD:
+            return best, best_score
+        return None, best_score
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Match listing titles to catalog cards')
+    parser.add_argument('titles', nargs='+')
+    args = parser.parse_args()
+
+    matcher = CardMatcher()
+    for title in args.titles:
+        card, confidence = matcher.match(title)
+        if card:
+            status = '✅' if number_agrees(title, card) else '⚠️  number differs:'
+            print(f"{status} {card['id']} ({card['name']}, {card.get('setName')}) {confidence:.2f}  {title}")
+        else:
+            print(f"❌ no match (best {confidence:.2f})  {title}")
+
+
+if __name__ == "__main__":
+    main()
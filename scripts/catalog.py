@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""Shared helpers for reading and normalizing the card catalog in data/cards.
+
+Set files were produced by several generations of scripts and use different
+field names for the same data (`number` vs `cardNumber`, `image_url` vs
+`imageUrl`, `keywords` vs `matchingKeywords`, ...). Everything here maps those
+onto the schema `pages/api/card-matcher.js` reads.
+"""
+
+import hashlib
+import json
+import os
+import re
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CARDS_DIR = os.path.join(REPO_ROOT, 'data', 'cards')
+
+# Canonical card fields every set file should carry
+CARD_FIELDS = [
+    'id', 'name', 'setName', 'setCode', 'cardNumber', 'fullNumber',
+    'rarity', 'type', 'hp', 'artist', 'matchingKeywords', 'imageUrl'
+]
+
+# Canonical setInfo fields every set file should carry
+SET_INFO_FIELDS = ['name', 'setCode', 'releaseDate', 'totalCards', 'logo']
+
+# Legacy card keys that are folded into a canonical field and then dropped
+CARD_ALIASES = {
+    'number': 'cardNumber',
+    'image_url': 'imageUrl',
+    'image': 'imageUrl',
+    'images': 'imageUrl',
+    'keywords': 'matchingKeywords',
+    'matching_keywords': 'matchingKeywords',
+    'types': 'type',
+    'set': 'setName',
+    'release_date': 'releaseDate',
+}
+
+# Card ids may hold characters that can't appear in a file name or URL ('uf-?')
+UNSAFE_FILENAME_PATTERN = re.compile(r'[^A-Za-z0-9._-]')
+
+
+def set_files(cards_dir=CARDS_DIR):
+    """Return the sorted list of set JSON files (backups excluded)"""
+    return sorted(
+        os.path.join(cards_dir, name)
+        for name in os.listdir(cards_dir)
+        if name.endswith('.json')
+    )
+
+
+def backup_files(cards_dir=CARDS_DIR):
+    """Return leftover `.backup` files in the catalog directory"""
+    return sorted(
+        os.path.join(cards_dir, name)
+        for name in os.listdir(cards_dir)
+        if name.endswith('.backup')
+    )
+
+
+def set_key(path):
+    """Set key used by the API, e.g. data/cards/surging-sparks.json -> surging-sparks"""
+    return os.path.basename(path)[:-len('.json')]
+
+
+def card_filename(card_id):
+    """URL- and filesystem-safe name for a card id ('uf-?' -> 'uf-_3f.json')"""
+    return UNSAFE_FILENAME_PATTERN.sub(lambda match: f"_{ord(match.group()):x}", str(card_id)) + '.json'
+
+
+def load_set(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def dump_set(data):
+    return json.dumps(data, indent=2, ensure_ascii=False)
+
+
+def save_set(path, data):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(dump_set(data))
+
+
+def file_hash(path):
+    """sha256 of a file's bytes, used for change detection"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def iter_catalog(cards_dir=CARDS_DIR):
+    """Yield (set_key, set_data) for every set file"""
+    for path in set_files(cards_dir):
+        yield set_key(path), load_set(path)
+
+
+def normalize_text(value):
+    """Lowercase and collapse whitespace, like CardMatcher.normalizeMatchText"""
+    return re.sub(r'\s+', ' ', str(value).lower()).strip()
+
+
+def split_number(number):
+    """Split '153/149' into ('153', '149'); '113' gives ('113', None)"""
+    number = str(number).strip()
+    if '/' in number:
+        card_number, total = number.split('/', 1)
+        return card_number.strip(), total.strip()
+    return number, None
+
+
+def same_number(a, b):
+    """Card numbers compare equal regardless of zero padding ('001' == '1')"""
+    return str(a).lstrip('0') == str(b).lstrip('0')
+
+
+def number_total(card):
+    """Denominator of a card's fullNumber/number, or None"""
+    for key in ('fullNumber', 'number', 'cardNumber'):
+        if card.get(key) and '/' in str(card[key]):
+            return split_number(card[key])[1]
+    return None
+
+
+def printed_total(set_data):
+    """Denominator used for fullNumber when a card does not carry one"""
+    info = set_data.get('setInfo', {})
+    for key in ('printedTotal', 'mainSetCards'):
+        if info.get(key):
+            return str(info[key])
+
+    # Fall back to the most common denominator already present in the set
+    counts = {}
+    for card in set_data.get('cards', []):
+        total = number_total(card)
+        if total:
+            counts[total] = counts.get(total, 0) + 1
+    if counts:
+        return max(counts, key=counts.get)
+
+    if info.get('totalCards'):
+        return str(info['totalCards'])
+    return None
+
+
+def normalize_set_info(info):
+    """Map legacy setInfo keys onto the canonical ones"""
+    normalized = dict(info)
+    if not normalized.get('setCode'):
+        for alias in ('code', 'ptcgoCode', 'symbol'):
+            if normalized.get(alias):
+                normalized['setCode'] = normalized[alias]
+                break
+    if not normalized.get('logo') and normalized.get('logoUrl'):
+        normalized['logo'] = normalized['logoUrl']
+    if normalized.get('totalCards') is not None:
+        try:
+            normalized['totalCards'] = int(normalized['totalCards'])
+        except (TypeError, ValueError):
+            pass
+    return normalized
+
+
+def image_from_alias(value):
+    if isinstance(value, dict):
+        return value.get('large') or value.get('small')
+    return value
+
+
+def generate_keywords(card):
+    """Baseline matching keywords for cards that never had any"""
+    name = normalize_text(card.get('name', ''))
+    set_name = normalize_text(card.get('setName', ''))
+    keywords = [name]
+    keywords.extend(word for word in re.sub(r'[^\w\s]', ' ', name).split() if len(word) > 2)
+    if set_name:
+        keywords.append(set_name)
+    if card.get('setCode'):
+        keywords.append(normalize_text(card['setCode']))
+    if card.get('fullNumber'):
+        keywords.append(normalize_text(card['fullNumber']))
+        if set_name:
+            keywords.append(f"{set_name} {normalize_text(card['fullNumber'])}")
+    return keywords
+
+
+def dedupe(values):
+    seen = set()
+    result = []
+    for value in values:
+        if value and value not in seen:
+            seen.add(value)
+            result.append(value)
+    return result
+
+
+def normalize_card(card, key, info, total):
+    """Return a copy of `card` in the canonical schema"""
+    normalized = dict(card)
+    had_keywords = bool(card.get('matchingKeywords') or card.get('matching_keywords'))
+
+    for alias, canonical in CARD_ALIASES.items():
+        if alias not in normalized:
+            continue
+        value = normalized.pop(alias)
+        if canonical == 'imageUrl':
+            value = image_from_alias(value)
+        elif canonical == 'setName':
+            if isinstance(value, dict):
+                for field in ('setCode', 'series', 'releaseDate'):
+                    if value.get(field) and not normalized.get(field):
+                        normalized[field] = value[field]
+            # setName is always taken from setInfo below
+            continue
+        elif canonical == 'matchingKeywords':
+            existing = normalized.get('matchingKeywords') or []
+            normalized['matchingKeywords'] = list(existing) + list(value or [])
+            continue
+        if value and not normalized.get(canonical):
+            normalized[canonical] = value
+
+    # Number fields: cardNumber never carries the denominator
+    card_number, card_total = split_number(normalized.get('cardNumber') or '')
+    if card_number:
+        normalized['cardNumber'] = card_number
+        if not normalized.get('fullNumber'):
+            denominator = card_total or total
+            normalized['fullNumber'] = f"{card_number}/{denominator}" if denominator else card_number
+        else:
+            # Variant prints such as 50a/147 keep their letter in cardNumber
+            full_number = split_number(normalized['fullNumber'])[0]
+            if not same_number(full_number, card_number) and full_number.lstrip('0').startswith(card_number.lstrip('0')):
+                card_number = normalized['cardNumber'] = full_number
+
+    normalized['setName'] = info.get('name') or normalized.get('setName')
+    if info.get('setCode') and not normalized.get('setCode'):
+        normalized['setCode'] = info['setCode']
+    if not isinstance(normalized.get('id'), str) and card_number:
+        normalized['id'] = f"{key}-{card_number}"
+
+    if isinstance(normalized.get('type'), str):
+        normalized['type'] = [normalized['type']]
+
+    # Legacy `keywords` are short tags ("ex", "break"); on their own they make
+    # poor matching keywords, so they are appended to a generated baseline
+    keywords = [str(keyword).strip() for keyword in normalized.get('matchingKeywords') or []]
+    if not had_keywords:
+        keywords = generate_keywords(normalized) + [normalize_text(keyword) for keyword in keywords]
+    normalized['matchingKeywords'] = dedupe(keywords)
+    return normalized
+
+
+def normalize_set(data, key):
+    """Return a copy of a whole set file in the canonical schema"""
+    info = normalize_set_info(data.get('setInfo', {}))
+    total = printed_total(data)
+    cards = [normalize_card(card, key, info, total) for card in data.get('cards', [])]
+
+    # Ids shared by several cards in a set are rebuilt from the card number
+    counts = {}
+    for card in cards:
+        counts[card.get('id')] = counts.get(card.get('id'), 0) + 1
+    for card in cards:
+        if counts[card.get('id')] > 1 and card.get('cardNumber'):
+            card['id'] = f"{key}-{card['cardNumber']}"
+    normalized = {'setInfo': info, 'cards': cards}
+    normalized.update((field, value) for field, value in data.items() if field not in normalized)
+    return normalized
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""Check every catalog imageUrl with HEAD requests and report broken links by set.
+
+Results are cached in data/image-link-cache.json with a TTL that depends on
+the outcome (healthy links are trusted longest, transport errors shortest),
+so a re-run only checks URLs that are new, changed or stale. Servers that
+refuse HEAD get a one-byte ranged GET instead. The report, broken links
+grouped by set with card ids and statuses, goes to stdout and
+data/image-link-report.json.
+
+Requires aiohttp (`pip install aiohttp`).
+
+Usage:
+    python3 scripts/check_image_links.py [--set ex-dragon] [--concurrency 32] [--refresh]
+    python3 scripts/check_image_links.py --base-url http://127.0.0.1:8080   # local stand-in server
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from collections import defaultdict
+
+import aiohttp
+
+from catalog import REPO_ROOT
+from images import iter_card_images
+from prefetch_images import USER_AGENT, rewrite_url
+
+CACHE_PATH = os.path.join(REPO_ROOT, 'data', 'image-link-cache.json')
+REPORT_PATH = os.path.join(REPO_ROOT, 'data', 'image-link-report.json')
+
+DAY = 24 * 60 * 60
+TTL_SECONDS = {
+    'ok': 7 * DAY,
+    'broken': DAY,
+    'error': 60 * 60,
+}
+# Statuses that mean the server won't answer HEAD, not that the image is missing
+HEAD_UNSUPPORTED = {403, 405, 501}
+
+
+def load_cache(path=CACHE_PATH):
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_json(data, path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def classify(status, content_type):
+    if status is None:
+        return 'error'
+    if 200 <= status < 300 and content_type.startswith('image/'):
+        return 'ok'
+    if status in (408, 429) or status >= 500:
+        return 'error'
+    return 'broken'
+
+
+def is_fresh(entry, now):
+    return bool(entry) and entry.get('expiresAt', 0) > now
+
+
+async def check_url(session, fetch_url):
+    """(status, content type, error) for one URL; HEAD first, ranged GET as fallback"""
+    headers = {'User-Agent': USER_AGENT}
+    try:
+        async with session.head(fetch_url, headers=headers, allow_redirects=True) as response:
+            status, content_type = response.status, response.headers.get('Content-Type', '')
+        if status in HEAD_UNSUPPORTED:
+            async with session.get(fetch_url, headers={**headers, 'Range': 'bytes=0-0'}, allow_redirects=True) as response:
+                status, content_type = response.status, response.headers.get('Content-Type', '')
+        return status, content_type, None
+    except (aiohttp.ClientError, asyncio.TimeoutError) as error:
+        return None, '', str(error) or type(error).__name__
+
+
+async def check_all(urls, cache, base_url=None, concurrency=32, per_host=16, timeout=15):
+    """Check urls through one bounded pool, updating cache entries in place"""
+    semaphore = asyncio.Semaphore(concurrency)
+    connector = aiohttp.TCPConnector(limit=concurrency, limit_per_host=per_host, ttl_dns_cache=300)
+    client_timeout = aiohttp.ClientTimeout(total=timeout)
+
+    async def check(session, url):
+        async with semaphore:
+            status, content_type, error = await check_url(session, rewrite_url(url, base_url))
+        outcome = classify(status, content_type)
+        now = int(time.time())
+        cache[url] = {
+            'status': status,
+            'outcome': outcome,
+            'contentType': content_type.split(';')[0].strip() or None,
+            'error': error,
+            'checkedAt': now,
+            'expiresAt': now + TTL_SECONDS[outcome],
+        }
+
+    async with aiohttp.ClientSession(connector=connector, timeout=client_timeout) as session:
+        await asyncio.gather(*(check(session, url) for url in urls))
+
+
+def build_report(cards, cache):
+    """{set_key: {'checked', 'broken': [...], 'errors': [...]}} for sets with problems"""
+    report = defaultdict(lambda: {'checked': 0, 'broken': [], 'errors': []})
+    for key, card, url in cards:
+        entry = cache.get(url)
+        if not entry:
+            continue
+        report[key]['checked'] += 1
+        if entry['outcome'] != 'ok':
+            problems = report[key]['broken' if entry['outcome'] == 'broken' else 'errors']
+            problems.append({
+                'id': card['id'],
+                'cardNumber': card.get('fullNumber') or card.get('cardNumber'),
+                'url': url,
+                'status': entry['status'],
+                'error': entry.get('error'),
+            })
+    return {key: entry for key, entry in sorted(report.items()) if entry['broken'] or entry['errors']}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check catalog image URLs and report broken links')
+    parser.add_argument('--set', action='append', dest='sets', help='only this set key (repeatable)')
+    parser.add_argument('--cache', default=CACHE_PATH)
+    parser.add_argument('--report', default=REPORT_PATH)
+    parser.add_argument('--base-url', help='check against this origin instead, e.g. a local stand-in server')
+    parser.add_argument('--concurrency', type=int, default=32, help='requests in flight')
+    parser.add_argument('--per-host', type=int, default=16, help='connections per host')
+    parser.add_argument('--timeout', type=float, default=15, help='per-request timeout in seconds')
+    parser.add_argument('--refresh', action='store_true', help='ignore cached results')
+    args = parser.parse_args()
+
+    cards = [
+        (key, card, url) for key, card, url in iter_card_images(sets=args.sets)
+        if url.startswith(('http://', 'https://'))
+    ]
+    cache = load_cache(args.cache)
+    now = time.time()
+    stale = sorted({url for _, _, url in cards if args.refresh or not is_fresh(cache.get(url), now)})
+    print(f"🔗 {len(cards)} image URLs, {len(stale)} to check ({len(cards) - len(stale)} cached)")
+
+    started = time.perf_counter()
+    try:
+        asyncio.run(check_all(stale, cache, args.base_url, args.concurrency, args.per_host, args.timeout))
+    finally:
+        save_json(cache, args.cache)
+    elapsed = time.perf_counter() - started
+
+    report = build_report(cards, cache)
+    save_json(report, args.report)
+    broken = sum(len(entry['broken']) for entry in report.values())
+    errors = sum(len(entry['errors']) for entry in report.values())
+    for key, entry in report.items():
+        print(f"  {key}: {len(entry['broken'])} broken, {len(entry['errors'])} unreachable "
+              f"of {entry['checked']}")
+        for problem in entry['broken'][:5]:
+            print(f"    ❌ {problem['id']} ({problem['cardNumber']}): HTTP {problem['status']} {problem['url']}")
+        if len(entry['broken']) > 5:
+            print(f"    ... {len(entry['broken']) - 5} more")
+    print(f"{'✅' if not broken else '⚠️ '} Checked {len(stale)} URLs in {elapsed:.1f}s: "
+          f"{broken} broken, {errors} unreachable across {len(report)} sets")
+    print(f"📁 Report: {args.report}")
+
+
+if __name__ == "__main__":
+    main()
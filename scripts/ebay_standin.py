@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""Local stand-in for eBay search, serving recorded fixtures.
+
+Answers GET /<marketplace>/sch/i.html the way the scrape worker's sources
+expect: `_rss=1` gets rss-keyword.xml, a `graded` search gets
+graded-keyword.html, anything else keyword.html, all read from
+data/fixtures/ebay/<marketplace>/. Point scripts/scrape_worker.py at it
+with --base-url.
+
+Sources can be slowed, failed or blocked to exercise retries and backoff:
+    --delay keyword=800      add 800 ms before answering that source
+    --fail rss-keyword=2     answer 503 to the first 2 requests for that source
+    --block graded-keyword   always answer with a bot-protection page
+
+Requires aiohttp (`pip install aiohttp`).
+
+Usage:
+    python3 scripts/ebay_standin.py [--port 8090] [--delay keyword=800] [--fail rss-keyword=2]
+"""
+
+import argparse
+import asyncio
+import os
+from collections import Counter
+
+from aiohttp import web
+
+from catalog import REPO_ROOT
+
+FIXTURES_DIR = os.path.join(REPO_ROOT, 'data', 'fixtures', 'ebay')
+FIXTURE_FILES = {
+    'keyword': ('keyword.html', 'text/html; charset=utf-8'),
+    'graded-keyword': ('graded-keyword.html', 'text/html; charset=utf-8'),
+    'rss-keyword': ('rss-keyword.xml', 'application/rss+xml; charset=utf-8'),
+}
+BLOCKED_PAGE = '<html><head><title>Pardon Our Interruption...</title></head><body>Checking your browser</body></html>'
+
+
+def source_for(query):
+    if query.get('_rss') == '1':
+        return 'rss-keyword'
+    return 'graded-keyword' if 'graded' in query.get('_nkw', '').lower() else 'keyword'
+
+
+def parse_options(values, default):
+    """['keyword=800', 'rss-keyword'] -> {'keyword': 800.0, 'rss-keyword': default}"""
+    options = {}
+    for value in values or []:
+        source, _, amount = value.partition('=')
+        if source not in FIXTURE_FILES:
+            raise SystemExit(f"Unknown source {source!r}; expected one of {', '.join(FIXTURE_FILES)}")
+        options[source] = float(amount) if amount else default
+    return options
+
+
+def make_app(fixtures_dir=FIXTURES_DIR, delays=None, failures=None, blocked=(), verbose=False):
+    delays = delays or {}
+    failures = failures or {}
+    served = Counter()
+
+    async def search(request):
+        marketplace = request.match_info['marketplace']
+        source = source_for(request.query)
+        served[(marketplace, source)] += 1
+        if verbose:
+            print(f"  {request.method} /{marketplace} {source} #{served[(marketplace, source)]}")
+
+        if source in delays:
+            await asyncio.sleep(delays[source] / 1000)
+        if served[(marketplace, source)] <= failures.get(source, 0):
+            return web.Response(status=503, text='Service Unavailable', headers={'Retry-After': '0'})
+        if source in blocked:
+            return web.Response(text=BLOCKED_PAGE, content_type='text/html')
+
+        name, content_type = FIXTURE_FILES[source]
+        path = os.path.join(fixtures_dir, marketplace, name)
+        if not os.path.exists(path):
+            raise web.HTTPNotFound()
+        with open(path, 'rb') as f:
+            return web.Response(body=f.read(), headers={'Content-Type': content_type})
+
+    app = web.Application()
+    app.router.add_get('/{marketplace}/sch/i.html', search)
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve recorded eBay search fixtures')
+    parser.add_argument('--fixtures', default=FIXTURES_DIR)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8090)
+    parser.add_argument('--delay', action='append', help='source=milliseconds (repeatable)')
+    parser.add_argument('--fail', action='append', help='source[=count]: answer 503 to the first requests')
+    parser.add_argument('--block', action='append', default=[], help='source: always serve a bot-protection page')
+    parser.add_argument('--verbose', '-v', action='store_true')
+    args = parser.parse_args()
+
+    app = make_app(
+        args.fixtures,
+        delays=parse_options(args.delay, 0),
+        failures={source: int(count) for source, count in parse_options(args.fail, 1).items()},
+        blocked=set(parse_options(args.block, 0)),
+        verbose=args.verbose,
+    )
+    print(f"🧪 Serving {args.fixtures} on http://{args.host}:{args.port}")
+    web.run_app(app, host=args.host, port=args.port, print=None)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""Dated exchange rates and sale-date currency conversion.
+
+data/exchange-rates.json holds, per currency, units per 1 GBP on a set of
+dates:
+
+    {"base": "GBP", "rates": {"USD": {"2025-01-01": 1.25, "2025-04-01": 1.29, ...}, "EUR": {...}}}
+
+The rate on any day is interpolated linearly between the surrounding
+dates (the nearest end outside the table), so a sale is converted at the
+rate of the day it sold rather than today's. RateTable.normalize converts
+whole store columns to GBP and USD at once: one np.interp per currency
+over all rows, no per-sale Python. pages/api/exchange-rates.js serves the
+same table.
+
+Converted amounts are never stored. The sales store keeps each sale's own
+currency, and its readers (scripts/price_guide.py gbp_prices, used by the
+price guide, sketches, rolling aggregates and card artifacts, and
+scripts/near_duplicates.py) convert when they read, so rates imported
+later apply to every sale on their next run.
+
+Requires NumPy (`pip install numpy`).
+
+Usage:
+    python3 scripts/exchange_rates.py show [--date 2025-06-12]
+    python3 scripts/exchange_rates.py import usd.csv --currency USD   # CSV rows: date,units per GBP
+"""
+
+import argparse
+import csv
+import json
+import os
+from datetime import date
+
+import numpy as np
+
+from catalog import REPO_ROOT
+
+RATES_PATH = os.path.join(REPO_ROOT, 'data', 'exchange-rates.json')
+BASE = 'GBP'
+DAY = 86400
+EPOCH = date(1970, 1, 1).toordinal()
+
+
+def day_number(day):
+    return day.toordinal() - EPOCH
+
+
+class RateTable:
+    def __init__(self, path=RATES_PATH):
+        self.path = path
+        with open(path, 'r', encoding='utf-8') as f:
+            self.data = json.load(f)
+        self.series = {}
+        for currency, points in self.data['rates'].items():
+            days = sorted(points)
+            self.series[currency] = (
+                np.array([day_number(date.fromisoformat(day)) for day in days], dtype=np.int64),
+                np.array([points[day] for day in days], dtype=np.float64),
+            )
+
+    @property
+    def currencies(self):
+        return [BASE, *sorted(self.series)]
+
+    @property
+    def latest(self):
+        """Newest date in the table"""
+        return date.fromordinal(EPOCH + int(max(days[-1] for days, _ in self.series.values())))
+
+    def per_gbp(self, currency, days):
+        """Units of `currency` per GBP on each day number (NaN for unknown currencies)"""
+        days = np.asarray(days)
+        if currency == BASE:
+            return np.ones(days.shape)
+        if currency not in self.series:
+            return np.full(days.shape, np.nan)
+        known_days, rates = self.series[currency]
+        return np.interp(days, known_days, rates)
+
+    def rate_on(self, currency, day):
+        return float(self.per_gbp(currency, [day_number(day)])[0])
+
+    def rates_on(self, day):
+        """{currency: units per GBP} on one date"""
+        return {currency: round(self.rate_on(currency, day), 6) for currency in self.currencies}
+
+    def normalize(self, amounts, currency_codes, currency_names, timestamps, targets=(BASE, 'USD')):
+        """Amounts in their row's currency -> {target: amounts} at each row's sale-date rate.
+
+        currency_codes index into currency_names (the store's dictionary
+        encoding); timestamps are Unix seconds."""
+        amounts = np.asarray(amounts, dtype=np.float64)
+        codes = np.asarray(currency_codes)
+        days = np.asarray(timestamps) // DAY
+        source = np.full(len(amounts), np.nan)
+        for code, currency in enumerate(currency_names):
+            rows = codes == code
+            if rows.any():
+                source[rows] = self.per_gbp(currency, days[rows])
+        gbp = amounts / source
+        return {target: gbp if target == BASE else gbp * self.per_gbp(target, days) for target in targets}
+
+    def convert(self, amount, currency, day, target=BASE):
+        """One amount on one date"""
+        return amount / self.rate_on(currency, day) * self.rate_on(target, day)
+
+    def merge(self, currency, points):
+        """Add or overwrite {iso date: units per GBP} for one currency"""
+        self.data['rates'].setdefault(currency, {}).update(points)
+        self.data['rates'][currency] = dict(sorted(self.data['rates'][currency].items()))
+
+    def save(self):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(self.data, f, indent=2)
+            f.write('\n')
+
+
+def read_rate_csv(path, invert=False):
+    """{iso date: rate} from date,rate rows (header and unparseable rows skipped)"""
+    points = {}
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        for row in csv.reader(f):
+            try:
+                day, rate = date.fromisoformat(row[0].strip()), float(row[1])
+            except (IndexError, ValueError):
+                continue
+            if rate > 0:
+                points[day.isoformat()] = round(1 / rate if invert else rate, 6)
+    return points
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Dated exchange-rate table and sale-date conversion')
+    parser.add_argument('--rates', default=RATES_PATH)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    show_parser = subparsers.add_parser('show', help='rates on one date')
+    show_parser.add_argument('--date', type=date.fromisoformat, help='default: newest date in the table')
+
+    import_parser = subparsers.add_parser('import', help='merge a date,rate CSV into the table')
+    import_parser.add_argument('csv')
+    import_parser.add_argument('--currency', required=True)
+    import_parser.add_argument('--invert', action='store_true', help='CSV rates are GBP per unit, not units per GBP')
+    args = parser.parse_args()
+
+    table = RateTable(args.rates)
+    if args.command == 'show':
+        day = args.date or table.latest
+        print(f"💱 Rates on {day} (per 1 {BASE})")
+        for currency, rate in table.rates_on(day).items():
+            print(f"  {currency}: {rate:.4f}")
+    elif args.command == 'import':
+        points = read_rate_csv(args.csv, args.invert)
+        table.merge(args.currency.upper(), points)
+        table.save()
+        print(f"✅ Merged {len(points)} {args.currency.upper()} rates into {args.rates}")
+
+
+if __name__ == "__main__":
+    main()
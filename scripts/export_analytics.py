@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""Export the card catalog and stored matched sales to partitioned Parquet.
+
+Low-cardinality strings (setCode, rarity, marketplace, ...) are dictionary
+encoded and hp/price fields are typed numeric columns, so analytical queries
+only read the columns they touch:
+
+    import pyarrow.dataset as ds
+    sales = ds.dataset('data/analytics/sales', format='parquet', partitioning='hive')
+    sales.to_table(columns=['setCode', 'rarity', 'price']).group_by(['setCode', 'rarity']).aggregate([('price', 'mean')])
+
+Requires pyarrow (`pip install pyarrow`).
+
+Usage:
+    python3 scripts/export_analytics.py [--output data/analytics] [--sales-dir data/sales]
+    python3 scripts/export_analytics.py --report
+"""
+
+import argparse
+import os
+import shutil
+import time
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+from catalog import CARDS_DIR, REPO_ROOT, iter_catalog, normalize_set
+from sales import SALES_DIR, iter_sales, listing_id, parse_price, parse_sold_date
+
+DEFAULT_OUTPUT = os.path.join(REPO_ROOT, 'data', 'analytics')
+
+DICT_STRING = pa.dictionary(pa.int32(), pa.string())
+
+CARD_SCHEMA = pa.schema([
+    ('id', pa.string()),
+    ('setKey', DICT_STRING),
+    ('setCode', DICT_STRING),
+    ('setName', DICT_STRING),
+    ('series', DICT_STRING),
+    ('cardNumber', pa.string()),
+    ('fullNumber', pa.string()),
+    ('name', pa.string()),
+    ('rarity', DICT_STRING),
+    ('type', DICT_STRING),
+    ('hp', pa.int16()),
+    ('artist', DICT_STRING),
+    ('guideMin', pa.float64()),
+    ('guideMax', pa.float64()),
+    ('guideAverage', pa.float64()),
+    ('marketLow', pa.float64()),
+    ('marketMid', pa.float64()),
+    ('marketHigh', pa.float64()),
+])
+
+SALE_SCHEMA = pa.schema([
+    ('cardId', pa.string()),
+    ('setCode', DICT_STRING),
+    ('rarity', DICT_STRING),
+    ('variant', DICT_STRING),
+    ('marketplace', DICT_STRING),
+    ('currency', DICT_STRING),
+    ('price', pa.float64()),
+    ('soldDate', pa.date32()),
+    ('soldMonth', pa.string()),
+    ('listingId', pa.string()),
+    ('confidence', pa.float32()),
+    ('title', pa.string()),
+])
+
+
+def to_number(value, kind=float):
+    try:
+        return kind(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def card_row(key, info, card):
+    guide = card.get('priceGuide') or {}
+    regular = guide.get('Regular') or next(iter(guide.values()), {})
+    market = card.get('marketPrice') if isinstance(card.get('marketPrice'), dict) else {}
+    types = card.get('type') or []
+    return {
+        'id': card['id'],
+        'setKey': key,
+        'setCode': card.get('setCode'),
+        'setName': card.get('setName'),
+        'series': info.get('series') or card.get('series'),
+        'cardNumber': card.get('cardNumber'),
+        'fullNumber': card.get('fullNumber'),
+        'name': card['name'],
+        'rarity': card.get('rarity'),
+        'type': types[0] if types else None,
+        'hp': to_number(card.get('hp'), int),
+        'artist': card.get('artist'),
+        'guideMin': to_number(regular.get('min')),
+        'guideMax': to_number(regular.get('max')),
+        'guideAverage': to_number(regular.get('average')),
+        'marketLow': to_number(market.get('low')),
+        'marketMid': to_number(market.get('mid')),
+        'marketHigh': to_number(market.get('high')),
+    }
+
+
+def build_card_table(cards_dir=CARDS_DIR):
+    rows = []
+    for key, data in iter_catalog(cards_dir):
+        data = normalize_set(data, key)
+        rows.extend(card_row(key, data['setInfo'], card) for card in data['cards'])
+    return pa.Table.from_pylist(rows, schema=CARD_SCHEMA)
+
+
+def build_sale_table(cards, sales_dir=SALES_DIR):
+    """Matched sales joined to their card's setCode and rarity"""
+    lookup = {
+        card_id: (set_code, rarity)
+        for card_id, set_code, rarity in zip(
+            cards.column('id').to_pylist(),
+            cards.column('setCode').to_pylist(),
+            cards.column('rarity').to_pylist()
+        )
+    }
+    rows = []
+    for sale in iter_sales(sales_dir):
+        card_id = sale.get('cardId')
+        if not card_id:
+            continue
+        price, currency = parse_price(sale.get('price'), sale.get('marketplace'))
+        if price <= 0:
+            continue
+        sold = parse_sold_date(sale)
+        set_code, rarity = lookup.get(card_id, (None, None))
+        rows.append({
+            'cardId': card_id,
+            'setCode': set_code,
+            'rarity': rarity,
+            'variant': sale.get('detectedVariant') or sale.get('variant') or 'Regular',
+            'marketplace': sale.get('marketplace') or 'uk',
+            'currency': currency,
+            'price': price,
+            'soldDate': sold,
+            'soldMonth': sold.strftime('%Y-%m') if sold else 'unknown',
+            'listingId': listing_id(sale) or None,
+            'confidence': to_number(sale.get('matchConfidence')),
+            'title': sale.get('title'),
+        })
+    return pa.Table.from_pylist(rows, schema=SALE_SCHEMA)
+
+
+def write_partitioned(table, path, partition_by):
+    if os.path.isdir(path):
+        shutil.rmtree(path)
+    ds.write_dataset(
+        table, path, format='parquet',
+        partitioning=ds.partitioning(pa.schema([table.schema.field(name) for name in partition_by]), flavor='hive'),
+        existing_data_behavior='overwrite_or_ignore',
+        file_options=ds.ParquetFileFormat().make_write_options(compression='zstd'),
+    )
+
+
+def export_analytics(output=DEFAULT_OUTPUT, cards_dir=CARDS_DIR, sales_dir=SALES_DIR):
+    cards = build_card_table(cards_dir)
+    write_partitioned(cards, os.path.join(output, 'cards'), ['setCode'])
+
+    sales = build_sale_table(cards, sales_dir)
+    sales_path = os.path.join(output, 'sales')
+    if sales.num_rows:
+        write_partitioned(sales, sales_path, ['marketplace', 'soldMonth'])
+    elif os.path.isdir(sales_path):
+        # No sales left: a previous export must not keep answering --report
+        shutil.rmtree(sales_path)
+    return cards.num_rows, sales.num_rows
+
+
+def average_price_report(output=DEFAULT_OUTPUT):
+    """Average TAG sale price by set and rarity; reads three columns only"""
+    path = os.path.join(output, 'sales')
+    if not os.path.isdir(path):
+        return None
+    dataset = ds.dataset(path, format='parquet', partitioning='hive')
+    table = dataset.to_table(columns=['setCode', 'rarity', 'price', 'currency'])
+    grouped = table.group_by(['setCode', 'rarity', 'currency']).aggregate(
+        [('price', 'mean'), ('price', 'count')]
+    )
+    return sorted(grouped.to_pylist(), key=lambda row: (row['setCode'] or '', row['rarity'] or ''))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Export catalog and sales to Parquet')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT)
+    parser.add_argument('--cards-dir', default=CARDS_DIR)
+    parser.add_argument('--sales-dir', default=SALES_DIR)
+    parser.add_argument('--report', action='store_true', help='print average price by set and rarity')
+    args = parser.parse_args()
+
+    if args.report:
+        report = average_price_report(args.output)
+        if report is None:
+            print("No sales export found; run without --report first")
+            return
+        for row in report:
+            print(f"  {row['setCode']} {row['rarity']}: {row['price_mean']:.2f} {row['currency']} "
+                  f"({row['price_count']} sales)")
+        return
+
+    started = time.perf_counter()
+    card_count, sale_count = export_analytics(args.output, args.cards_dir, args.sales_dir)
+    print(f"✅ Exported {card_count} cards and {sale_count} matched sales in "
+          f"{time.perf_counter() - started:.2f}s")
+    print(f"📁 Saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
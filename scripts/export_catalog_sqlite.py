@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""Export the card catalog to a single SQLite file with an FTS5 search index.
+
+Point lookups by id or (setCode, cardNumber) and name/keyword prefix searches
+then hit indexes in one file instead of parsing whole set JSON files.
+
+Usage:
+    python3 scripts/export_catalog_sqlite.py [--output data/catalog.sqlite]
+    python3 scripts/export_catalog_sqlite.py --search "pikachu"
+    python3 scripts/export_catalog_sqlite.py --lookup SV8 001
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import time
+
+from catalog import CARDS_DIR, REPO_ROOT, iter_catalog, normalize_set
+
+DEFAULT_OUTPUT = os.path.join(REPO_ROOT, 'data', 'catalog.sqlite')
+
+SCHEMA = """
+CREATE TABLE sets (
+    set_key TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    set_code TEXT,
+    series TEXT,
+    release_date TEXT,
+    total_cards INTEGER,
+    card_count INTEGER NOT NULL,
+    logo TEXT,
+    set_info TEXT NOT NULL
+);
+
+CREATE TABLE cards (
+    rowid INTEGER PRIMARY KEY,
+    id TEXT NOT NULL,
+    set_key TEXT NOT NULL REFERENCES sets(set_key),
+    set_code TEXT,
+    card_number TEXT,
+    full_number TEXT,
+    name TEXT NOT NULL,
+    rarity TEXT,
+    hp INTEGER,
+    image_url TEXT,
+    data TEXT NOT NULL
+);
+
+CREATE TABLE keywords (
+    card_rowid INTEGER NOT NULL REFERENCES cards(rowid),
+    keyword TEXT NOT NULL
+);
+
+CREATE VIRTUAL TABLE cards_fts USING fts5(name, keywords, prefix='2 3', tokenize='unicode61 remove_diacritics 2');
+"""
+
+# Created after the bulk insert, which is much faster than maintaining them row by row
+INDEXES = """
+CREATE UNIQUE INDEX idx_cards_id ON cards(id, set_key, name);
+CREATE INDEX idx_cards_set_number ON cards(set_code, card_number, id, name);
+CREATE INDEX idx_cards_set_key ON cards(set_key);
+CREATE INDEX idx_keywords_keyword ON keywords(keyword, card_rowid);
+"""
+
+
+def export_catalog(output=DEFAULT_OUTPUT, cards_dir=CARDS_DIR):
+    """Build the SQLite catalog into a temp file and swap it into place"""
+    tmp_path = output + '.tmp'
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    conn = sqlite3.connect(tmp_path)
+    conn.execute('PRAGMA journal_mode = OFF')
+    conn.execute('PRAGMA synchronous = OFF')
+    conn.executescript(SCHEMA)
+
+    set_count = 0
+    card_count = 0
+    with conn:
+        for key, data in iter_catalog(cards_dir):
+            data = normalize_set(data, key)
+            info = data['setInfo']
+            cards = data['cards']
+            conn.execute(
+                'INSERT INTO sets VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (key, info.get('name', key), info.get('setCode'), info.get('series'),
+                 info.get('releaseDate'), info.get('totalCards'), len(cards), info.get('logo'),
+                 json.dumps(info, ensure_ascii=False))
+            )
+            set_count += 1
+
+            for card in cards:
+                card_count += 1
+                hp = card.get('hp')
+                conn.execute(
+                    'INSERT INTO cards VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    (card_count, card['id'], key, card.get('setCode'), card.get('cardNumber'),
+                     card.get('fullNumber'), card['name'], card.get('rarity'),
+                     hp if isinstance(hp, int) else None, card.get('imageUrl'),
+                     json.dumps(card, ensure_ascii=False))
+                )
+                keywords = card.get('matchingKeywords', [])
+                conn.executemany(
+                    'INSERT INTO keywords VALUES (?, ?)',
+                    ((card_count, keyword) for keyword in keywords)
+                )
+                conn.execute(
+                    'INSERT INTO cards_fts(rowid, name, keywords) VALUES (?, ?, ?)',
+                    (card_count, card['name'], ' '.join(keywords))
+                )
+
+        conn.executescript(INDEXES)
+        conn.execute("INSERT INTO cards_fts(cards_fts) VALUES ('optimize')")
+
+    conn.execute('ANALYZE')
+    conn.execute('VACUUM')
+    conn.close()
+    os.replace(tmp_path, output)
+    return set_count, card_count
+
+
+def connect(path=DEFAULT_OUTPUT):
+    """Open an exported catalog read-only"""
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def get_card(conn, card_id):
+    row = conn.execute('SELECT data FROM cards WHERE id = ?', (card_id,)).fetchone()
+    return json.loads(row['data']) if row else None
+
+
+def lookup_card(conn, set_code, card_number):
+    """Cards for a set code and number; several sets can share a code"""
+    rows = conn.execute(
+        'SELECT data FROM cards WHERE set_code = ? AND card_number = ?',
+        (set_code, card_number)
+    ).fetchall()
+    return [json.loads(row['data']) for row in rows]
+
+
+def search_cards(conn, query, limit=20):
+    """Prefix search over card names and keywords, best matches first"""
+    terms = [term.replace('"', '') for term in query.split() if term.replace('"', '')]
+    if not terms:
+        return []
+    match = ' '.join(f'"{term}"*' for term in terms)
+    rows = conn.execute(
+        'SELECT c.id, c.name, c.set_key, c.full_number FROM cards_fts '
+        'JOIN cards c ON c.rowid = cards_fts.rowid '
+        'WHERE cards_fts MATCH ? ORDER BY bm25(cards_fts, 5.0, 1.0) LIMIT ?',
+        (match, limit)
+    ).fetchall()
+    return [dict(row) for row in rows]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Export the card catalog to SQLite')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT)
+    parser.add_argument('--cards-dir', default=CARDS_DIR)
+    parser.add_argument('--search', help='search an existing export instead of building one')
+    parser.add_argument('--lookup', nargs=2, metavar=('SET_CODE', 'CARD_NUMBER'),
+                        help='look up a card in an existing export')
+    args = parser.parse_args()
+
+    if args.search or args.lookup:
+        conn = connect(args.output)
+        started = time.perf_counter()
+        results = search_cards(conn, args.search) if args.search else lookup_card(conn, *args.lookup)
+        elapsed = (time.perf_counter() - started) * 1e6
+        for result in results:
+            print(json.dumps(result, ensure_ascii=False))
+        print(f"🔍 {len(results)} results in {elapsed:.0f}µs")
+        return
+
+    started = time.perf_counter()
+    set_count, card_count = export_catalog(args.output, args.cards_dir)
+    print(f"✅ Exported {card_count} cards from {set_count} sets in {time.perf_counter() - started:.2f}s")
+    print(f"📁 Saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
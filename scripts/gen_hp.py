@@ -3,6 +3,8 @@ import json
 import re
 import random
 
+from catalog import normalize_set
+
 def clean_card_name(name):
     name = re.sub(r'\s*\(delta species\)\s*', ' δ', name)
     name = re.sub(r'\s*☆\s*\(delta species\)', ' δ ☆', name)
@@ -199,14 +201,17 @@ with open('data/cards/to-import/ex_holon_phantoms_set_list.csv', 'r', encoding='
         
         cards.append(card_data)
 
-dataset = {
-    'setName': set_info['name'],
-    'description': set_info['description'],
-    'releaseDate': set_info['release_date'],
-    'totalCards': set_info['total_cards'],
-    'tagSales': True,
+dataset = normalize_set({
+    'setInfo': {
+        'name': set_info['name'],
+        'description': set_info['description'],
+        'setCode': set_info['set_code'],
+        'releaseDate': set_info['release_date'],
+        'totalCards': set_info['total_cards'],
+        'logo': f"https://www.serebii.net/card/logo/{set_info['image_path']}.png"
+    },
     'cards': cards
-}
+}, 'ex-holon-phantoms')
 
 with open('data/cards/ex-holon-phantoms.json', 'w', encoding='utf-8') as f:
     json.dump(dataset, f, indent=2, ensure_ascii=False)
@@ -7,6 +7,8 @@ from datetime import datetime
 import random
 import os
 
+from catalog import normalize_set
+
 def clean_card_name(name):
     """Clean card name for consistent formatting"""
     # Handle delta species notation
@@ -332,11 +334,14 @@ def generate_set_json(csv_file, set_info):
     
     # Create final dataset
     dataset = {
-        "setName": set_info['name'],
-        "description": set_info['description'],
-        "releaseDate": set_info['release_date'],
-        "totalCards": set_info['total_cards'],
-        "tagSales": True,
+        "setInfo": {
+            "name": set_info['name'],
+            "description": set_info['description'],
+            "setCode": set_info['set_code'],
+            "releaseDate": set_info['release_date'],
+            "totalCards": set_info['total_cards'],
+            "logo": f"https://www.serebii.net/card/logo/{set_info['image_path']}.png"
+        },
         "cards": cards
     }
     
@@ -432,7 +437,9 @@ def main():
             dataset = generate_set_json(f'data/cards/to-import/{csv_file}', sets_info[set_key])
             
             # Save to JSON file
-            output_file = f'data/cards/{set_key.replace("_", "-")}.json'
+            output_key = set_key.replace("_", "-")
+            dataset = normalize_set(dataset, output_key)
+            output_file = f'data/cards/{output_key}.json'
             with open(output_file, 'w', encoding='utf-8') as f:
                 json.dump(dataset, f, indent=2, ensure_ascii=False)
             
@@ -4,17 +4,21 @@ import json
 import os
 from collections import defaultdict
 
+from catalog import normalize_set
+
 def generate_fates_collide_dataset():
     """Generate the Fates Collide TCG set dataset"""
     
     # Set information
     set_info = {
         "name": "Fates Collide",
+        "description": "Fates Collide Pokemon trading card set with various Pokemon cards and mechanics",
         "series": "XY",
-        "release_date": "2016-05-02",
-        "total_cards": 125,
+        "releaseDate": "02/05/2016",
+        "totalCards": 125,
         "symbol": "FCO",
-        "logo": "https://www.serebii.net/card/fatescollide/logo.png"
+        "logo": "https://www.serebii.net/card/logo/fatescollide.png",
+        "setCode": "FCO"
     }
     
     # Card data with proper HP values and rarities
@@ -200,13 +204,13 @@ def generate_fates_collide_dataset():
         
         cards.append(card)
     
-    # Create the complete dataset
+    # Create the complete dataset in the canonical catalog schema
     dataset = {
-        "set_info": set_info,
+        "setInfo": set_info,
         "cards": cards
     }
     
-    return dataset
+    return normalize_set(dataset, "fates-collide")
 
 def main():
     # Generate dataset
@@ -217,8 +221,8 @@ def main():
     
     # Save to JSON file
     output_file = "data/cards/fates-collide.json"
-    with open(output_file, 'w') as f:
-        json.dump(dataset, f, indent=2)
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(dataset, f, indent=2, ensure_ascii=False)
     
     print(f"✅ Successfully generated Fates Collide dataset with {len(dataset['cards'])} cards")
     print(f"📁 Saved to: {output_file}")
@@ -237,26 +241,26 @@ def main():
     
     for card in dataset['cards']:
         rarity_count[card['rarity']] += 1
-        type_count[card['type']] += 1
+        type_count[card['type'][0]] += 1
         
         # Track duplicates
-        duplicate_cards[card['name']].append(card['number'])
+        duplicate_cards[card['name']].append(card['cardNumber'])
         
         # Track BREAK cards
-        if 'break' in card.get('keywords', []):
-            break_cards.append(f"{card['name']} (#{card['number']}) - {card.get('hp', 'N/A')} HP, {card['rarity']}")
+        if 'break' in card['matchingKeywords']:
+            break_cards.append(f"{card['name']} (#{card['cardNumber']}) - {card.get('hp', 'N/A')} HP, {card['rarity']}")
         
         # Track Spirit Link cards
-        if 'spirit-link' in card.get('keywords', []):
-            spirit_link_cards.append(f"{card['name']} (#{card['number']})")
+        if 'spirit-link' in card['matchingKeywords']:
+            spirit_link_cards.append(f"{card['name']} (#{card['cardNumber']})")
         
         # Track Fossil cards
-        if 'fossil' in card.get('keywords', []):
-            fossil_cards.append(f"{card['name']} (#{card['number']})")
+        if 'fossil' in card['matchingKeywords']:
+            fossil_cards.append(f"{card['name']} (#{card['cardNumber']})")
         
         # Track Wormadam cards
         if card['name'] == 'Wormadam':
-            wormadam_cards.append(f"{card['name']} (#{card['number']}) - {card['type']} type, {card['rarity']}")
+            wormadam_cards.append(f"{card['name']} (#{card['cardNumber']}) - {card['type'][0]} type, {card['rarity']}")
     
     print("Rarity Distribution:")
     for rarity in sorted(rarity_count.keys()):
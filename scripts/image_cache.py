@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""Manage the image proxy cache in public/cached-images as a content-addressed store.
+
+Image bytes are stored once under their sha256, and a compact index maps the
+md5 of each proxied URL (the key pages/api/image-proxy.js already uses) to
+its object:
+
+    public/cached-images/objects/<ab>/<sha256>.<ext>
+    public/cached-images/index.json       {"version", "entries": {md5(url): entry}}
+    public/cached-images/journal.ndjson   appended by the proxy: puts and hits
+
+An entry holds path (relative to the cache dir), contentType, size, etag,
+url and lastAccess (epoch seconds). The proxy keeps index + journal in
+memory, so a lookup is one dict read instead of a directory scan; the
+commands here fold the journal back into the index.
+
+Usage:
+    python3 scripts/image_cache.py stats
+    python3 scripts/image_cache.py rebuild          # adopt legacy <md5>.<ext> files, dedupe, compact
+    python3 scripts/image_cache.py verify [--fix]   # check sizes and content hashes
+    python3 scripts/image_cache.py gc --max-size 500M
+    python3 scripts/image_cache.py lookup https://www.serebii.net/card/base1/1.jpg
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import time
+
+from images import IMAGE_EXTENSIONS, PUBLIC_DIR, content_type_for, sha256_file, url_extension
+
+CACHE_DIR = os.path.join(PUBLIC_DIR, 'cached-images')
+INDEX_VERSION = 1
+OBJECTS = 'objects'
+LEGACY_NAME = re.compile(r'^([0-9a-f]{32})(\.[a-z0-9]+)$')
+# The proxy writes an object before journaling it; don't collect anything this fresh
+ORPHAN_GRACE_SECONDS = 3600
+
+
+def url_key(url):
+    """Cache key of a URL; must match getImageHash in pages/api/image-proxy.js"""
+    return hashlib.md5(url.encode('utf-8')).hexdigest()
+
+
+def object_path(digest, ext):
+    return f"{OBJECTS}/{digest[:2]}/{digest}{ext}"
+
+
+def index_path(cache_dir):
+    return os.path.join(cache_dir, 'index.json')
+
+
+def journal_path(cache_dir):
+    return os.path.join(cache_dir, 'journal.ndjson')
+
+
+def replay_journal(entries, path):
+    if not os.path.exists(path):
+        return
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # torn final line from a crashed writer
+            if record.get('op') == 'put':
+                entries[record['key']] = record['entry']
+            elif record.get('op') == 'hit' and record.get('key') in entries:
+                entry = entries[record['key']]
+                entry['lastAccess'] = max(entry.get('lastAccess', 0), record.get('at', 0))
+
+
+def load_index(cache_dir=CACHE_DIR):
+    """Index entries with the current journal applied"""
+    entries = {}
+    if os.path.exists(index_path(cache_dir)):
+        with open(index_path(cache_dir), 'r', encoding='utf-8') as f:
+            entries = json.load(f).get('entries', {})
+    replay_journal(entries, journal_path(cache_dir))
+    return entries
+
+
+def compact(cache_dir=CACHE_DIR):
+    """Fold the journal into the index; returns the entries.
+
+    The journal is renamed before it is read so proxy appends racing with
+    compaction land in a fresh journal instead of being lost."""
+    entries = {}
+    if os.path.exists(index_path(cache_dir)):
+        with open(index_path(cache_dir), 'r', encoding='utf-8') as f:
+            entries = json.load(f).get('entries', {})
+    rotated = None
+    if os.path.exists(journal_path(cache_dir)):
+        rotated = f"{journal_path(cache_dir)}.{os.getpid()}"
+        os.replace(journal_path(cache_dir), rotated)
+        replay_journal(entries, rotated)
+    write_index(entries, cache_dir)
+    if rotated:
+        os.remove(rotated)
+    return entries
+
+
+def write_index(entries, cache_dir=CACHE_DIR):
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = index_path(cache_dir) + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'version': INDEX_VERSION, 'entries': entries}, f, separators=(',', ':'), sort_keys=True)
+    os.replace(tmp_path, index_path(cache_dir))
+
+
+def store_file(cache_dir, source, ext):
+    """Move a file into the object store (dropping it if the bytes are already there);
+    returns (relative object path, whether the bytes were already stored)"""
+    relative = object_path(sha256_file(source), ext)
+    target = os.path.join(cache_dir, relative)
+    if os.path.exists(target):
+        os.remove(source)
+        return relative, True
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    os.replace(source, target)
+    return relative, False
+
+
+def put(cache_dir, url, data, content_type=None, etag=None):
+    """Add downloaded bytes for a URL to the store and journal the entry"""
+    ext = url_extension(url, content_type)
+    digest = hashlib.sha256(data).hexdigest()
+    relative = object_path(digest, ext)
+    target = os.path.join(cache_dir, relative)
+    if not os.path.exists(target):
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(target + '.tmp', 'wb') as f:
+            f.write(data)
+        os.replace(target + '.tmp', target)
+    entry = {
+        'path': relative,
+        'contentType': (content_type or content_type_for(target)).split(';')[0].strip(),
+        'size': len(data),
+        'etag': etag,
+        'url': url,
+        'lastAccess': int(time.time()),
+    }
+    with open(journal_path(cache_dir), 'a', encoding='utf-8') as f:
+        f.write(json.dumps({'op': 'put', 'key': url_key(url), 'entry': entry}) + '\n')
+    return entry
+
+
+def iter_objects(cache_dir):
+    """Yield (relative path, absolute path) for every stored object"""
+    root = os.path.join(cache_dir, OBJECTS)
+    if not os.path.isdir(root):
+        return
+    for prefix in sorted(os.listdir(root)):
+        prefix_dir = os.path.join(root, prefix)
+        for name in sorted(os.listdir(prefix_dir)):
+            if not name.endswith('.tmp'):
+                yield f"{OBJECTS}/{prefix}/{name}", os.path.join(prefix_dir, name)
+
+
+def rebuild(cache_dir=CACHE_DIR):
+    """Adopt legacy flat <md5>.<ext> files, drop entries whose object is gone and
+    refresh sizes; returns a summary dict"""
+    entries = compact(cache_dir)
+    summary = {'adopted': 0, 'deduplicated': 0, 'dropped': 0}
+
+    for name in sorted(os.listdir(cache_dir)) if os.path.isdir(cache_dir) else []:
+        match = LEGACY_NAME.match(name)
+        if not match or match.group(2) not in IMAGE_EXTENSIONS:
+            continue
+        key, ext = match.groups()
+        source = os.path.join(cache_dir, name)
+        mtime = int(os.path.getmtime(source))
+        size = os.path.getsize(source)
+        relative, duplicate = store_file(cache_dir, source, ext)
+        previous = entries.get(key, {})
+        entries[key] = {
+            'path': relative,
+            'contentType': content_type_for(name),
+            'size': size,
+            'etag': previous.get('etag'),
+            'url': previous.get('url'),
+            'lastAccess': max(previous.get('lastAccess', 0), mtime),
+        }
+        summary['adopted'] += 1
+        summary['deduplicated'] += duplicate
+
+    for key in list(entries):
+        path = os.path.join(cache_dir, entries[key]['path'])
+        if not os.path.exists(path):
+            del entries[key]
+            summary['dropped'] += 1
+        else:
+            entries[key]['size'] = os.path.getsize(path)
+
+    write_index(entries, cache_dir)
+    summary['entries'] = len(entries)
+    summary['objects'] = len({entry['path'] for entry in entries.values()})
+    return summary
+
+
+def verify(cache_dir=CACHE_DIR, fix=False):
+    """Check every object's size and content hash; returns {object path: problem}"""
+    entries = load_index(cache_dir)
+    problems = {}
+    for relative in sorted({entry['path'] for entry in entries.values()}):
+        path = os.path.join(cache_dir, relative)
+        expected = os.path.splitext(os.path.basename(relative))[0]
+        if not os.path.exists(path):
+            problems[relative] = 'missing'
+        elif sha256_file(path) != expected:
+            problems[relative] = 'content hash mismatch'
+        elif any(entry['size'] != os.path.getsize(path) for entry in entries.values() if entry['path'] == relative):
+            problems[relative] = 'size mismatch'
+
+    if fix and problems:
+        entries = compact(cache_dir)
+        for key in [key for key, entry in entries.items() if entry['path'] in problems]:
+            del entries[key]
+        for relative in problems:
+            path = os.path.join(cache_dir, relative)
+            if os.path.exists(path):
+                os.remove(path)
+        write_index(entries, cache_dir)
+    return problems
+
+
+def gc(cache_dir=CACHE_DIR, max_bytes=None):
+    """Delete unreferenced objects, then evict least recently used objects until
+    the store fits in max_bytes; returns a summary dict"""
+    entries = compact(cache_dir)
+    objects = {}
+    for key, entry in entries.items():
+        info = objects.setdefault(entry['path'], {'size': entry['size'], 'lastAccess': 0, 'keys': []})
+        info['lastAccess'] = max(info['lastAccess'], entry.get('lastAccess', 0))
+        info['keys'].append(key)
+
+    summary = {'orphans': 0, 'evicted': 0, 'freed': 0}
+    now = time.time()
+    for relative, path in iter_objects(cache_dir):
+        if relative not in objects and now - os.path.getmtime(path) > ORPHAN_GRACE_SECONDS:
+            summary['freed'] += os.path.getsize(path)
+            os.remove(path)
+            summary['orphans'] += 1
+
+    total = sum(info['size'] for info in objects.values())
+    if max_bytes is not None and total > max_bytes:
+        # Shared objects count once and stay as long as any of their URLs is recent
+        for relative, info in sorted(objects.items(), key=lambda item: item[1]['lastAccess']):
+            if total <= max_bytes:
+                break
+            path = os.path.join(cache_dir, relative)
+            if os.path.exists(path):
+                os.remove(path)
+            for key in info['keys']:
+                del entries[key]
+            total -= info['size']
+            summary['freed'] += info['size']
+            summary['evicted'] += 1
+
+    write_index(entries, cache_dir)
+    summary['entries'] = len(entries)
+    summary['bytes'] = total
+    return summary
+
+
+def stats(cache_dir=CACHE_DIR):
+    entries = load_index(cache_dir)
+    objects = {entry['path']: entry['size'] for entry in entries.values()}
+    return {
+        'entries': len(entries),
+        'objects': len(objects),
+        'bytes': sum(objects.values()),
+        'sharedBytes': sum(entry['size'] for entry in entries.values()) - sum(objects.values()),
+    }
+
+
+def parse_size(value):
+    """'500M' -> 524288000"""
+    match = re.fullmatch(r'(\d+(?:\.\d+)?)\s*([KMG]?)B?', value.strip().upper())
+    if not match:
+        raise argparse.ArgumentTypeError(f"invalid size: {value}")
+    number, unit = match.groups()
+    return int(float(number) * 1024 ** ' KMG'.index(unit or ' '))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Manage the content-addressed image proxy cache')
+    parser.add_argument('command', choices=['stats', 'rebuild', 'verify', 'gc', 'lookup'])
+    parser.add_argument('url', nargs='?', help='URL for lookup')
+    parser.add_argument('--cache-dir', default=CACHE_DIR)
+    parser.add_argument('--max-size', type=parse_size, help='gc: evict LRU objects above this size (e.g. 500M)')
+    parser.add_argument('--fix', action='store_true', help='verify: drop broken objects and their entries')
+    args = parser.parse_args()
+
+    if args.command == 'lookup':
+        if not args.url:
+            parser.error('lookup needs a URL')
+        entry = load_index(args.cache_dir).get(url_key(args.url))
+        print(json.dumps(entry, indent=2) if entry else f"Not cached ({url_key(args.url)})")
+    elif args.command == 'stats':
+        result = stats(args.cache_dir)
+        print(f"📦 {result['entries']} URLs -> {result['objects']} objects, "
+              f"{result['bytes'] / (1024 * 1024):.1f} MB ({result['sharedBytes'] / (1024 * 1024):.1f} MB saved by dedupe)")
+    elif args.command == 'rebuild':
+        result = rebuild(args.cache_dir)
+        print(f"✅ Rebuilt index: {result['entries']} URLs -> {result['objects']} objects "
+              f"({result['adopted']} legacy files adopted, {result['deduplicated']} duplicates, "
+              f"{result['dropped']} stale entries dropped)")
+    elif args.command == 'verify':
+        problems = verify(args.cache_dir, args.fix)
+        for relative, problem in problems.items():
+            print(f"  ❌ {relative}: {problem}")
+        print(f"{'✅' if not problems else '⚠️ '} {len(problems)} problems" + (' (fixed)' if args.fix and problems else ''))
+        if problems and not args.fix:
+            raise SystemExit(1)
+    elif args.command == 'gc':
+        result = gc(args.cache_dir, args.max_size)
+        print(f"🧹 Removed {result['orphans']} orphaned and evicted {result['evicted']} objects, "
+              f"freed {result['freed'] / (1024 * 1024):.1f} MB; {result['entries']} URLs, "
+              f"{result['bytes'] / (1024 * 1024):.1f} MB remain")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""Perceptual-hash index of catalog card art for matching listing photos.
+
+Every local card image (public/card-assets/<set-key>/cards/) gets a 64-bit
+pHash (low frequencies of a 32x32 DCT) and dHash (horizontal gradient
+signs), stored by card id with its set key in data/image-hashes.json and
+recomputed in a process pool only when the image's sha256 changes.
+
+Queries return every card (id and set key) within a Hamming radius on
+pHash, re-ranked by the combined pHash + dHash distance. A sale posted to /api/card-matcher
+with the query result as its `imageCandidates` is matched by
+CardMatcher.combineImageCandidates, which blends each candidate's
+`similarity` with the title's text confidence.
+
+Requires Pillow and NumPy 2 or later, for np.bitwise_count (`pip install pillow "numpy>=2"`).
+
+Usage:
+    python3 scripts/image_hash_index.py                     # (re)build hashes
+    python3 scripts/image_hash_index.py --query photo.jpg [--radius 12] [--limit 5]
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from PIL import Image
+
+from catalog import REPO_ROOT
+from images import ASSETS_DIR, local_card_ids, sha256_file
+
+INDEX_PATH = os.path.join(REPO_ROOT, 'data', 'image-hashes.json')
+INDEX_VERSION = 1
+HASH_BITS = 64
+DCT_SIZE = 32
+DEFAULT_RADIUS = 12
+
+
+def dct_matrix(size=DCT_SIZE):
+    """Orthonormal DCT-II basis, so dct2(x) = M @ x @ M.T"""
+    k = np.arange(size)[:, None]
+    n = np.arange(size)[None, :]
+    matrix = np.sqrt(2 / size) * np.cos(np.pi * (2 * n + 1) * k / (2 * size))
+    matrix[0] /= np.sqrt(2)
+    return matrix
+
+
+DCT = dct_matrix()
+
+
+def bits_to_int(bits):
+    value = 0
+    for bit in bits:
+        value = (value << 1) | int(bit)
+    return value
+
+
+def phash(image):
+    """64-bit DCT hash: top-left 8x8 coefficients against their median (DC excluded)"""
+    gray = np.asarray(image.convert('L').resize((DCT_SIZE, DCT_SIZE), Image.LANCZOS), dtype=np.float64)
+    low = (DCT @ gray @ DCT.T)[:8, :8].flatten()
+    return bits_to_int(low > np.median(low[1:]))
+
+
+def dhash(image):
+    """64-bit gradient hash: is each pixel brighter than its right neighbour"""
+    gray = np.asarray(image.convert('L').resize((9, 8), Image.LANCZOS), dtype=np.int16)
+    return bits_to_int((gray[:, 1:] > gray[:, :-1]).flatten())
+
+
+def hash_image(path):
+    """(phash, dhash) as 16-digit hex strings (runs in a worker process)"""
+    with Image.open(path) as image:
+        image.load()
+        return f"{phash(image):016x}", f"{dhash(image):016x}"
+
+
+def similarity(distance):
+    """1.0 for identical hashes, 0.0 at the distance of unrelated images (half the bits)"""
+    return max(0.0, 1 - distance / (HASH_BITS / 2))
+
+
+def load_hashes(index_path=INDEX_PATH):
+    if not os.path.exists(index_path):
+        return {}
+    with open(index_path, 'r', encoding='utf-8') as f:
+        return json.load(f).get('cards', {})
+
+
+def build_hashes(assets_dir=ASSETS_DIR, index_path=INDEX_PATH, workers=None, force=False):
+    """Hash changed images; returns (cards, hashed count, skipped count)"""
+    previous = load_hashes(index_path)
+    cards = {}
+    jobs = {}
+    set_keys = {}
+    for path, card_id in local_card_ids(assets_dir).items():
+        set_keys[card_id] = os.path.relpath(path, assets_dir).split(os.sep)[0]
+        digest = sha256_file(path)
+        entry = previous.get(card_id)
+        if not force and entry and entry.get('hash') == digest:
+            cards[card_id] = {**entry, 'setKey': set_keys[card_id]}
+        else:
+            jobs[card_id] = (path, digest)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {card_id: pool.submit(hash_image, path) for card_id, (path, _) in jobs.items()}
+        for card_id, future in futures.items():
+            p_hash, d_hash = future.result()
+            cards[card_id] = {'hash': jobs[card_id][1], 'phash': p_hash, 'dhash': d_hash, 'setKey': set_keys[card_id]}
+
+    os.makedirs(os.path.dirname(index_path), exist_ok=True)
+    with open(index_path, 'w', encoding='utf-8') as f:
+        json.dump({'version': INDEX_VERSION, 'cards': dict(sorted(cards.items()))}, f, separators=(',', ':'))
+    return cards, len(jobs), len(cards) - len(jobs)
+
+
+class ImageHashIndex:
+    """In-memory query side: pHashes and dHashes packed into uint64 arrays.
+
+    A query XORs the photo's hash against every card at once and counts bits
+    with np.bitwise_count; at catalog scale (~20k hashes) that is tens of
+    microseconds, well ahead of walking a pure-Python BK-tree."""
+
+    def __init__(self, cards):
+        self.card_ids = list(cards)
+        self.set_keys = [cards[card_id].get('setKey') for card_id in self.card_ids]
+        self.phashes = np.array([int(cards[card_id]['phash'], 16) for card_id in self.card_ids], dtype=np.uint64)
+        self.dhashes = np.array([int(cards[card_id]['dhash'], 16) for card_id in self.card_ids], dtype=np.uint64)
+
+    @classmethod
+    def load(cls, index_path=INDEX_PATH):
+        return cls(load_hashes(index_path))
+
+    @property
+    def size(self):
+        return len(self.card_ids)
+
+    def query_hashes(self, p_hash, d_hash, radius=DEFAULT_RADIUS, limit=10):
+        """Cards within radius on pHash, best combined pHash/dHash distance first"""
+        p_distances = np.bitwise_count(self.phashes ^ np.uint64(p_hash))
+        within = np.flatnonzero(p_distances <= radius)
+        distances = (p_distances[within] + np.bitwise_count(self.dhashes[within] ^ np.uint64(d_hash))) / 2
+        order = np.lexsort((within, distances))[:limit]
+        return [
+            {
+                'cardId': self.card_ids[within[i]],
+                'setKey': self.set_keys[within[i]],
+                'phashDistance': int(p_distances[within[i]]),
+                'distance': float(distances[i]),
+                'similarity': round(similarity(float(distances[i])), 4),
+            }
+            for i in order
+        ]
+
+    def query_image(self, path, radius=DEFAULT_RADIUS, limit=10):
+        with Image.open(path) as image:
+            image.load()
+            return self.query_hashes(phash(image), dhash(image), radius, limit)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Perceptual-hash index of card art')
+    parser.add_argument('--assets-dir', default=ASSETS_DIR)
+    parser.add_argument('--index', default=INDEX_PATH)
+    parser.add_argument('--workers', type=int, help='worker processes (default: CPU count)')
+    parser.add_argument('--force', action='store_true', help='rehash unchanged images')
+    parser.add_argument('--query', help='listing photo to look up')
+    parser.add_argument('--radius', type=int, default=DEFAULT_RADIUS, help='max pHash Hamming distance')
+    parser.add_argument('--limit', type=int, default=5)
+    args = parser.parse_args()
+
+    if args.query:
+        index = ImageHashIndex.load(args.index)
+        started = time.perf_counter()
+        candidates = index.query_image(args.query, args.radius, args.limit)
+        elapsed = (time.perf_counter() - started) * 1000
+        print(json.dumps(candidates, indent=2))
+        print(f"🔎 {len(candidates)} candidates among {index.size} cards in {elapsed:.2f} ms (incl. hashing the photo)")
+        return
+
+    started = time.perf_counter()
+    cards, hashed, skipped = build_hashes(args.assets_dir, args.index, args.workers, args.force)
+    print(f"✅ Hashed {hashed} images, {skipped} unchanged ({len(cards)} cards) "
+          f"in {time.perf_counter() - started:.1f}s")
+    print(f"📁 Index: {args.index}")
+
+
+if __name__ == "__main__":
+    main()
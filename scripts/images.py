@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""Shared helpers for card image tooling.
+
+Local card art lives in public/card-assets/<set-key>/cards/<number>.<ext>,
+the layout scripts/migrate-set-assets.js writes: numeric card numbers are
+zero-padded to three digits, anything else (H1, 50a, SV001) is kept as-is,
+lowercased.
+"""
+
+import hashlib
+import json
+import os
+import re
+from urllib.parse import urlparse
+
+from catalog import REPO_ROOT, iter_catalog, normalize_set
+
+PUBLIC_DIR = os.path.join(REPO_ROOT, 'public')
+ASSETS_DIR = os.path.join(PUBLIC_DIR, 'card-assets')
+# Root-relative prefix of local card images in catalog imageUrls
+LOCAL_PREFIX = '/card-assets/'
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp', '.gif')
+CONTENT_TYPE_EXTENSIONS = {
+    'image/jpeg': '.jpg',
+    'image/png': '.png',
+    'image/webp': '.webp',
+    'image/gif': '.gif',
+    'image/avif': '.avif',
+}
+EXTENSION_CONTENT_TYPES = {
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.png': 'image/png',
+    '.webp': 'image/webp',
+    '.gif': 'image/gif',
+    '.avif': 'image/avif',
+}
+
+
+def asset_stem(card_number):
+    """'1' -> '001', '50a' -> '50a', 'SV001' -> 'sv001'"""
+    number = str(card_number).strip()
+    if number.isdigit():
+        return number.zfill(3)
+    return re.sub(r'[^a-z0-9-]', '', number.lower()) or 'unknown'
+
+
+def url_extension(url, content_type=None):
+    """File extension for an image URL, falling back to its content type"""
+    ext = os.path.splitext(urlparse(url).path)[1].lower()
+    if ext in IMAGE_EXTENSIONS:
+        return '.jpg' if ext == '.jpeg' else ext
+    if content_type:
+        return CONTENT_TYPE_EXTENSIONS.get(content_type.split(';')[0].strip().lower(), '.jpg')
+    return '.jpg'
+
+
+def content_type_for(path):
+    return EXTENSION_CONTENT_TYPES.get(os.path.splitext(path)[1].lower(), 'application/octet-stream')
+
+
+def sha256_file(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def card_asset_path(key, card, url=None, assets_dir=ASSETS_DIR):
+    """Where a card's local image lives (or will live)"""
+    url = url or card.get('imageUrl') or ''
+    if url.startswith(LOCAL_PREFIX):
+        return os.path.join(assets_dir, url[len(LOCAL_PREFIX):])
+    ext = url_extension(url)
+    return os.path.join(assets_dir, key, 'cards', asset_stem(card.get('cardNumber', '')) + ext)
+
+
+def iter_card_images(cards_dir=None, sets=None):
+    """Yield (set_key, card, image_url) for every card with an imageUrl"""
+    catalog_iter = iter_catalog(cards_dir) if cards_dir else iter_catalog()
+    for key, data in catalog_iter:
+        if sets and key not in sets:
+            continue
+        for card in normalize_set(data, key)['cards']:
+            if card.get('imageUrl'):
+                yield key, card, card['imageUrl']
+
+
+def iter_local_images(assets_dir=ASSETS_DIR):
+    """Yield (set_key, stem, path) for every card image under public/card-assets"""
+    if not os.path.isdir(assets_dir):
+        return
+    for key in sorted(os.listdir(assets_dir)):
+        cards_dir = os.path.join(assets_dir, key, 'cards')
+        if not os.path.isdir(cards_dir):
+            continue
+        for name in sorted(os.listdir(cards_dir)):
+            stem, ext = os.path.splitext(name)
+            if ext.lower() in IMAGE_EXTENSIONS:
+                yield key, stem, os.path.join(cards_dir, name)
+
+
+def write_set_sidecars(name, version, cards, assets_dir=ASSETS_DIR, cards_dir=None):
+    """Split a card id keyed index into public/card-assets/<set-key>/<name>.
+
+    A page showing one set fetches only that set's file. Files are keyed by
+    catalog set and only rewritten when their content changes; sets left
+    without entries lose theirs. Returns {set_key: card count}."""
+    card_sets = {card['id']: key for key, card, _ in iter_card_images(cards_dir)}
+    by_set = {}
+    for card_id, entry in cards.items():
+        if card_id in card_sets:
+            by_set.setdefault(card_sets[card_id], {})[card_id] = entry
+
+    keys = set(by_set)
+    if os.path.isdir(assets_dir):
+        keys.update(key for key in os.listdir(assets_dir) if os.path.isfile(os.path.join(assets_dir, key, name)))
+    for key in sorted(keys):
+        path = os.path.join(assets_dir, key, name)
+        if key not in by_set:
+            os.remove(path)
+            continue
+        payload = json.dumps({'version': version, 'cards': dict(sorted(by_set[key].items()))},
+                             separators=(',', ':')).encode('utf-8')
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                if f.read() == payload:
+                    continue
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(payload)
+    return {key: len(entries) for key, entries in by_set.items()}
+
+
+def local_card_ids(assets_dir=ASSETS_DIR, cards_dir=None):
+    """Map local card image paths to catalog card ids: {path: card_id}"""
+    existing = {(key, stem): path for key, stem, path in iter_local_images(assets_dir)}
+    ids = {}
+    for key, card, url in iter_card_images(cards_dir):
+        if url.startswith(LOCAL_PREFIX):
+            path = os.path.join(assets_dir, url[len(LOCAL_PREFIX):])
+        else:
+            path = existing.get((key, asset_stem(card.get('cardNumber', ''))))
+        if path and os.path.exists(path) and path not in ids:
+            ids[path] = card['id']
+    return ids
@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""Parse eBay sold-listing pages into sale records.
+
+Python port of the extraction and filtering in pages/api/ebay.js: search
+result HTML (both the s-item and the newer s-card layouts) and the RSS feed
+become raw items, and filter_items applies the same Pokemon / TAG grade /
+lot checks and de-duplication as filterItemsCommon. Records have the sale
+shape described in scripts/sales.py, plus `soldAt` (ISO date) whenever the
+sold date can be read.
+
+HTML fields come from FIELD_SELECTORS (field -> selectors in priority
+order), compiled once into XPath functions that return the field's text or
+attribute directly. RSS feeds are read with iterparse, one <item> at a
+time. scripts/bench_listings.py measures both against data/fixtures/ebay.
+
+Requires lxml (`pip install lxml`).
+"""
+
+import io
+import re
+from datetime import date
+from html import unescape
+
+from lxml import etree
+
+from sales import normalize_title, parse_price
+
+PRICE_PATTERN = re.compile(r'(?:US\s*)?[£$€]\s?[\d,]+(?:\.\d{2})?', re.IGNORECASE)
+SOLD_INFO_PATTERN = re.compile(
+    r'(?:this listing sold on|item sold on|sold|ended)[:\s]*(?:on\s*)?([A-Z][a-z]{2},?\s*)?\d{1,2}\s+[A-Z][a-z]{2,8},?\s*'
+    r'(?:at\s*)?\d{0,2}:?\d{0,2}\s*(?:AM|PM)?|(?:sold|ended)[:\s]*(?:on\s*)?\d{1,2}\s+[A-Z][a-z]{2,8}\s+\d{4}',
+    re.IGNORECASE
+)
+DATE_PATTERN = re.compile(r'(\d{1,2})\s+([A-Za-z]{3})[a-z]*,?\s+(\d{4})')
+LOCATION_PATTERN = re.compile(r'^(?:item location:\s*)?(?:from|located in)\s+', re.IGNORECASE)
+TAG_GRADE_PATTERNS = [
+    re.compile(r'\btag\s*[-_:]?\s*(?:10|9(?:\.5)?|8(?:\.5)?|7(?:\.5)?|6(?:\.5)?|5(?:\.5)?|4|3|2|1)\b'),
+    re.compile(r'\bgraded\s*[-_:]?\s*tag\b'),
+    re.compile(r'\btag\s*[-_:]?\s*(?:graded|grade|authenticated|auth)\b'),
+]
+LOT_PATTERN = re.compile(r'\b(lot of|bundle of|collection of|job lot|bulk lot)\b')
+IMAGE_SIZE_PATTERN = re.compile(r's-l(?:50|64|96|140|225|300)(?=[./?])')
+LISTING_ID_PATTERN = re.compile(r'/itm/(?:[^/?#]+/)?(\d{9,})', re.IGNORECASE)
+TAG_PATTERN = re.compile(r'<[^>]*>')
+IMAGE_SRC_PATTERN = re.compile(r'<img\b[^>]*?\bsrc="([^"]+)"', re.IGNORECASE)
+MONTHS = {name: number for number, name in enumerate(
+    ('jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'), start=1)}
+
+
+def clean_text(value):
+    text = re.sub(r'\s+', ' ', str(value or '')).strip()
+    return re.sub(r'^new listing\s*', '', text, flags=re.IGNORECASE)
+
+
+def dedupe_repeated_title(title):
+    """'Foo Bar Foo Bar' -> 'Foo Bar' (eBay repeats titles in some layouts)"""
+    cleaned = clean_text(title)
+    words = cleaned.split(' ')
+    if len(words) % 2:
+        return cleaned
+    midpoint = len(words) // 2
+    first, second = ' '.join(words[:midpoint]), ' '.join(words[midpoint:])
+    return first if normalize_title(first) == normalize_title(second) else cleaned
+
+
+def extract_price(value):
+    match = PRICE_PATTERN.search(clean_text(value))
+    return clean_text(match.group(0)) if match else ''
+
+
+def extract_sold_info(text):
+    match = SOLD_INFO_PATTERN.search(clean_text(text))
+    return clean_text(match.group(0)) if match else ''
+
+
+def sold_at(text):
+    """ISO date from '... 12 Jun 2025 ...', or None"""
+    match = DATE_PATTERN.search(text or '')
+    if not match:
+        return None
+    day, month, year = match.groups()
+    try:
+        return date(int(year), MONTHS[month.lower()], int(day)).isoformat()
+    except (KeyError, ValueError):
+        return None
+
+
+def clean_location(value):
+    return LOCATION_PATTERN.sub('', clean_text(value))
+
+
+def upgrade_image_url(url):
+    return re.sub(r'\.webp(?:\?.*)?$', '.jpg', IMAGE_SIZE_PATTERN.sub('s-l500', url or ''), flags=re.IGNORECASE)
+
+
+def has_pokemon_signal(text):
+    normalized = normalize_title(text)
+    return 'pokemon' in normalized or 'pkmn' in normalized
+
+
+def has_tag_grade_signal(text):
+    normalized = normalize_title(text)
+    return any(pattern.search(normalized) for pattern in TAG_GRADE_PATTERNS) or 'technical authentication' in normalized
+
+
+def is_lot_or_bundle(text):
+    return bool(LOT_PATTERN.search(normalize_title(text)))
+
+
+def filter_items(raw_items, max_items=None):
+    """Same checks as filterItemsCommon in pages/api/ebay.js"""
+    seen = set()
+    cleaned = []
+    for item in raw_items:
+        if not item or not item.get('title'):
+            continue
+        title = dedupe_repeated_title(item['title'])
+        haystack = f"{title} {item.get('searchText', '')}"
+        normalized = normalize_title(title)
+        if not title or normalized == 'shop on ebay' or 'available inventory' in normalized:
+            continue
+
+        price = extract_price(item.get('price'))
+        amount, _ = parse_price(price)
+        if not price or amount <= 0:
+            continue
+        if not has_pokemon_signal(haystack) or not has_tag_grade_signal(haystack) or is_lot_or_bundle(haystack):
+            continue
+
+        match = LISTING_ID_PATTERN.search(item.get('listingUrl') or '')
+        key = match.group(1) if match else f"{normalized}::{amount}"
+        if key in seen:
+            continue
+        seen.add(key)
+
+        sale = {
+            'title': title,
+            'img': upgrade_image_url(item.get('img')),
+            'price': price,
+            'soldDate': 'Recently sold',
+            'soldInfo': clean_text(item.get('soldInfo') or 'Recently sold'),
+            'listingUrl': item.get('listingUrl') or '',
+            'location': clean_location(item.get('location')),
+            'marketplace': item.get('marketplace') or 'uk',
+        }
+        if item.get('soldAt'):
+            sale['soldAt'] = item['soldAt']
+        cleaned.append(sale)
+    return cleaned[:max_items] if max_items else cleaned
+
+
+def has_class(*names):
+    """XPath predicate: element carries every one of these classes"""
+    return ' and '.join(f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')" for name in names)
+
+
+# Field selectors in priority order, as the selector lists in pages/api/ebay.js.
+# Text fields take the first non-empty selector; (selector, attribute) pairs
+# read that attribute from the first match.
+FIELD_SELECTORS = {
+    'title': [
+        f".//*[{has_class('s-item__title')}]//span[@role='heading']",
+        f".//*[{has_class('s-item__title')}]",
+        ".//*[@data-testid='item-title']",
+        f".//*[{has_class('s-card__title')}]//span[{has_class('su-styled-text', 'primary', 'default')}]",
+        ".//h3",
+        ".//a[contains(@href, '/itm/')]",
+    ],
+    'price': [
+        f".//*[{has_class('s-card__price')}]",
+        f".//*[{has_class('s-item__price')}]",
+        ".//*[@data-testid='item-price']",
+    ],
+    'soldInfo': [
+        f".//*[{has_class('s-item__title--tagblock')}]//*[{has_class('POSITIVE')}]",
+        f".//*[{has_class('s-item__caption--signal')}]//*[{has_class('POSITIVE')}]",
+        f".//span[{has_class('su-styled-text', 'positive', 'default')}]",
+        f".//*[{has_class('s-item__ended-date')}]",
+    ],
+    'location': [
+        f".//*[{has_class('s-item__location')}]",
+        ".//*[contains(@class, 'location')]",
+        ".//span[starts-with(normalize-space(.), 'Located in') or starts-with(normalize-space(.), 'from ')]",
+    ],
+    'img': [
+        (f".//img[{has_class('s-card__image')}]", 'src'),
+        (f".//*[{has_class('s-item__image')}]//img", 'src'),
+        (f".//*[{has_class('s-item__image')}]//img", 'data-src'),
+        (".//img[contains(@src, 'ebayimg')]", 'src'),
+        (".//img", 'src'),
+        (".//img", 'data-src'),
+        (".//img", 'data-originalsrc'),
+    ],
+    'listingUrl': [
+        (f".//a[{has_class('s-item__link')}]", 'href'),
+        (".//a[contains(@href, '/itm/')]", 'href'),
+    ],
+}
+CONTAINER_SELECTOR = (
+    f"//li[{has_class('s-item')} or {has_class('s-card')}] | //article[.//a[contains(@href, '/itm/')]]"
+)
+
+
+def compile_selectors(field_selectors):
+    """{field: [compiled XPath returning a string]}: whitespace-normalized text
+    of the first match, or the attribute for (selector, attribute) pairs"""
+    compiled = {}
+    for field, selectors in field_selectors.items():
+        compiled[field] = [
+            etree.XPath(f"string(({selector[0]})[@{selector[1]}][1]/@{selector[1]})") if isinstance(selector, tuple)
+            else etree.XPath(f"normalize-space(({selector})[normalize-space(.) != ''][1])")
+            for selector in selectors
+        ]
+    return compiled
+
+
+EXTRACTORS = compile_selectors(FIELD_SELECTORS)
+FIND_CONTAINERS = etree.XPath(CONTAINER_SELECTOR)
+NODE_TEXT = etree.XPath('normalize-space(.)')
+HTML_PARSER = etree.HTMLParser(remove_comments=True)
+
+
+def extract(node, extractors=EXTRACTORS, preferred=None):
+    """{field: first non-empty value} for one listing container.
+
+    `preferred` maps field -> index of the selector that matched last time;
+    containers on one page share a layout, so trying that one first usually
+    skips the selectors meant for other layouts."""
+    fields = {}
+    for field, candidates in extractors.items():
+        value = ''
+        start = preferred.get(field, 0) if preferred is not None else 0
+        if start:
+            value = candidates[start](node)
+        if not value:
+            for index, candidate in enumerate(candidates):
+                if index == start and start:
+                    continue
+                value = candidate(node)
+                if value:
+                    if preferred is not None:
+                        preferred[field] = index
+                    break
+        fields[field] = value
+    return fields
+
+
+def parse_search_html(page, marketplace='uk'):
+    """Raw items from a sold-listings search results page"""
+    document = etree.fromstring(page, HTML_PARSER)
+    if document is None:
+        return []
+    items = []
+    preferred = {}
+    for node in FIND_CONTAINERS(document):
+        fields = extract(node, EXTRACTORS, preferred)
+        search_text = NODE_TEXT(node)
+        title = clean_text(fields['title'])
+        price = extract_price(fields['price']) or extract_price(search_text)
+        if not title or not price:
+            continue
+        sold_info = fields['soldInfo'] or extract_sold_info(search_text) or 'Recently sold'
+        items.append({
+            'title': title,
+            'price': price,
+            'img': fields['img'],
+            'soldInfo': sold_info,
+            'soldAt': sold_at(sold_info),
+            'listingUrl': fields['listingUrl'],
+            'location': clean_location(fields['location']),
+            'searchText': search_text,
+            'marketplace': marketplace,
+        })
+    return items
+
+
+def description_parts(description):
+    """Text chunks between the tags of an RSS item's HTML description"""
+    return [clean_text(unescape(part)) for part in TAG_PATTERN.split(description) if not part.isspace()]
+
+
+def parse_rss(feed, marketplace='uk'):
+    """Raw items from a sold-listings RSS feed, streamed item by item"""
+    source = io.BytesIO(feed.encode('utf-8') if isinstance(feed, str) else feed)
+    items = []
+    for _, item in etree.iterparse(source, events=('end',), tag='item', recover=True):
+        title = clean_text(item.findtext('title'))
+        description = item.findtext('description') or ''
+        parts = [part for part in description_parts(description) if part]
+        price = next((extract_price(part) for part in parts if PRICE_PATTERN.search(part)), '')
+        location = next((part for part in parts if part.lower().startswith('item location:')), '')
+        image = IMAGE_SRC_PATTERN.search(description)
+        pub_date = clean_text(item.findtext('pubDate'))
+        items.append({
+            'title': title,
+            'listingUrl': clean_text(item.findtext('link')),
+            'price': price,
+            'img': unescape(image.group(1)) if image else '',
+            'soldInfo': pub_date or 'Recently sold',
+            'soldAt': sold_at(pub_date),
+            'location': clean_location(location),
+            'searchText': f"{title} {' '.join(parts)}",
+            'marketplace': marketplace,
+        })
+        # Drop parsed items so memory stays flat on long feeds
+        item.clear()
+        while item.getprevious() is not None:
+            del item.getparent()[0]
+    return items
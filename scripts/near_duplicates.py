@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""Near-duplicate clustering of sold listings with MinHash and LSH.
+
+Sellers relist the same slab with a reworded title, and the same item shows
+up on both marketplaces under different listing ids, so exact
+de-duplication (scripts/sale_dedupe.py) misses them. Each normalized title
+is cut into character SHINGLE-grams. NUM_PERM MinHash values per title are
+computed in one vectorized pass (np.minimum.reduceat over every title's
+shingle hashes). The signatures are split into BANDS bands of ROWS rows;
+titles sold on the same day that share any band's hash become candidates.
+Clustering is per sold day, so a batch spanning months of history never
+pairs a slab with a later resale of the same card.
+
+Each candidate is confirmed against its bucket's first member with an exact
+check: the same numbers in the title (card number and grade), the same
+matched card if both have one, GBP prices within PRICE_TOLERANCE and
+shingle Jaccard >= THRESHOLD. Listing ids don't decide it, since a relist
+or a mirror always has an id of its own; the same id on both is taken as a
+duplicate without further checks. Sales without a sold date are never
+merged. Confirmed pairs are merged with union-find. Work is linear in the
+number of listings, so a whole day's scrape clusters in one call.
+
+collapse() keeps the first sale of each cluster; scripts/sales_store.py
+ingest uses it so relists and mirrors aren't counted twice in price stats.
+Near-identical titles from one seller's template can still collapse two
+real sales of the same card, grade and price sold on the same day.
+
+Requires NumPy (`pip install numpy`).
+
+Usage:
+    python3 scripts/near_duplicates.py data/sales/scraped-2025-06-12.ndjson [--show 10]
+    python3 scripts/near_duplicates.py --bench 100000
+"""
+
+import argparse
+import random
+import re
+import time
+import zlib
+
+import numpy as np
+
+from exchange_rates import RateTable
+from sales import listing_id, normalize_title, parse_price, parse_sold_date, read_ndjson
+
+SHINGLE = 5
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+THRESHOLD = 0.7
+PRICE_TOLERANCE = 0.15
+MERSENNE = (1 << 31) - 1
+NUMBER_PATTERN = re.compile(r'\d+(?:\.\d+)?')
+# Fixed permutations, so signatures are comparable between runs
+_random = np.random.default_rng(20250612)
+PERM_A = _random.integers(1, MERSENNE, NUM_PERM, dtype=np.uint64)
+PERM_B = _random.integers(0, MERSENNE, NUM_PERM, dtype=np.uint64)
+
+
+def shingles(title):
+    """Set of character shingle hashes of a normalized title"""
+    text = normalize_title(title)
+    if len(text) <= SHINGLE:
+        return {zlib.crc32(text.encode('utf-8'))}
+    return {zlib.crc32(text[i:i + SHINGLE].encode('utf-8')) for i in range(len(text) - SHINGLE + 1)}
+
+
+def signatures(shingle_sets, chunk=2000):
+    """(n, NUM_PERM) MinHash signatures for a list of shingle hash sets"""
+    parts = []
+    for offset in range(0, len(shingle_sets), chunk):
+        # Chunked so the (NUM_PERM x shingles) intermediate stays small
+        batch = shingle_sets[offset:offset + chunk]
+        counts = np.fromiter((len(values) for values in batch), dtype=np.int64, count=len(batch))
+        flat = np.fromiter((value for values in batch for value in values), dtype=np.uint64,
+                           count=int(counts.sum())) % MERSENNE
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        hashed = (PERM_A[:, None] * flat[None, :] + PERM_B[:, None]) % MERSENNE
+        parts.append(np.minimum.reduceat(hashed, starts, axis=1).T)
+    return np.concatenate(parts)
+
+
+def jaccard(first, second):
+    return len(first & second) / len(first | second) if first or second else 1.0
+
+
+def gbp_amount(sale, table):
+    amount, currency = parse_price(sale.get('price'), sale.get('marketplace'))
+    if currency not in table.currencies:
+        return amount
+    return table.convert(amount, currency, parse_sold_date(sale) or table.latest)
+
+
+def same_item(a, b, shingle_sets, numbers, prices, cards, listings):
+    """Exact confirmation of an LSH candidate pair (already sold on the same day)"""
+    if listings[a] and listings[a] == listings[b]:
+        return True
+    if numbers[a] != numbers[b] or (cards[a] and cards[b] and cards[a] != cards[b]):
+        return False
+    high = max(prices[a], prices[b])
+    if high and abs(prices[a] - prices[b]) > PRICE_TOLERANCE * high:
+        return False
+    return jaccard(shingle_sets[a], shingle_sets[b]) >= THRESHOLD
+
+
+def cluster(sales):
+    """Clusters of near-duplicate sales as lists of indices (singletons included), in input order"""
+    if not sales:
+        return []
+    titles = [sale.get('title') or '' for sale in sales]
+    shingle_sets = [shingles(title) for title in titles]
+    numbers = [frozenset(NUMBER_PATTERN.findall(title)) for title in titles]
+    table = RateTable()
+    prices = [gbp_amount(sale, table) for sale in sales]
+    cards = [sale.get('cardId') for sale in sales]
+    listings = [listing_id(sale) for sale in sales]
+    # Sold day as an ordinal; undated sales get a unique negative day so they never pair
+    sold = [parse_sold_date(sale) for sale in sales]
+    days = np.array([day.toordinal() if day else -1 - i for i, day in enumerate(sold)], dtype=np.int64)
+    signature = signatures(shingle_sets)
+
+    parent = list(range(len(sales)))
+
+    def find(item):
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    # One hash per band: wrapping polynomial over the band's rows
+    multipliers = np.array([1_000_003 ** row for row in range(ROWS)], dtype=np.uint64)
+    for band in range(BANDS):
+        keys = (signature[:, band * ROWS:(band + 1) * ROWS] * multipliers).sum(axis=1)
+        order = np.lexsort((keys, days))
+        boundary = (np.diff(keys[order]) != 0) | (np.diff(days[order]) != 0)
+        starts = np.concatenate([[0], np.flatnonzero(boundary) + 1])
+        ends = np.append(starts[1:], len(order))
+        shared = ends - starts > 1
+        for start, end in zip(starts[shared].tolist(), ends[shared].tolist()):
+            bucket = order[start:end]
+            first = int(bucket[0])
+            for other in bucket[1:].tolist():
+                if find(first) != find(other) and same_item(first, other, shingle_sets, numbers, prices, cards, listings):
+                    parent[find(other)] = find(first)
+
+    clusters = {}
+    for index in range(len(sales)):
+        clusters.setdefault(find(index), []).append(index)
+    return sorted(clusters.values(), key=lambda members: members[0])
+
+
+def collapse(sales):
+    """(first sale of every cluster, clusters with more than one member)"""
+    clusters = cluster(sales)
+    kept = []
+    for members in clusters:
+        sale = sales[members[0]]
+        if len(members) > 1:
+            sale = {**sale, 'nearDuplicates': len(members) - 1}
+        kept.append(sale)
+    return kept, [members for members in clusters if len(members) > 1]
+
+
+def synthetic_sales(count, seed=7):
+    """Templated titles with ~30% reworded relists/mirrors, each under its own
+    listing id, for --bench. `item` numbers the listed item a sale belongs to"""
+    rng = random.Random(seed)
+    names = ['Pikachu', 'Charizard', 'Umbreon', 'Gengar', 'Mewtwo', 'Rayquaza', 'Lugia', 'Eevee', 'Snorlax', 'Dragonite']
+    sets = ['Base Set', 'Evolving Skies', 'Team Up', 'Hidden Fates', 'Jungle', 'Fossil', 'Neo Genesis']
+    fillers = ['Pokemon Card', 'Gem Mint', 'Holo', 'Slab', 'Graded', 'UK Seller', 'Free Postage']
+    sales = []
+    while len(sales) < count:
+        title = (f"TAG {rng.choice(['10', '9.5', '9', '8.5'])} {rng.choice(names)} {rng.choice(sets)} "
+                 f"{rng.randint(1, 250)}/{rng.randint(100, 260)} {' '.join(rng.sample(fillers, 3))}")
+        price = round(rng.uniform(5, 800), 2)
+        sold = f"2025-06-{rng.randint(1, 30):02d}"
+        item = len(sales)
+        sales.append({'title': title, 'price': f"£{price}", 'marketplace': 'uk', 'soldAt': sold,
+                      'listingUrl': f"https://www.ebay.co.uk/itm/{300000000000 + item}", 'item': item})
+        if rng.random() < 0.3:
+            words = title.split(' ')
+            words[-1] = rng.choice(fillers)
+            sales.append({'title': ' '.join(words), 'price': f"${price * 1.27:.2f}", 'marketplace': 'us', 'soldAt': sold,
+                          'listingUrl': f"https://www.ebay.com/itm/{300000000000 + len(sales)}", 'item': item})
+    return sales[:count]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Cluster near-duplicate sold listings with MinHash/LSH')
+    parser.add_argument('paths', nargs='*', help='NDJSON sales files (e.g. one day of scrapes)')
+    parser.add_argument('--show', type=int, default=5, help='print this many of the largest clusters')
+    parser.add_argument('--bench', type=int, help='time clustering of this many synthetic sales instead')
+    args = parser.parse_args()
+
+    if args.bench:
+        for count in (args.bench // 4, args.bench // 2, args.bench):
+            sales = synthetic_sales(count)
+            started = time.perf_counter()
+            clusters = cluster(sales)
+            elapsed = time.perf_counter() - started
+            merged = sum(len(members) for members in clusters if len(members) > 1)
+            # A cluster is right when it holds exactly the sales of one item
+            items = {}
+            for index, sale in enumerate(sales):
+                items.setdefault(sale['item'], []).append(index)
+            exact = len({tuple(members) for members in clusters} & {tuple(members) for members in items.values()})
+            print(f"  {count:,} sales: {elapsed:.2f}s ({count / elapsed:,.0f} sales/s), "
+                  f"{len(clusters):,} clusters for {len(items):,} items ({exact:,} exact), "
+                  f"{merged:,} sales in near-duplicate clusters")
+        return
+
+    sales = [sale for path in args.paths for sale in read_ndjson(path)]
+    started = time.perf_counter()
+    kept, clusters = collapse(sales)
+    elapsed = (time.perf_counter() - started) * 1000
+    print(f"🔎 {len(sales):,} sales -> {len(kept):,} after collapsing {len(clusters):,} near-duplicate "
+          f"clusters in {elapsed:.1f} ms")
+    for members in sorted(clusters, key=len, reverse=True)[:args.show]:
+        print(f"  🧩 {len(members)} listings")
+        for index in members:
+            print(f"     {sales[index].get('price', ''):>10}  {sales[index].get('title', '')}")
+
+
+if __name__ == "__main__":
+    main()
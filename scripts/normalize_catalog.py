@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""Rewrite every set file in data/cards to the canonical catalog schema.
+
+Usage:
+    python3 scripts/normalize_catalog.py           # rewrite files in place
+    python3 scripts/normalize_catalog.py --check   # exit 1 if any file would change
+"""
+
+import argparse
+import sys
+
+from catalog import CARDS_DIR, dump_set, load_set, normalize_set, set_files, set_key
+
+
+def normalize_file(path, check=False):
+    """Normalize one set file; returns True if its contents changed"""
+    with open(path, 'r', encoding='utf-8') as f:
+        original = f.read()
+    normalized = dump_set(normalize_set(load_set(path), set_key(path)))
+    if normalized == original.rstrip('\n'):
+        return False
+    if not check:
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(normalized)
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Normalize card catalog files')
+    parser.add_argument('--cards-dir', default=CARDS_DIR)
+    parser.add_argument('--check', action='store_true', help='only report files that are not normalized')
+    args = parser.parse_args()
+
+    changed = [path for path in set_files(args.cards_dir) if normalize_file(path, args.check)]
+
+    for path in changed:
+        print(f"{'✗ Not normalized' if args.check else '✓ Normalized'}: {set_key(path)}")
+    print(f"📁 {len(changed)} of {len(set_files(args.cards_dir))} set files {'need normalizing' if args.check else 'rewritten'}")
+
+    if args.check and changed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
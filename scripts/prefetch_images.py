@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""Prefetch every remote card image in the catalog into public/card-assets.
+
+Images land where the site already looks for local art,
+public/card-assets/<set-key>/cards/<number>.<ext>. Downloads share one
+bounded aiohttp connection pool with a per-host limit, stream into a
+`.part` file that a later attempt (or run) resumes with a Range request, and
+record each image's ETag/Last-Modified in data/image-prefetch-state.json so a
+re-run only revalidates with conditional requests and transfers what changed.
+
+Requires aiohttp (`pip install aiohttp`).
+
+Usage:
+    python3 scripts/prefetch_images.py [--set base-set] [--connections 16] [--per-host 6]
+    python3 scripts/prefetch_images.py --base-url http://127.0.0.1:8080   # local stand-in server
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import formatdate
+from urllib.parse import urlparse, urlunparse
+
+import aiohttp
+
+from catalog import REPO_ROOT
+from images import ASSETS_DIR, card_asset_path, iter_card_images
+
+STATE_PATH = os.path.join(REPO_ROOT, 'data', 'image-prefetch-state.json')
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+CHUNK_SIZE = 64 * 1024
+# Statuses worth another attempt; anything else in 4xx is final
+RETRY_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+MISSING_STATUSES = {404, 410}
+STATE_SAVE_EVERY = 200
+
+
+class RetryableError(Exception):
+    pass
+
+
+def load_state(path=STATE_PATH):
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_state(state, path=STATE_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, ensure_ascii=False, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def rewrite_url(url, base_url):
+    """Point a catalog URL at another origin, keeping its path and query"""
+    if not base_url:
+        return url
+    base = urlparse(base_url)
+    return urlunparse(urlparse(url)._replace(scheme=base.scheme, netloc=base.netloc))
+
+
+def now_iso():
+    return datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+
+def request_headers(entry, path, part_path):
+    """Range headers when resuming a .part file, conditional headers when revalidating"""
+    headers = {'User-Agent': USER_AGENT}
+    partial = entry.get('partial') or {}
+    validator = partial.get('etag') or partial.get('lastModified')
+    if os.path.exists(part_path) and validator:
+        offset = os.path.getsize(part_path)
+        if offset:
+            headers['Range'] = f"bytes={offset}-"
+            headers['If-Range'] = validator
+            return headers, offset
+
+    if os.path.exists(path):
+        if entry.get('path') == path and entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('path') == path and entry.get('lastModified'):
+            headers['If-Modified-Since'] = entry['lastModified']
+        elif 'If-None-Match' not in headers:
+            # Fetched by another tool: the file's mtime is the best validator we have
+            headers['If-Modified-Since'] = formatdate(os.path.getmtime(path), usegmt=True)
+    return headers, 0
+
+
+def range_start(content_range):
+    """'bytes 100-199/200' -> 100"""
+    try:
+        return int(content_range.split()[1].split('-')[0])
+    except (AttributeError, IndexError, ValueError):
+        return None
+
+
+async def fetch_image(session, url, fetch_url, path, entry):
+    """One attempt at bringing `path` up to date; returns (outcome, bytes transferred)"""
+    part_path = path + '.part'
+    headers, offset = request_headers(entry, path, part_path)
+
+    async with session.get(fetch_url, headers=headers) as response:
+        if response.status == 304:
+            return 'unchanged', 0
+        if response.status in MISSING_STATUSES:
+            return 'missing', 0
+        if response.status in RETRY_STATUSES:
+            raise RetryableError(f"HTTP {response.status}")
+        if response.status not in (200, 206):
+            return f"http-{response.status}", 0
+
+        content_type = response.headers.get('Content-Type', '')
+        if not content_type.startswith('image/'):
+            return 'not-image', 0
+
+        resumed = response.status == 206 and offset and range_start(response.headers.get('Content-Range')) == offset
+        if response.status == 206 and not resumed:
+            # A range we did not ask for; start over without the partial
+            if os.path.exists(part_path):
+                os.remove(part_path)
+            entry.pop('partial', None)
+            raise RetryableError('unexpected partial response')
+
+        entry['partial'] = {
+            'etag': response.headers.get('ETag'),
+            'lastModified': response.headers.get('Last-Modified'),
+        }
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        transferred = 0
+        with open(part_path, 'ab' if resumed else 'wb') as f:
+            async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                f.write(chunk)
+                transferred += len(chunk)
+
+        expected = response.headers.get('Content-Length')
+        if expected is not None and transferred != int(expected):
+            raise RetryableError(f"short read ({transferred}/{expected} bytes)")
+
+        os.replace(part_path, path)
+        entry.pop('partial', None)
+        entry.update({
+            'path': path,
+            'etag': response.headers.get('ETag'),
+            'lastModified': response.headers.get('Last-Modified'),
+            'contentType': content_type.split(';')[0].strip(),
+            'size': os.path.getsize(path),
+        })
+        return ('resumed' if resumed else 'downloaded'), transferred
+
+
+async def prefetch_one(session, job, state, retries):
+    url, fetch_url, path = job
+    entry = state.setdefault(url, {})
+    transferred = 0
+    for attempt in range(1, retries + 1):
+        try:
+            outcome, received = await fetch_image(session, url, fetch_url, path, entry)
+            transferred += received
+            break
+        except (RetryableError, aiohttp.ClientError, asyncio.TimeoutError) as error:
+            outcome = 'failed'
+            entry['error'] = str(error) or type(error).__name__
+            if attempt < retries:
+                # Jittered linear backoff; a broken stream resumes from its .part file
+                await asyncio.sleep(attempt * (0.5 + random.random()))
+    if outcome != 'failed':
+        entry.pop('error', None)
+    entry['status'] = outcome
+    entry['checkedAt'] = now_iso()
+    return outcome, transferred
+
+
+def collect_jobs(sets=None, assets_dir=ASSETS_DIR, base_url=None, limit=None):
+    """(catalog url, url to fetch, destination) for every remote image, one per destination"""
+    jobs = []
+    seen = set()
+    for key, card, url in iter_card_images(sets=sets):
+        if not url.startswith(('http://', 'https://')):
+            continue
+        path = card_asset_path(key, card, url, assets_dir)
+        if path in seen:
+            continue
+        seen.add(path)
+        jobs.append((url, rewrite_url(url, base_url), path))
+    return jobs[:limit] if limit else jobs
+
+
+async def prefetch(jobs, state, state_path=STATE_PATH, connections=16, per_host=6,
+                   timeout=30, retries=3, verbose=False):
+    """Run the jobs through a worker pool sharing one connector; returns outcome counts"""
+    counts = {'bytes': 0}
+    queue = asyncio.Queue()
+    for job in jobs:
+        queue.put_nowait(job)
+
+    connector = aiohttp.TCPConnector(limit=connections, limit_per_host=per_host, ttl_dns_cache=300)
+    client_timeout = aiohttp.ClientTimeout(total=None, sock_connect=10, sock_read=timeout)
+    completed = 0
+
+    async def worker(session):
+        nonlocal completed
+        while True:
+            try:
+                job = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            outcome, transferred = await prefetch_one(session, job, state, retries)
+            counts[outcome] = counts.get(outcome, 0) + 1
+            counts['bytes'] += transferred
+            completed += 1
+            if verbose or outcome not in ('unchanged', 'downloaded', 'resumed'):
+                print(f"  {outcome:10} {job[0]}")
+            if completed % STATE_SAVE_EVERY == 0:
+                save_state(state, state_path)
+
+    async with aiohttp.ClientSession(connector=connector, timeout=client_timeout) as session:
+        try:
+            await asyncio.gather(*(worker(session) for _ in range(min(connections, len(jobs)) or 1)))
+        finally:
+            save_state(state, state_path)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Prefetch catalog card images into public/card-assets')
+    parser.add_argument('--set', action='append', dest='sets', help='only this set key (repeatable)')
+    parser.add_argument('--assets-dir', default=ASSETS_DIR)
+    parser.add_argument('--state', default=STATE_PATH)
+    parser.add_argument('--base-url', help='fetch from this origin instead, e.g. a local stand-in server')
+    parser.add_argument('--connections', type=int, default=16, help='total connection pool size')
+    parser.add_argument('--per-host', type=int, default=6, help='concurrent connections per host')
+    parser.add_argument('--timeout', type=float, default=30, help='socket read timeout in seconds')
+    parser.add_argument('--retries', type=int, default=3)
+    parser.add_argument('--limit', type=int, help='stop after this many images')
+    parser.add_argument('--verbose', action='store_true')
+    args = parser.parse_args()
+
+    jobs = collect_jobs(args.sets, args.assets_dir, args.base_url, args.limit)
+    print(f"🖼️  Prefetching {len(jobs)} images ({args.connections} connections, {args.per_host} per host)")
+
+    started = time.perf_counter()
+    state = load_state(args.state)
+    counts = asyncio.run(prefetch(
+        jobs, state, args.state, args.connections, args.per_host, args.timeout, args.retries, args.verbose
+    ))
+    elapsed = time.perf_counter() - started
+
+    transferred = counts.pop('bytes')
+    summary = ', '.join(f"{count} {outcome}" for outcome, count in sorted(counts.items()))
+    print(f"✅ Done in {elapsed:.1f}s: {summary or 'nothing to do'}")
+    print(f"📦 Transferred {transferred / (1024 * 1024):.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
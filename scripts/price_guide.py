@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""Recompute card priceGuide blocks from the stored sales history.
+
+All sales in the columnar store (scripts/sales_store.py) are grouped by
+(card id, variant) in one vectorized pass: rows are sorted by group and
+price, group boundaries come from the sorted keys, and np.add.reduceat plus
+index arithmetic on the boundaries give count, min, max, mean, median and a
+trimmed mean (TRIM of each tail dropped) for every group at once.
+
+Prices are converted to GBP first, at the rate of each sale's date
+(scripts/exchange_rates.py). Results are written back into the set
+files under data/cards as
+
+    "priceGuide": {"Regular": {"min", "max", "average", "median", "trimmedMean", "count", "currency"}}
+
+but only for cards that gained sales since the last run (tracked as per-
+partition row counts in data/price-guide-state.json), and only set files
+containing such cards are rewritten. Variants without stored sales keep
+their existing entries.
+
+Requires NumPy (`pip install numpy`).
+
+Usage:
+    python3 scripts/price_guide.py [--dry-run] [--full]
+"""
+
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+from catalog import CARDS_DIR, REPO_ROOT, load_set, normalize_set, save_set, set_files, set_key
+from exchange_rates import RateTable
+from sales_store import STORE_DIR, SalesStore
+
+STATE_PATH = os.path.join(REPO_ROOT, 'data', 'price-guide-state.json')
+# Share of sales dropped from each end for the trimmed mean
+TRIM = 0.1
+
+
+def load_state(path=STATE_PATH):
+    if not os.path.exists(path):
+        return {'rows': {}}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_state(state, path=STATE_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=1, sort_keys=True)
+
+
+def gbp_prices(store, columns, table=None):
+    """Minor-unit prices in each row's currency -> GBP amounts at the sale-date rate (needs 'ts')"""
+    table = table or RateTable()
+    return table.normalize(columns['price'] / 100, columns['currency'], store.values['currency'],
+                           columns['ts'], targets=('GBP',))['GBP']
+
+
+def group_stats(cards, variants, prices, trim=TRIM):
+    """Per (card, variant) group statistics in one pass.
+
+    Returns a dict of equal-length arrays: card, variant, count, min, max,
+    mean, median, trimmed_mean, one entry per group."""
+    valid = np.isfinite(prices) & (prices > 0)
+    cards, variants, prices = cards[valid], variants[valid], prices[valid]
+    if len(prices) == 0:
+        empty = np.empty(0)
+        return {name: empty for name in ('card', 'variant', 'count', 'min', 'max', 'mean', 'median', 'trimmed_mean')}
+
+    # One int64 sort key, group in the high 32 bits and price in pence in the
+    # low 32: a single argsort is ~10x faster than lexsort over three columns
+    groups = cards.astype(np.int64) * (int(variants.max()) + 1) + variants
+    pence = np.clip(np.round(prices * 100), 0, 2 ** 32 - 1).astype(np.int64)
+    order = np.argsort((groups << 32) | pence)
+    cards, variants, groups, prices = cards[order], variants[order], groups[order], pence[order] / 100
+    boundary = np.flatnonzero(np.diff(groups)) + 1
+    starts = np.concatenate([[0], boundary])
+    ends = np.concatenate([boundary, [len(prices)]])
+    counts = ends - starts
+
+    # Sorted by price inside each group, so min/max/median are positional
+    sums = np.add.reduceat(prices, starts)
+    medians = (prices[starts + (counts - 1) // 2] + prices[starts + counts // 2]) / 2
+    cumulative = np.concatenate([[0.0], np.cumsum(prices)])
+    trimmed = np.floor(counts * trim).astype(np.int64)
+    trimmed_means = (cumulative[ends - trimmed] - cumulative[starts + trimmed]) / (counts - 2 * trimmed)
+
+    return {
+        'card': cards[starts],
+        'variant': variants[starts],
+        'count': counts,
+        'min': prices[starts],
+        'max': prices[ends - 1],
+        'mean': sums / counts,
+        'median': medians,
+        'trimmed_mean': trimmed_means,
+    }
+
+
+def guide_entries(store, stats, card_codes=None):
+    """{card_id: {variant: priceGuide entry}} for groups of the given card codes (all if None)"""
+    keep = np.ones(len(stats['card']), dtype=bool) if card_codes is None else np.isin(stats['card'], card_codes)
+    entries = {}
+    for i in np.flatnonzero(keep):
+        card_id = store.values['card'][stats['card'][i]]
+        variant = store.values['variant'][stats['variant'][i]]
+        entries.setdefault(card_id, {})[variant] = {
+            'min': round(float(stats['min'][i]), 2),
+            'max': round(float(stats['max'][i]), 2),
+            'average': round(float(stats['mean'][i]), 2),
+            'median': round(float(stats['median'][i]), 2),
+            'trimmedMean': round(float(stats['trimmed_mean'][i]), 2),
+            'count': int(stats['count'][i]),
+            'currency': 'GBP',
+        }
+    return entries
+
+
+def write_guides(entries, cards_dir=CARDS_DIR, dry_run=False):
+    """Merge entries into the set files that hold those cards; returns (cards updated, files written)"""
+    updated = 0
+    written = []
+    for path in set_files(cards_dir):
+        data = load_set(path)
+        # Normalized ids line up with the raw cards, which may lack an id
+        normalized = normalize_set(data, set_key(path))['cards']
+        changed = False
+        for raw, card in zip(data.get('cards', []), normalized):
+            guide = entries.get(card.get('id'))
+            if not guide:
+                continue
+            merged = {**(raw.get('priceGuide') or {}), **guide}
+            if merged != raw.get('priceGuide'):
+                raw['priceGuide'] = merged
+                changed = True
+                updated += 1
+        if changed:
+            written.append(path)
+            if not dry_run:
+                save_set(path, data)
+    return updated, written
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Recompute priceGuide blocks from stored sales')
+    parser.add_argument('--store', default=STORE_DIR)
+    parser.add_argument('--cards-dir', default=CARDS_DIR)
+    parser.add_argument('--state', default=STATE_PATH)
+    parser.add_argument('--full', action='store_true', help='write every card with sales, not just changed ones')
+    parser.add_argument('--dry-run', action='store_true', help="report changes without writing set files")
+    args = parser.parse_args()
+
+    store = SalesStore(args.store)
+    state = load_state(args.state)
+    started = time.perf_counter()
+    columns = store.scan(('ts', 'card', 'variant', 'price', 'currency'))
+    stats = group_stats(columns['card'], columns['variant'], gbp_prices(store, columns))
+    elapsed = (time.perf_counter() - started) * 1000
+    print(f"📊 {len(stats['card']):,} card/variant groups from {store.rows:,} sales in {elapsed:.1f} ms")
+
+    dirty = None if args.full else np.unique(store.scan(('card',), state.get('rows'))['card'])
+    entries = guide_entries(store, stats, dirty)
+    updated, written = write_guides(entries, args.cards_dir, args.dry_run)
+    if not args.dry_run:
+        save_state({'rows': dict(store.partitions)}, args.state)
+    verb = 'Would update' if args.dry_run else 'Updated'
+    print(f"✅ {verb} priceGuide for {updated} cards in {len(written)} set files "
+          f"({len(entries)} cards with new sales)")
+    for path in written:
+        print(f"  📝 {os.path.relpath(path, REPO_ROOT)}")
+
+
+if __name__ == "__main__":
+    main()
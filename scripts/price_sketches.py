@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""Bounded-memory price statistics per (card, variant, grade) from t-digests.
+
+Every (card id, variant, grade) key keeps one t-digest (scripts/tdigest.py)
+of GBP prices per month and marketplace, plus a summary of all of them
+merged: count, min, max, p10/p25/p50/p75/p90 and the IQR outlier fences
+(q1 - 1.5 IQR, q3 + 1.5 IQR). Each digest is bounded in size however many
+sales it covers, so an all-time median is read from the summary as cheaply
+as a one-month one, and any other window is a merge of a few digests.
+
+Sketches are built from the columnar sales store (scripts/sales_store.py),
+one worker process per monthly partition; the workers' digests are merged
+into data/price-sketches.json. Re-runs only sketch rows appended since the
+last run and re-summarize the keys they touch.
+
+Requires NumPy (`pip install numpy`).
+
+Usage:
+    python3 scripts/price_sketches.py [--workers 4] [--full]
+    python3 scripts/price_sketches.py query base-004 [--variant Holo] [--grade "TAG 9.5"] [--since 2025-01] [--marketplace uk]
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from catalog import REPO_ROOT
+from price_guide import gbp_prices
+from sales_store import GRADERS, STORE_DIR, SalesStore
+from tdigest import DEFAULT_COMPRESSION, TDigest
+
+SKETCHES_PATH = os.path.join(REPO_ROOT, 'data', 'price-sketches.json')
+SKETCHES_VERSION = 3
+SUMMARY_QUANTILES = (0.1, 0.25, 0.5, 0.75, 0.9)
+
+
+def grade_label(grader, tenths):
+    """'TAG 9.5', 'PSA' (grade unreadable) or 'Ungraded', the keys gradeKey in utils/titleAnalyzer.mjs makes"""
+    if not GRADERS[grader]:
+        return f"{tenths / 10:g}" if tenths else 'Ungraded'
+    return f"{GRADERS[grader]} {tenths / 10:g}" if tenths else GRADERS[grader]
+
+
+def sketch_key(card_id, variant, grade):
+    return f"{card_id}|{variant}|{grade}"
+
+
+def sketch_partition(store_dir, month, start, compression):
+    """{key: {marketplace: digest dict}} for rows start.. of one partition (runs in a worker process)"""
+    store = SalesStore(store_dir)
+    columns = {
+        column: np.asarray(store.column(month, column)[start:])
+        for column in ('ts', 'card', 'variant', 'grader', 'grade', 'price', 'currency', 'marketplace')
+    }
+    prices = gbp_prices(store, columns)
+    valid = np.isfinite(prices) & (prices > 0)
+
+    # Group rows by (card, variant, grader, grade, marketplace) with one packed sort key
+    group = np.zeros(int(valid.sum()), dtype=np.int64)
+    for column in ('card', 'variant', 'grader', 'grade', 'marketplace'):
+        values = columns[column][valid].astype(np.int64)
+        group = group * (int(values.max(initial=0)) + 1) + values
+    order = np.argsort(group, kind='stable')
+    group, prices = group[order], prices[valid][order]
+    rows = {column: columns[column][valid][order] for column in ('card', 'variant', 'grader', 'grade', 'marketplace')}
+    starts = np.concatenate([[0], np.flatnonzero(np.diff(group)) + 1]) if len(group) else np.empty(0, dtype=np.int64)
+    ends = np.append(starts[1:], len(group))
+
+    partials = {}
+    for start_row, end_row in zip(starts, ends):
+        key = sketch_key(
+            store.values['card'][rows['card'][start_row]],
+            store.values['variant'][rows['variant'][start_row]],
+            grade_label(int(rows['grader'][start_row]), int(rows['grade'][start_row])),
+        )
+        digest = TDigest(compression)
+        digest.extend(prices[start_row:end_row])
+        partials.setdefault(key, {})[store.values['marketplace'][rows['marketplace'][start_row]]] = digest.to_dict()
+    return partials
+
+
+def summarize(digest):
+    p10, q1, p50, q3, p90 = digest.quantiles(SUMMARY_QUANTILES)
+    iqr = q3 - q1
+    return {
+        'count': int(round(digest.count)),
+        'min': round(digest.minimum, 2),
+        'max': round(digest.maximum, 2),
+        'p10': round(p10, 2),
+        'p25': round(q1, 2),
+        'p50': round(p50, 2),
+        'p75': round(q3, 2),
+        'p90': round(p90, 2),
+        'lowerFence': round(max(0.0, q1 - 1.5 * iqr), 2),
+        'upperFence': round(q3 + 1.5 * iqr, 2),
+        'currency': 'GBP',
+    }
+
+
+def load_sketches(path=SKETCHES_PATH, compression=DEFAULT_COMPRESSION):
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') == SKETCHES_VERSION and data.get('compression') == compression:
+            return data
+    return {'version': SKETCHES_VERSION, 'compression': compression, 'rows': {}, 'sketches': {}, 'summary': {}}
+
+
+def save_sketches(data, path=SKETCHES_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        # json.dumps runs the C encoder; json.dump streams through the pure-Python one
+        f.write(json.dumps(data, separators=(',', ':')))
+    os.replace(tmp_path, path)
+
+
+def merge_partials(digests, compression):
+    return TDigest.merged((TDigest.from_dict(digest) for digest in digests), compression)
+
+
+def build_sketches(store_dir=STORE_DIR, path=SKETCHES_PATH, compression=DEFAULT_COMPRESSION, workers=None, full=False):
+    """Sketch rows appended since the last run; returns (data, rows sketched, keys re-summarized)"""
+    store = SalesStore(store_dir)
+    data = load_sketches(path, compression)
+    if full:
+        data.update(rows={}, sketches={}, summary={})
+    done = data['rows']
+    jobs = {month: done.get(month, 0) for month, rows in store.partitions.items() if rows > done.get(month, 0)}
+
+    dirty = set()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            month: pool.submit(sketch_partition, store_dir, month, start, compression)
+            for month, start in jobs.items()
+        }
+        for month, future in futures.items():
+            for key, by_marketplace in future.result().items():
+                partials = data['sketches'].setdefault(key, {})
+                for marketplace, digest in by_marketplace.items():
+                    slot = f"{month}:{marketplace}"
+                    previous = partials.get(slot)
+                    partials[slot] = merge_partials([previous, digest], compression).to_dict() if previous else digest
+                dirty.add(key)
+
+    for key in dirty:
+        data['summary'][key] = summarize(merge_partials(data['sketches'][key].values(), compression))
+    data['rows'] = {month: store.partitions[month] for month in store.partitions}
+    save_sketches(data, path)
+    return data, sum(store.partitions[month] - start for month, start in jobs.items()), len(dirty)
+
+
+def query(data, card_id, variant=None, grade=None, since=None, until=None, marketplace=None):
+    """Summary over the matching keys and month:marketplace partials (all time uses the stored summary)"""
+    keys = [
+        key for key in data['sketches']
+        if key.split('|')[0] == card_id
+        and (variant is None or key.split('|')[1] == variant)
+        and (grade is None or key.split('|')[2] == grade)
+    ]
+    if len(keys) == 1 and not (since or until or marketplace):
+        return data['summary'][keys[0]]
+    digests = [
+        digest
+        for key in keys
+        for slot, digest in data['sketches'][key].items()
+        if (not since or slot[:7] >= since) and (not until or slot[:7] <= until)
+        and (not marketplace or slot[8:] == marketplace)
+    ]
+    return summarize(merge_partials(digests, data['compression'])) if digests else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Quantile sketches of sale prices per card, variant and grade')
+    parser.add_argument('--store', default=STORE_DIR)
+    parser.add_argument('--sketches', default=SKETCHES_PATH)
+    parser.add_argument('--compression', type=int, default=DEFAULT_COMPRESSION)
+    subparsers = parser.add_subparsers(dest='command')
+
+    build_parser = subparsers.add_parser('build', help='sketch new rows (default command)')
+    build_parser.add_argument('--workers', type=int, help='worker processes (default: CPU count)')
+    build_parser.add_argument('--full', action='store_true', help='discard existing sketches and rebuild')
+
+    query_parser = subparsers.add_parser('query', help="price quantiles for one card")
+    query_parser.add_argument('card_id')
+    query_parser.add_argument('--variant')
+    query_parser.add_argument('--grade', help="e.g. 'TAG 10', 'PSA 9.5' or 'Ungraded'")
+    query_parser.add_argument('--since', help='first month, YYYY-MM')
+    query_parser.add_argument('--until', help='last month, YYYY-MM')
+    query_parser.add_argument('--marketplace', choices=['uk', 'us'])
+    args = parser.parse_args()
+
+    if args.command == 'query':
+        data = load_sketches(args.sketches, args.compression)
+        started = time.perf_counter()
+        summary = query(data, args.card_id, args.variant, args.grade, args.since, args.until, args.marketplace)
+        elapsed = (time.perf_counter() - started) * 1000
+        print(json.dumps(summary, indent=2))
+        print(f"🔎 {args.card_id} in {elapsed:.2f} ms")
+        return
+
+    started = time.perf_counter()
+    data, rows, keys = build_sketches(args.store, args.sketches, args.compression,
+                                      getattr(args, 'workers', None), getattr(args, 'full', False))
+    size = os.path.getsize(args.sketches)
+    print(f"✅ Sketched {rows:,} new sales, re-summarized {keys:,} keys in {time.perf_counter() - started:.1f}s "
+          f"({len(data['sketches']):,} keys)")
+    print(f"📁 Sketches: {args.sketches} ({size / 1024:.0f} KB)")
+
+
+if __name__ == "__main__":
+    main()
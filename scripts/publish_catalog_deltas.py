@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""Publish the catalog as versioned per-card patches.
+
+Keeps the previously published catalog in data/catalog-published.json and
+compares the current catalog against it. Each publish that changes anything
+writes one patch plus an updated changelog index:
+
+    public/catalog/patches/<version>.json
+    public/catalog/changelog.json
+
+A patch holds, per set, the added cards, removed card ids and changed card
+fields (`set` for new/updated values, `unset` for removed keys). A client at
+version N applies patches N+1..latest in order; a client older than the
+oldest retained patch refetches the full catalog. See utils/catalogPatches.js.
+
+The first publish is version 1 with no patch: it is the base every client
+starts from. Every publish also rebuilds the set shards
+(scripts/build_catalog_shards.py) with the published version in their
+manifest, so public/catalog always holds a complete base at the latest
+version for a client to start from.
+
+The snapshot, the changelog and the patches are the version history and
+are committed with the catalog change they publish; the shards and their
+manifest are rebuilt from them on every build. A checkout without them
+would start again at version 1 and strand every cached client.
+
+Usage:
+    python3 scripts/publish_catalog_deltas.py [--keep 50]
+"""
+
+import argparse
+import json
+import os
+from datetime import datetime, timezone
+
+from build_catalog_shards import build_shards
+from catalog import CARDS_DIR, REPO_ROOT, iter_catalog, normalize_set
+
+DEFAULT_OUTPUT = os.path.join(REPO_ROOT, 'public', 'catalog')
+SNAPSHOT_PATH = os.path.join(REPO_ROOT, 'data', 'catalog-published.json')
+
+
+def current_catalog(cards_dir=CARDS_DIR):
+    """{set_key: {'setInfo': {...}, 'cards': {id: card}}} for the working tree"""
+    catalog = {}
+    for key, data in iter_catalog(cards_dir):
+        data = normalize_set(data, key)
+        catalog[key] = {
+            'setInfo': data['setInfo'],
+            'cards': {card['id']: card for card in data['cards']},
+        }
+    return catalog
+
+
+def diff_fields(old, new):
+    """Field-level diff of two dicts, or None if they are equal"""
+    changed = {key: value for key, value in new.items() if old.get(key) != value}
+    removed = sorted(key for key in old if key not in new)
+    if not changed and not removed:
+        return None
+    diff = {}
+    if changed:
+        diff['set'] = changed
+    if removed:
+        diff['unset'] = removed
+    return diff
+
+
+def diff_catalog(old, new):
+    """Per-set patch entries between two catalogs"""
+    sets = {}
+    for key, current in new.items():
+        previous = old.get(key, {'setInfo': {}, 'cards': {}})
+        entry = {}
+
+        info_diff = diff_fields(previous['setInfo'], current['setInfo'])
+        if info_diff:
+            entry['setInfo'] = info_diff
+
+        added = [card for card_id, card in current['cards'].items() if card_id not in previous['cards']]
+        removed = [card_id for card_id in previous['cards'] if card_id not in current['cards']]
+        changed = {}
+        for card_id, card in current['cards'].items():
+            if card_id in previous['cards']:
+                card_diff = diff_fields(previous['cards'][card_id], card)
+                if card_diff:
+                    changed[card_id] = card_diff
+
+        if added:
+            entry['added'] = added
+        if removed:
+            entry['removed'] = removed
+        if changed:
+            entry['changed'] = changed
+        if entry:
+            sets[key] = entry
+
+    removed_sets = sorted(key for key in old if key not in new)
+    return sets, removed_sets
+
+
+def load_json(path, default):
+    if not os.path.exists(path):
+        return default
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def write_json(path, data, indent=None):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=indent, separators=(',', ': ') if indent else (',', ':'))
+    os.replace(tmp_path, path)
+
+
+def write_snapshot(path, version, catalog):
+    # One field per line, so a committed snapshot diffs like the set files it mirrors
+    write_json(path, {'version': version, 'sets': catalog}, indent=1)
+
+
+def published_version(cards_dir=CARDS_DIR, snapshot_path=SNAPSHOT_PATH):
+    """Published version the working catalog is identical to, or None if it has unpublished changes"""
+    snapshot = load_json(snapshot_path, None)
+    if not snapshot or snapshot['sets'] != current_catalog(cards_dir):
+        return None
+    return snapshot['version']
+
+
+def publish(output=DEFAULT_OUTPUT, snapshot_path=SNAPSHOT_PATH, cards_dir=CARDS_DIR, keep=50):
+    """Publish a new version if the catalog changed and rebuild the shards as its base;
+    returns the changelog entry or None"""
+    snapshot = load_json(snapshot_path, {'version': 0, 'sets': {}})
+    changelog_path = os.path.join(output, 'changelog.json')
+    changelog = load_json(changelog_path, {'latest': snapshot['version'], 'versions': []})
+
+    catalog = current_catalog(cards_dir)
+    sets, removed_sets = diff_catalog(snapshot['sets'], catalog)
+    if not sets and not removed_sets:
+        build_shards(output, cards_dir, snapshot['version'] or None)
+        return None
+
+    version = snapshot['version'] + 1
+    generated_at = datetime.now(timezone.utc).isoformat(timespec='seconds')
+    if version == 1:
+        # No client holds version 0, so the base needs no patch
+        write_json(changelog_path, {'latest': version, 'oldest': version, 'versions': []})
+        write_snapshot(snapshot_path, version, catalog)
+        build_shards(output, cards_dir, version)
+        return {'version': version, 'from': 0, 'generatedAt': generated_at, 'patch': None, 'bytes': 0,
+                'sets': sorted(catalog), 'added': sum(len(s['cards']) for s in catalog.values()),
+                'removed': 0, 'changed': 0}
+
+    patch = {
+        'from': snapshot['version'],
+        'version': version,
+        'generatedAt': generated_at,
+        'sets': sets,
+        'removedSets': removed_sets,
+    }
+    patch_name = f"patches/{version}.json"
+    patch_path = os.path.join(output, patch_name)
+    write_json(patch_path, patch)
+
+    entry = {
+        'version': version,
+        'from': snapshot['version'],
+        'generatedAt': generated_at,
+        'patch': patch_name,
+        'bytes': os.path.getsize(patch_path),
+        'sets': sorted(set(sets) | set(removed_sets)),
+        'added': sum(len(s.get('added', [])) for s in sets.values()),
+        'removed': sum(len(s.get('removed', [])) for s in sets.values()),
+        'changed': sum(len(s.get('changed', {})) for s in sets.values()),
+    }
+    versions = changelog['versions'] + [entry]
+
+    # Retire old patches; clients older than the oldest kept `from` refetch everything
+    for old in versions[:-keep]:
+        old_path = os.path.join(output, old['patch'])
+        if os.path.exists(old_path):
+            os.remove(old_path)
+    versions = versions[-keep:]
+
+    write_json(changelog_path, {
+        'latest': version,
+        'oldest': versions[0]['from'],
+        'versions': versions,
+    })
+    write_snapshot(snapshot_path, version, catalog)
+    build_shards(output, cards_dir, version)
+    return entry
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Publish catalog changes as versioned patches')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT)
+    parser.add_argument('--snapshot', default=SNAPSHOT_PATH)
+    parser.add_argument('--cards-dir', default=CARDS_DIR)
+    parser.add_argument('--keep', type=int, default=50, help='number of patches to retain')
+    args = parser.parse_args()
+
+    entry = publish(args.output, args.snapshot, args.cards_dir, args.keep)
+    if entry is None:
+        print("✓ Catalog unchanged since the last published version")
+        return
+
+    print(f"✅ Published catalog version {entry['version']} "
+          f"({entry['added']} added, {entry['removed']} removed, {entry['changed']} changed "
+          f"across {len(entry['sets'])} sets)")
+    if entry['patch']:
+        print(f"📁 Patch: {os.path.join(args.output, entry['patch'])} ({entry['bytes'] / 1024:.1f} KB)")
+    print(f"📌 Commit {os.path.relpath(args.snapshot, REPO_ROOT)}, {os.path.relpath(args.output, REPO_ROOT)}/changelog.json "
+          f"and {os.path.relpath(args.output, REPO_ROOT)}/patches/ with the catalog change")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""Incremental 7/30/90-day rolling price aggregates per (card, variant).
+
+Each (card id, variant) keeps a ring buffer of daily buckets (count, sum,
+min, max of GBP prices) covering the longest window, plus running count
+and sum totals per window and a time-decayed EWMA per window (time
+constant = window length). Adding a sale touches one bucket, the running
+totals and the EWMAs, so it is O(1); buckets that fall out of a window are
+subtracted from its totals lazily, when the series is next advanced to a
+later day. Min and max aren't subtractable, so they are taken over the
+window's buckets on read.
+
+New rows are read from the columnar sales store (scripts/sales_store.py)
+since the last run, so the aggregator restarts from its persisted state in
+data/rolling-aggregates.json instead of replaying all history. A snapshot
+is written to public/data/card-trends.json:
+
+    {"asOf": "2025-06-30", "cards": {"base1-4": {"Regular": {"7d": {"count", "average",
+     "min", "max", "ewma", "perDay"}, "30d": {...}, "90d": {...}}}}}
+
+and each card's entry to public/data/card-trends/<card id>.json (unsafe
+characters escaped as in catalog.card_filename), which the cards page
+fetches when a card is opened. Files of cards whose trends are unchanged
+are left alone; cards that dropped out of every window lose theirs.
+
+Requires NumPy (`pip install numpy`).
+
+Usage:
+    python3 scripts/rolling_aggregates.py [--as-of 2025-06-30] [--full]
+    python3 scripts/rolling_aggregates.py show base1-4 [--variant Holo]
+"""
+
+import argparse
+import json
+import math
+import os
+import time
+from datetime import date, datetime, timezone
+
+import numpy as np
+
+from catalog import REPO_ROOT, card_filename
+from price_guide import gbp_prices
+from sales_store import STORE_DIR, SalesStore
+
+STATE_PATH = os.path.join(REPO_ROOT, 'data', 'rolling-aggregates.json')
+TRENDS_PATH = os.path.join(REPO_ROOT, 'public', 'data', 'card-trends.json')
+TRENDS_DIR = os.path.join(REPO_ROOT, 'public', 'data', 'card-trends')
+STATE_VERSION = 1
+WINDOWS = (7, 30, 90)
+SPAN = max(WINDOWS)
+DAY = 86400
+
+
+def day_number(value):
+    """Days since the Unix epoch for a date or Unix seconds"""
+    if isinstance(value, date):
+        return value.toordinal() - date(1970, 1, 1).toordinal()
+    return int(value) // DAY
+
+
+class RollingSeries:
+    """Daily buckets of one (card, variant) over the last SPAN days"""
+
+    def __init__(self):
+        self.head = None  # newest day the buckets have been advanced to
+        self.days = [None] * SPAN
+        self.count = [0] * SPAN
+        self.sum = [0.0] * SPAN
+        self.min = [math.inf] * SPAN
+        self.max = [-math.inf] * SPAN
+        self.totals = {window: [0, 0.0] for window in WINDOWS}
+        # Decayed (weighted price sum, weight) per window, as of self.head
+        self.ewma = {window: [0.0, 0.0] for window in WINDOWS}
+
+    def advance(self, day):
+        """Move the head to `day`, rolling buckets out of each window"""
+        if self.head is None:
+            self.head = day
+            return
+        if day <= self.head:
+            return
+        for window in WINDOWS:
+            # Days leaving this window: (head - window, min(head, day - window)], at most `window`
+            for old in range(self.head - window + 1, min(self.head, day - window) + 1):
+                slot = old % SPAN
+                if self.days[slot] == old:
+                    self.totals[window][0] -= self.count[slot]
+                    self.totals[window][1] -= self.sum[slot]
+        for window in WINDOWS:
+            decay = math.exp(-(day - self.head) / window)
+            self.ewma[window][0] *= decay
+            self.ewma[window][1] *= decay
+        self.head = day
+
+    def add(self, day, price):
+        """Record one sale; sales older than the longest window are ignored"""
+        self.advance(day)
+        age = self.head - day
+        if age >= SPAN:
+            return
+        slot = day % SPAN
+        if self.days[slot] != day:
+            self.days[slot] = day
+            self.count[slot], self.sum[slot] = 0, 0.0
+            self.min[slot], self.max[slot] = math.inf, -math.inf
+        self.count[slot] += 1
+        self.sum[slot] += price
+        self.min[slot] = min(self.min[slot], price)
+        self.max[slot] = max(self.max[slot], price)
+        for window in WINDOWS:
+            if age < window:
+                self.totals[window][0] += 1
+                self.totals[window][1] += price
+            weight = math.exp(-age / window)
+            self.ewma[window][0] += weight * price
+            self.ewma[window][1] += weight
+
+    def window(self, window, as_of):
+        """Aggregates over the `window` days ending at `as_of` (advances the series to it)"""
+        self.advance(as_of)
+        count, total = self.totals[window]
+        if not count:
+            return None
+        buckets = [
+            slot for slot in ((self.head - age) % SPAN for age in range(window))
+            if self.days[slot] is not None and self.head - self.days[slot] < window
+        ]
+        weighted, weight = self.ewma[window]
+        return {
+            'count': count,
+            'average': round(total / count, 2),
+            'min': round(min(self.min[slot] for slot in buckets), 2),
+            'max': round(max(self.max[slot] for slot in buckets), 2),
+            'ewma': round(weighted / weight, 2) if weight else None,
+            'perDay': round(count / window, 3),
+        }
+
+    def to_dict(self):
+        """Compact form: head day, non-empty buckets as [age, count, sum, min, max], EWMA pairs"""
+        buckets = []
+        for slot in range(SPAN):
+            day = self.days[slot]
+            if day is not None and self.head - day < SPAN:
+                buckets.append([self.head - day, self.count[slot], round(self.sum[slot], 2),
+                                self.min[slot], self.max[slot]])
+        return {
+            'head': self.head,
+            'buckets': sorted(buckets),
+            'ewma': [[round(value, 4) for value in self.ewma[window]] for window in WINDOWS],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        series = cls()
+        series.head = data['head']
+        for age, count, total, low, high in data['buckets']:
+            day = series.head - age
+            slot = day % SPAN
+            series.days[slot] = day
+            series.count[slot], series.sum[slot] = count, total
+            series.min[slot], series.max[slot] = low, high
+            for window in WINDOWS:
+                if age < window:
+                    series.totals[window][0] += count
+                    series.totals[window][1] += total
+        for window, pair in zip(WINDOWS, data['ewma']):
+            series.ewma[window] = list(pair)
+        return series
+
+
+def series_key(card_id, variant):
+    return f"{card_id}|{variant}"
+
+
+def load_state(path=STATE_PATH):
+    """({key: RollingSeries}, {month: rows consumed})"""
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') == STATE_VERSION and tuple(data.get('windows', ())) == WINDOWS:
+            return {key: RollingSeries.from_dict(value) for key, value in data['series'].items()}, data['rows']
+    return {}, {}
+
+
+def save_state(series, rows, path=STATE_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(json.dumps({
+            'version': STATE_VERSION,
+            'windows': list(WINDOWS),
+            'rows': rows,
+            'series': {key: value.to_dict() for key, value in series.items()},
+        }, separators=(',', ':')))
+    os.replace(tmp_path, path)
+
+
+def update(series, store, since_rows):
+    """Feed store rows appended after `since_rows` into the series, oldest first; returns rows added"""
+    columns = store.scan(('ts', 'card', 'variant', 'price', 'currency'), since_rows)
+    prices = gbp_prices(store, columns)
+    keep = np.isfinite(prices) & (prices > 0)
+    order = np.flatnonzero(keep)[np.argsort(columns['ts'][keep], kind='stable')]
+    days = columns['ts'][order] // DAY
+    keys = [series_key(store.values['card'][card], store.values['variant'][variant])
+            for card, variant in zip(columns['card'][order].tolist(), columns['variant'][order].tolist())]
+    for key, day, price in zip(keys, days.tolist(), prices[order].tolist()):
+        entry = series.get(key)
+        if entry is None:
+            entry = series[key] = RollingSeries()
+        entry.add(day, price)
+    return len(order)
+
+
+def snapshot(series, as_of):
+    """{card_id: {variant: {'7d': aggregates, ...}}} for series with sales in the longest window"""
+    cards = {}
+    for key, entry in sorted(series.items()):
+        windows = {f"{window}d": entry.window(window, as_of) for window in WINDOWS}
+        if any(windows.values()):
+            card_id, variant = key.split('|', 1)
+            cards.setdefault(card_id, {})[variant] = windows
+    return cards
+
+
+def write_card_trends(cards, directory=TRENDS_DIR):
+    """One file per card; returns the number of files written or removed"""
+    os.makedirs(directory, exist_ok=True)
+    changed = 0
+    expected = set()
+    for card_id, variants in cards.items():
+        name = card_filename(card_id)
+        expected.add(name)
+        path = os.path.join(directory, name)
+        payload = json.dumps(variants, separators=(',', ':'))
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                if f.read() == payload:
+                    continue
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(payload)
+        changed += 1
+    for name in os.listdir(directory):
+        if name not in expected:
+            os.remove(os.path.join(directory, name))
+            changed += 1
+    return changed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Rolling 7/30/90-day price aggregates per card and variant')
+    parser.add_argument('--store', default=STORE_DIR)
+    parser.add_argument('--state', default=STATE_PATH)
+    parser.add_argument('--trends', default=TRENDS_PATH, help='snapshot JSON of every card')
+    parser.add_argument('--trends-dir', default=TRENDS_DIR, help='per-card snapshot files for the cards page')
+    parser.add_argument('--as-of', type=date.fromisoformat, help='window end date (default: today, UTC; windows never end before the newest sale)')
+    parser.add_argument('--full', action='store_true', help='discard saved state and replay the whole store')
+    subparsers = parser.add_subparsers(dest='command')
+    subparsers.add_parser('update', help='add new sales and write the snapshot (default command)')
+    show_parser = subparsers.add_parser('show', help="print one card's windows from the saved state")
+    show_parser.add_argument('card_id')
+    show_parser.add_argument('--variant')
+    args = parser.parse_args()
+
+    as_of = day_number(args.as_of or datetime.now(timezone.utc).date())
+    series, rows = ({}, {}) if args.full else load_state(args.state)
+
+    if args.command == 'show':
+        cards = snapshot({key: entry for key, entry in series.items() if key.split('|', 1)[0] == args.card_id}, as_of)
+        windows = cards.get(args.card_id, {})
+        print(json.dumps({args.variant: windows.get(args.variant)} if args.variant else windows, indent=2))
+        return
+
+    store = SalesStore(args.store)
+    started = time.perf_counter()
+    added = update(series, store, rows)
+    elapsed = time.perf_counter() - started
+    print(f"📊 Added {added:,} sales to {len(series):,} card/variant series in {elapsed:.2f}s "
+          f"({added / elapsed if elapsed else 0:,.0f} sales/s)")
+    save_state(series, dict(store.partitions), args.state)
+
+    cards = snapshot(series, as_of)
+    os.makedirs(os.path.dirname(args.trends), exist_ok=True)
+    with open(args.trends, 'w', encoding='utf-8') as f:
+        json.dump({'asOf': date.fromordinal(date(1970, 1, 1).toordinal() + as_of).isoformat(), 'cards': cards},
+                  f, separators=(',', ':'))
+    changed = write_card_trends(cards, args.trends_dir)
+    print(f"✅ Trends for {len(cards):,} cards -> {os.path.relpath(args.trends, REPO_ROOT)}, "
+          f"{changed:,} per-card files changed")
+    print(f"📁 State: {args.state} ({os.path.getsize(args.state) / 1024:.0f} KB)")
+
+
+if __name__ == "__main__":
+    main()
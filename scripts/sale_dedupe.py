@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""Persistent sale de-duplication with a rotating Bloom filter.
+
+A sale's fingerprint is its eBay listing id, or (for listings without one)
+the normalized title, price and sold date. Fingerprints are remembered in
+a chain of Bloom filter generations: new ones go into the newest
+generation, which is retired once it is GENERATION_DAYS old or holds
+CAPACITY fingerprints; only the last GENERATIONS generations are kept, so
+memory stays bounded however long the scraper runs, and a check costs a
+fixed number of hash probes.
+
+A Bloom filter never misses a fingerprint it holds but may report one it
+doesn't. A hit is therefore confirmed against the exact fingerprints of the
+sales files the generations that matched can have recorded (scraped-<day>
+files from those generations' days; each file is read once and again only
+if it grows), so a false positive can't drop a genuinely new sale and a
+hit costs a few days of files rather than the whole window.
+
+Filter state lives in data/sale-dedupe.json; scripts/scrape_worker.py saves
+it after every page it flushes, and uses it instead of re-reading every
+stored sale on start-up.
+
+Usage:
+    python3 scripts/sale_dedupe.py                     # summary of the saved filters
+    python3 scripts/sale_dedupe.py --rebuild           # refill from data/sales/*.ndjson
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import math
+import os
+import re
+from datetime import date, datetime, timedelta, timezone
+
+from catalog import REPO_ROOT
+from sales import SALES_DIR, listing_id, normalize_title, parse_price, parse_sold_date, read_ndjson, sales_files
+
+STATE_PATH = os.path.join(REPO_ROOT, 'data', 'sale-dedupe.json')
+STATE_VERSION = 1
+GENERATION_DAYS = 30
+GENERATIONS = 4
+CAPACITY = 200_000
+FALSE_POSITIVE_RATE = 0.001
+SCRAPED_FILE_PATTERN = re.compile(r'scraped-(\d{4}-\d{2}-\d{2})\.ndjson$')
+
+
+def fingerprint(sale):
+    """'id:<listing id>', else 'fp:<normalized title>|<amount currency>|<sold date>'
+
+    Same as saleFingerprint in utils/saleDedupe.js. The sold date comes only
+    from the sale's own fields (not scrapedAt), so re-scrapes agree."""
+    listing = listing_id(sale)
+    if listing:
+        return f"id:{listing}"
+    amount, currency = parse_price(sale.get('price'), sale.get('marketplace'))
+    sold = parse_sold_date({field: sale.get(field) for field in ('soldAt', 'soldDate', 'soldInfo')})
+    return f"fp:{normalize_title(sale.get('title', ''))}|{amount:.2f} {currency}|{sold.isoformat() if sold else ''}"
+
+
+class BloomFilter:
+    def __init__(self, capacity=CAPACITY, error_rate=FALSE_POSITIVE_RATE, bits=None, count=0):
+        self.size = max(8, int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)))
+        self.hashes = max(1, int(round(self.size / capacity * math.log(2))))
+        self.bits = bits if bits is not None else bytearray((self.size + 7) // 8)
+        self.count = count
+
+    def _positions(self, key):
+        # Double hashing: two 64-bit halves of one digest give every probe
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        return [(first + i * second) % self.size for i in range(self.hashes)]
+
+    def __contains__(self, key):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    def add(self, key):
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+
+class SaleDeduper:
+    """seen(sale) -> True for a sale already recorded (within the retention window)"""
+
+    def __init__(self, path=STATE_PATH, sales_dir=SALES_DIR, today=None):
+        self.path = path
+        self.sales_dir = sales_dir
+        self._today = today
+        self.generations = self._load()
+        # {path: (size, fingerprints)} of the files read to confirm hits
+        self.file_keys = {}
+        # Keys recorded since the last save (their sales may not be flushed yet)
+        self.recorded = set()
+        self.stats = {'checked': 0, 'duplicates': 0, 'false_positives': 0}
+        if self.generations:
+            self._rotate()
+        else:
+            self.rebuild()  # first run: start from what is already stored
+
+    @property
+    def today(self):
+        return self._today or datetime.now(timezone.utc).date()
+
+    def _load(self):
+        """[(started date, BloomFilter)], oldest first"""
+        if not os.path.exists(self.path):
+            return []
+        with open(self.path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') != STATE_VERSION or data.get('capacity') != CAPACITY:
+            return []
+        return [
+            (date.fromisoformat(generation['started']),
+             BloomFilter(bits=bytearray(base64.b64decode(generation['bits'])), count=generation['count']))
+            for generation in data['generations']
+        ]
+
+    def save(self):
+        """Persist the filters; call once the sales recorded so far are written"""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'version': STATE_VERSION,
+                'capacity': CAPACITY,
+                'generations': [
+                    {'started': started.isoformat(), 'count': bloom.count,
+                     'bits': base64.b64encode(bytes(bloom.bits)).decode('ascii')}
+                    for started, bloom in self.generations
+                ],
+            }, f)
+        os.replace(tmp_path, self.path)
+        self.recorded = set()
+
+    def _rotate(self):
+        if not self.generations or self.generations[-1][1].count >= CAPACITY or \
+                (self.today - self.generations[-1][0]).days >= GENERATION_DAYS:
+            self.generations.append((self.today, BloomFilter()))
+        if len(self.generations) > GENERATIONS:
+            del self.generations[:-GENERATIONS]
+            self.file_keys = {}  # drop files of the retired window
+
+    @property
+    def window_start(self):
+        return self.generations[0][0]
+
+    def _generation_files(self, positions):
+        """Sales files that can hold sales recorded while the given generations were newest"""
+        spans = [
+            (self.generations[i][0] - timedelta(days=1),
+             (self.generations[i + 1][0] if i + 1 < len(self.generations) else self.today) + timedelta(days=1))
+            for i in positions
+        ]
+        earliest = min(start for start, _ in spans)
+        cutoff = datetime.combine(earliest, datetime.min.time(), timezone.utc).timestamp()
+        for path in sales_files(self.sales_dir):
+            match = SCRAPED_FILE_PATTERN.search(os.path.basename(path))
+            if match:
+                day = date.fromisoformat(match.group(1))
+                if any(start <= day <= end for start, end in spans):
+                    yield path
+            elif os.path.getmtime(path) >= cutoff:
+                yield path
+
+    def _file_keys(self, path):
+        size = os.path.getsize(path)
+        cached = self.file_keys.get(path)
+        if not cached or cached[0] != size:
+            cached = self.file_keys[path] = (size, {fingerprint(sale) for sale in read_ndjson(path)})
+        return cached[1]
+
+    def add(self, key):
+        self._rotate()
+        self.generations[-1][1].add(key)
+        self.recorded.add(key)
+
+    def seen(self, sale):
+        """Check a sale and record it; True if it was already recorded"""
+        key = fingerprint(sale)
+        self.stats['checked'] += 1
+        hits = [i for i, (_, bloom) in enumerate(self.generations) if key in bloom]
+        if hits:
+            if key in self.recorded or any(key in self._file_keys(path) for path in self._generation_files(hits)):
+                self.stats['duplicates'] += 1
+                return True
+            self.stats['false_positives'] += 1
+        self.add(key)
+        return False
+
+    def rebuild(self):
+        """Refill the filters from the sales files of the last GENERATIONS x GENERATION_DAYS days"""
+        started = self.today - timedelta(days=GENERATION_DAYS * (GENERATIONS - 1))
+        self.generations = [(started, BloomFilter())]
+        self.file_keys, self.recorded = {}, set()
+        keys = set().union(*(self._file_keys(path) for path in self._generation_files([0])))
+        for key in keys:
+            if self.generations[-1][1].count >= CAPACITY:
+                self.generations.append((started, BloomFilter()))
+            self.generations[-1][1].add(key)
+        self._rotate()
+        return len(keys)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Inspect or rebuild the persistent sale de-duplication filters')
+    parser.add_argument('--state', default=STATE_PATH)
+    parser.add_argument('--sales-dir', default=SALES_DIR)
+    parser.add_argument('--rebuild', action='store_true', help='refill the filters from the stored sales')
+    args = parser.parse_args()
+
+    deduper = SaleDeduper(args.state, args.sales_dir)
+    if args.rebuild:
+        count = deduper.rebuild()
+        deduper.save()
+        print(f"✅ Rebuilt filters from {count:,} stored sales since {deduper.window_start}")
+    for started, bloom in deduper.generations:
+        fill = bloom.count / CAPACITY
+        print(f"  📅 {started}: {bloom.count:,} sales ({fill:.0%} of capacity), "
+              f"{len(bloom.bits) / 1024:.0f} KB, {bloom.hashes} hashes")
+    print(f"📁 State: {args.state}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""Shared helpers for scraped sale records.
+
+A sale is the item shape produced by `pages/api/ebay.js`:
+    {"title", "price": "£12.50", "soldDate", "soldInfo", "listingUrl",
+     "location", "marketplace": "uk" | "us"}
+Matched sales also carry `cardId`, `detectedVariant` and `matchConfidence`.
+Stored sales are NDJSON files (one sale per line) under data/sales.
+"""
+
+import json
+import os
+import re
+import unicodedata
+from datetime import datetime
+
+from catalog import REPO_ROOT
+
+SALES_DIR = os.path.join(REPO_ROOT, 'data', 'sales')
+
+CURRENCY_SYMBOLS = {'£': 'GBP', '$': 'USD', '€': 'EUR'}
+MARKETPLACE_CURRENCIES = {'uk': 'GBP', 'us': 'USD'}
+
+PRICE_PATTERN = re.compile(r'(US\s*)?([£$€])\s?([\d,]+(?:\.\d{1,2})?)', re.IGNORECASE)
+SOLD_DATE_PATTERN = re.compile(r'(\d{1,2})\s+([A-Za-z]{3})[a-z]*,?\s+(\d{4})')
+LISTING_ID_PATTERN = re.compile(r'/itm/(?:[^/?#]+/)?(\d{9,})', re.IGNORECASE)
+
+
+def normalize_title(value):
+    """Same normalization as normalizeText in pages/api/ebay.js"""
+    value = unicodedata.normalize('NFKD', str(value))
+    value = ''.join(ch for ch in value if not unicodedata.combining(ch))
+    return re.sub(r'\s+', ' ', value.lower()).strip()
+
+
+def parse_price(price, marketplace=None):
+    """Parse '£1,234.50' into (1234.5, 'GBP'); returns (0.0, currency) if unparseable"""
+    if isinstance(price, (int, float)):
+        return float(price), MARKETPLACE_CURRENCIES.get(marketplace, 'GBP')
+    match = PRICE_PATTERN.search(str(price or ''))
+    if not match:
+        return 0.0, MARKETPLACE_CURRENCIES.get(marketplace, 'GBP')
+    currency = CURRENCY_SYMBOLS[match.group(2)]
+    return float(match.group(3).replace(',', '')), currency
+
+
+def listing_id(sale):
+    """eBay listing id from a sale's listingUrl, or '' if there is none"""
+    if sale.get('listingId'):
+        return str(sale['listingId'])
+    match = LISTING_ID_PATTERN.search(sale.get('listingUrl') or '')
+    return match.group(1) if match else ''
+
+
+def sale_key(sale):
+    """De-duplication key, as in filterItemsCommon: listing id, else title::price"""
+    return listing_id(sale) or f"{normalize_title(sale.get('title', ''))}::{parse_price(sale.get('price'))[0]}"
+
+
+def parse_sold_date(sale):
+    """Best-effort sale date: ISO `soldAt`/`soldDate`, then 'Sold 12 Jun 2025'
+    style text in soldDate/soldInfo, then `scrapedAt`. Returns a date or None"""
+    for field in ('soldAt', 'soldDate'):
+        value = sale.get(field)
+        if value:
+            try:
+                return datetime.fromisoformat(str(value).replace('Z', '+00:00')).date()
+            except ValueError:
+                pass
+    for field in ('soldDate', 'soldInfo'):
+        match = SOLD_DATE_PATTERN.search(str(sale.get(field) or ''))
+        if match:
+            try:
+                return datetime.strptime(' '.join(match.groups()), '%d %b %Y').date()
+            except ValueError:
+                pass
+    if sale.get('scrapedAt'):
+        try:
+            return datetime.fromisoformat(str(sale['scrapedAt']).replace('Z', '+00:00')).date()
+        except ValueError:
+            pass
+    return None
+
+
+def sales_files(sales_dir=SALES_DIR):
+    if not os.path.isdir(sales_dir):
+        return []
+    return sorted(
+        os.path.join(sales_dir, name)
+        for name in os.listdir(sales_dir)
+        if name.endswith('.ndjson')
+    )
+
+
+def read_ndjson(path):
+    """Yield one sale per non-empty line"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def iter_sales(sales_dir=SALES_DIR):
+    for path in sales_files(sales_dir):
+        yield from read_ndjson(path)
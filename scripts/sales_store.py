@@ -0,0 +1,537 @@
+#!/usr/bin/env python3
+"""Append-only columnar store of matched sales with per-card history reads.
+
+Sales are kept in monthly partitions under data/sales-store, one raw
+little-endian file per typed column:
+
+    data/sales-store/
+      manifest.json           {"version", "partitions": {"2025-06": rows}, "sources": {file: bytes read}}
+      dictionary.ndjson       ["card", "base1-4"] lines; a value's code is its position within the column
+      2025-06/ts.i8 card.i4 variant.i4 grade.i2 price.i8 currency.i2 marketplace.i2 listing.i8 confidence.f4 offer.i1 grader.i1
+      2025-06/index.*.npy     per-card offset index (card codes, CSR starts, row order)
+
+String columns are dictionary encoded, prices are integers in minor units
+(pence/cents), grade is tenths (95 = 9.5, 0 = unknown) from the grader in
+grader (a GRADERS position, 0 = none read, so rows stored before the
+column existed have none), listing is the numeric eBay listing id,
+confidence is NaN when the match didn't report one and offer is 1 for an
+accepted Best Offer price (scripts/best_offers.py) rather than a scraped
+sold price. A column added after a partition was written reads as zeros
+for its older rows. An append writes each column's new bytes and then the
+manifest, whose row counts are the commit point (torn writes past them are
+truncated on the next append).
+
+A card's history reads only the partitions overlapping the date range,
+finds its rows through each partition's index and gathers just those rows
+from memory-mapped columns. Rows appended after an index was built are
+found by scanning that tail, and the index is rebuilt once the tail grows.
+
+Requires NumPy (`pip install numpy`).
+
+Usage:
+    python3 scripts/sales_store.py ingest                 # new lines in data/sales/*.ndjson: matched, near-duplicates collapsed
+    python3 scripts/sales_store.py history base1-4 [--since 2025-01-01] [--until 2025-06-30]
+    python3 scripts/sales_store.py stats
+    python3 scripts/sales_store.py bench --rows 2000000   # synthetic store in a temp dir
+"""
+
+import argparse
+import json
+import math
+import os
+import re
+import shutil
+import tempfile
+import time
+from datetime import date, datetime, timezone
+
+import numpy as np
+
+from card_match import CardMatcher
+from catalog import REPO_ROOT
+from sales import SALES_DIR, listing_id, parse_price, parse_sold_date, sales_files
+
+STORE_DIR = os.path.join(REPO_ROOT, 'data', 'sales-store')
+STORE_VERSION = 1
+
+COLUMNS = {
+    'ts': np.dtype('<i8'),
+    'card': np.dtype('<i4'),
+    'variant': np.dtype('<i4'),
+    'grade': np.dtype('<i2'),
+    'price': np.dtype('<i8'),
+    'currency': np.dtype('<i2'),
+    'marketplace': np.dtype('<i2'),
+    'listing': np.dtype('<i8'),
+    'confidence': np.dtype('<f4'),
+    'offer': np.dtype('<i1'),
+    'grader': np.dtype('<i1'),
+}
+DICTIONARY_COLUMNS = ('card', 'variant', 'currency', 'marketplace')
+# Rebuild a partition's index once this many rows (or this share of it) sit past it
+INDEX_TAIL_ROWS = 50_000
+INDEX_TAIL_SHARE = 0.1
+# Codes of the grader column; append only, stored rows refer to positions
+GRADERS = ('', 'TAG', 'PSA', 'BGS', 'CGC')
+GRADER_NAMES = {'tag': 'TAG', 'psa': 'PSA', 'bgs': 'BGS', 'beckett': 'BGS', 'cgc': 'CGC'}
+# Same grader + grade alternative as TITLE_PATTERN in utils/titleAnalyzer.mjs
+GRADE_PATTERN = re.compile(
+    r'\b(?:graded\s*[-_:]?\s*)?(tag(?!\s*team)|psa|bgs|beckett|cgc)\s*[-_:]?\s*'
+    r'(?:graded\s*|gem\s*mint\s*|mint\s*|pristine\s*)?(10(?:\.0)?|[1-9](?:\.[05])?)(?![\d./])',
+    re.IGNORECASE,
+)
+
+
+def column_path(partition_dir, column):
+    return os.path.join(partition_dir, f"{column}.{COLUMNS[column].kind}{COLUMNS[column].itemsize}")
+
+
+def to_timestamp(day):
+    """Unix seconds at 00:00 UTC of a date"""
+    return int(datetime(day.year, day.month, day.day, tzinfo=timezone.utc).timestamp())
+
+
+def parse_grade(sale):
+    """(grader code, grade in tenths) from `grader`/`grade` or the title, e.g.
+    'PSA 10.0' -> (2, 100); 0 for a grader or grade that can't be read"""
+    match = GRADE_PATTERN.search(sale.get('title') or '')
+    grader = GRADER_NAMES.get(str(sale.get('grader') or '').lower()) or \
+        (GRADER_NAMES[match.group(1).lower()] if match else '')
+    value = sale.get('grade')
+    if value in (None, ''):
+        # The title's grade only counts for the grader it came with
+        value = match.group(2) if match and GRADER_NAMES[match.group(1).lower()] == grader else None
+    try:
+        tenths = int(round(float(value) * 10)) if value not in (None, '') else 0
+    except (TypeError, ValueError):
+        tenths = 0
+    return GRADERS.index(grader), tenths
+
+
+def sale_row(sale):
+    """Typed column values for one matched sale, or None if it can't be stored"""
+    card_id = sale.get('cardId')
+    amount, currency = parse_price(sale.get('price'), sale.get('marketplace'))
+    if not card_id or amount <= 0:
+        return None
+    sold = parse_sold_date(sale) or datetime.now(timezone.utc).date()
+    listing = listing_id(sale)
+    confidence = sale.get('matchConfidence')
+    grader, grade = parse_grade(sale)
+    try:
+        confidence = float(confidence)
+    except (TypeError, ValueError):
+        confidence = math.nan
+    return {
+        'ts': to_timestamp(sold),
+        'card': card_id,
+        'variant': sale.get('detectedVariant') or sale.get('variant') or 'Regular',
+        'grade': grade,
+        'price': int(round(amount * 100)),
+        'currency': currency,
+        'marketplace': sale.get('marketplace') or 'uk',
+        'listing': int(listing) if listing.isdigit() else 0,
+        'confidence': confidence,
+        'offer': 1 if sale.get('acceptedOffer') else 0,
+        'grader': grader,
+    }
+
+
+class SalesStore:
+    def __init__(self, root=STORE_DIR):
+        self.root = root
+        self.manifest = self._read_manifest()
+        self.codes = {column: {} for column in DICTIONARY_COLUMNS}
+        self.values = {column: [] for column in DICTIONARY_COLUMNS}
+        self._load_dictionary()
+        self._indexes = {}
+
+    # -- metadata -----------------------------------------------------------
+
+    def _read_manifest(self):
+        path = os.path.join(self.root, 'manifest.json')
+        if not os.path.exists(path):
+            return {'version': STORE_VERSION, 'partitions': {}, 'sources': {}}
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _write_manifest(self):
+        os.makedirs(self.root, exist_ok=True)
+        path = os.path.join(self.root, 'manifest.json')
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, path)
+
+    def _load_dictionary(self):
+        path = os.path.join(self.root, 'dictionary.ndjson')
+        if not os.path.exists(path):
+            return
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    column, value = json.loads(line)
+                    self.codes[column][value] = len(self.values[column])
+                    self.values[column].append(value)
+
+    def _encode(self, column, values, new_entries):
+        codes = self.codes[column]
+        encoded = []
+        for value in values:
+            code = codes.get(value)
+            if code is None:
+                code = codes[value] = len(self.values[column])
+                self.values[column].append(value)
+                new_entries.append([column, value])
+            encoded.append(code)
+        return encoded
+
+    @property
+    def partitions(self):
+        return self.manifest['partitions']
+
+    @property
+    def rows(self):
+        return sum(self.partitions.values())
+
+    # -- writes -------------------------------------------------------------
+
+    def append_rows(self, rows):
+        """Append row dicts (see sale_row); returns the number written"""
+        rows = [row for row in rows if row]
+        if not rows:
+            return 0
+        new_entries = []
+        columns = {
+            column: np.asarray(
+                self._encode(column, [row[column] for row in rows], new_entries)
+                if column in DICTIONARY_COLUMNS else [row[column] for row in rows],
+                dtype=dtype,
+            )
+            for column, dtype in COLUMNS.items()
+        }
+        self._append_dictionary(new_entries)
+        return self.append_columns(columns)
+
+    def _append_dictionary(self, entries):
+        if not entries:
+            return
+        os.makedirs(self.root, exist_ok=True)
+        with open(os.path.join(self.root, 'dictionary.ndjson'), 'a', encoding='utf-8') as f:
+            f.writelines(json.dumps(entry, ensure_ascii=False) + '\n' for entry in entries)
+
+    def append_columns(self, columns):
+        """Append already-encoded column arrays of equal length, split by month"""
+        months = np.datetime_as_string(np.asarray(columns['ts']).astype('datetime64[s]'), unit='M')
+        for month in np.unique(months):
+            selected = months == month
+            self._append_partition(str(month), {column: values[selected] for column, values in columns.items()})
+        self._write_manifest()
+        return len(columns['ts'])
+
+    def _append_partition(self, month, columns):
+        partition_dir = os.path.join(self.root, month)
+        os.makedirs(partition_dir, exist_ok=True)
+        committed = self.partitions.get(month, 0)
+        for column, dtype in COLUMNS.items():
+            with open(column_path(partition_dir, column), 'ab') as f:
+                # Drop bytes from an append that never reached the manifest (or zero-fill a new column)
+                if f.tell() != committed * dtype.itemsize:
+                    f.truncate(committed * dtype.itemsize)
+                    f.seek(0, os.SEEK_END)
+                f.write(np.ascontiguousarray(columns[column], dtype=dtype).tobytes())
+        self.partitions[month] = committed + len(columns['ts'])
+
+    def ingest(self, sales_dir=SALES_DIR, near_duplicates=True, matcher_factory=CardMatcher):
+        """Append sales from lines added to data/sales/*.ndjson since the last ingest;
+        returns (rows written, near-duplicates dropped, sales no card matched).
+
+        Sales without a cardId (everything scripts/scrape_worker.py writes)
+        are matched to a card by title here, as the app does."""
+        sources = self.manifest.setdefault('sources', {})
+        sales = []
+        for path in sales_files(sales_dir):
+            name = os.path.basename(path)
+            offset = sources.get(name, 0)
+            if os.path.getsize(path) <= offset:
+                continue
+            with open(path, 'rb') as f:
+                f.seek(offset)
+                chunk = f.read()
+            # Leave a trailing partial line for the next run
+            end = chunk.rfind(b'\n') + 1
+            for line in chunk[:end].splitlines():
+                if line.strip():
+                    sales.append(json.loads(line))
+            sources[name] = offset + end
+        unmatched = [sale for sale in sales if not sale.get('cardId')]
+        if unmatched:
+            matcher = matcher_factory()
+            for sale in unmatched:
+                card, confidence = matcher.match(sale.get('title') or '')
+                if card:
+                    sale['cardId'] = card['id']
+                    sale['matchConfidence'] = round(confidence, 4)
+        no_card = sum(1 for sale in unmatched if not sale.get('cardId'))
+        sales = [sale for sale in sales if sale_row(sale)]
+        dropped = 0
+        if near_duplicates:
+            from near_duplicates import collapse  # imports price_guide, which imports this module
+
+            # Relists and cross-marketplace mirrors of one slab count once
+            kept, _ = collapse(sales)
+            dropped = len(sales) - len(kept)
+            sales = kept
+        written = self.append_rows([sale_row(sale) for sale in sales])
+        if not written:
+            self._write_manifest()
+        return written, dropped, no_card
+
+    # -- reads --------------------------------------------------------------
+
+    def column(self, month, column):
+        """Memory-mapped committed rows of one column in one partition"""
+        rows = self.partitions.get(month, 0)
+        if not rows:
+            return np.empty(0, dtype=COLUMNS[column])
+        path = column_path(os.path.join(self.root, month), column)
+        if not os.path.exists(path):
+            return np.zeros(rows, dtype=COLUMNS[column])
+        return np.memmap(path, dtype=COLUMNS[column], mode='r', shape=(rows,))
+
+    def scan(self, columns=tuple(COLUMNS), since_rows=None):
+        """Selected columns of every partition concatenated; with `since_rows`
+        ({month: rows}) only the rows appended after those counts"""
+        since_rows = since_rows or {}
+        parts = {column: [] for column in columns}
+        for month in sorted(self.partitions):
+            start = min(since_rows.get(month, 0), self.partitions[month])
+            for column in columns:
+                parts[column].append(self.column(month, column)[start:])
+        return {
+            column: np.concatenate(values) if values else np.empty(0, dtype=COLUMNS[column])
+            for column, values in parts.items()
+        }
+
+    def build_index(self, month):
+        """Sort the partition's rows by card code into a CSR offset index and save it"""
+        cards = np.asarray(self.column(month, 'card'))
+        order = np.argsort(cards, kind='stable').astype(np.int64)
+        codes, starts = np.unique(cards[order], return_index=True)
+        index = {
+            'codes': codes.astype(np.int32),
+            'starts': np.append(starts, len(cards)).astype(np.int64),
+            'order': order,
+        }
+        for name, values in index.items():
+            path = os.path.join(self.root, month, f"index.{name}.npy")
+            np.save(path + '.tmp.npy', values)
+            os.replace(path + '.tmp.npy', path)
+        index['rows'] = len(cards)
+        self._indexes[month] = index
+        return index
+
+    def _load_index(self, month):
+        """Memory-mapped saved index, or None if missing or inconsistent"""
+        try:
+            index = {
+                name: np.load(os.path.join(self.root, month, f"index.{name}.npy"), mmap_mode='r')
+                for name in ('codes', 'starts', 'order')
+            }
+        except (FileNotFoundError, ValueError):
+            return None
+        index['rows'] = len(index['order'])
+        if len(index['starts']) != len(index['codes']) + 1 or (len(index['starts']) and index['starts'][-1] != index['rows']):
+            return None
+        return index
+
+    def index(self, month):
+        index = self._indexes.get(month)
+        if index is None:
+            index = self._indexes[month] = self._load_index(month)
+        rows = self.partitions.get(month, 0)
+        if index is None or index['rows'] > rows or \
+                rows - index['rows'] > max(INDEX_TAIL_ROWS, INDEX_TAIL_SHARE * rows):
+            index = self.build_index(month)
+        return index
+
+    def card_rows(self, month, card_code):
+        """Row numbers of one card in a partition: indexed rows plus a scan of the unindexed tail"""
+        index = self.index(month)
+        slot = np.searchsorted(index['codes'], card_code)
+        if slot < len(index['codes']) and index['codes'][slot] == card_code:
+            rows = index['order'][index['starts'][slot]:index['starts'][slot + 1]]
+        else:
+            rows = np.empty(0, dtype=np.int64)
+        if self.partitions[month] > index['rows']:
+            tail = np.flatnonzero(self.column(month, 'card')[index['rows']:] == card_code) + index['rows']
+            rows = np.concatenate([rows, tail])
+        return rows
+
+    def history(self, card_id, since=None, until=None):
+        """One card's sales between two dates (inclusive), oldest first, as column arrays"""
+        card_code = self.codes['card'].get(card_id)
+        empty = {column: np.empty(0, dtype=dtype) for column, dtype in COLUMNS.items()}
+        if card_code is None:
+            return empty
+        start = to_timestamp(since) if since else None
+        end = to_timestamp(until) + 86400 if until else None
+        first_month = since.strftime('%Y-%m') if since else None
+        last_month = until.strftime('%Y-%m') if until else None
+
+        parts = []
+        for month in sorted(self.partitions):
+            if (first_month and month < first_month) or (last_month and month > last_month):
+                continue
+            rows = self.card_rows(month, card_code)
+            if len(rows) == 0:
+                continue
+            rows = np.sort(rows)
+            part = {column: self.column(month, column)[rows] for column in COLUMNS}
+            keep = np.ones(len(rows), dtype=bool)
+            if start is not None:
+                keep &= part['ts'] >= start
+            if end is not None:
+                keep &= part['ts'] < end
+            parts.append({column: values[keep] for column, values in part.items()})
+        if not parts:
+            return empty
+        merged = {column: np.concatenate([part[column] for part in parts]) for column in COLUMNS}
+        order = np.argsort(merged['ts'], kind='stable')
+        return {column: values[order] for column, values in merged.items()}
+
+    def decode(self, columns):
+        """Column arrays -> list of sale-like dicts"""
+        records = []
+        for i in range(len(columns['ts'])):
+            confidence = float(columns['confidence'][i])
+            records.append({
+                'soldAt': datetime.fromtimestamp(int(columns['ts'][i]), timezone.utc).date().isoformat(),
+                'cardId': self.values['card'][columns['card'][i]],
+                'variant': self.values['variant'][columns['variant'][i]],
+                'grader': GRADERS[columns['grader'][i]] or None,
+                'grade': int(columns['grade'][i]) / 10 or None,
+                'price': int(columns['price'][i]) / 100,
+                'currency': self.values['currency'][columns['currency'][i]],
+                'marketplace': self.values['marketplace'][columns['marketplace'][i]],
+                'listingId': str(int(columns['listing'][i])) if columns['listing'][i] else None,
+                'matchConfidence': None if math.isnan(confidence) else round(confidence, 4),
+                'acceptedOffer': bool(columns['offer'][i]),
+            })
+        return records
+
+
+def bench(rows, batch, cards):
+    """Build a synthetic store of `rows` sales, then time batch appends and card reads"""
+    rng = np.random.default_rng(7)
+    root = tempfile.mkdtemp(prefix='sales-store-')
+    try:
+        store = SalesStore(root)
+        entries = [['card', f"card-{i}"] for i in range(cards)]
+        entries += [['variant', 'Regular'], ['variant', 'Holo'], ['currency', 'GBP'], ['currency', 'USD'],
+                    ['marketplace', 'uk'], ['marketplace', 'us']]
+        new_entries = []
+        for column, value in entries:
+            store._encode(column, [value], new_entries)
+        store._append_dictionary(new_entries)
+        first = to_timestamp(date(2023, 1, 1))
+        span = to_timestamp(date(2025, 6, 30)) - first
+
+        def synthetic(count):
+            return {
+                'ts': np.sort(first + rng.integers(0, span, count)),
+                # Skewed like real demand: a few chase cards sell far more often
+                'card': (cards * rng.random(count) ** 3).astype(np.int64),
+                'variant': rng.integers(0, 2, count),
+                'grade': rng.choice([80, 85, 90, 95, 100], count),
+                'price': rng.integers(500, 50000, count),
+                'currency': rng.integers(0, 2, count),
+                'marketplace': rng.integers(0, 2, count),
+                'listing': rng.integers(10 ** 11, 10 ** 12, count),
+                'confidence': rng.random(count, dtype=np.float32),
+                'offer': np.zeros(count, dtype=np.int8),
+                'grader': np.ones(count, dtype=np.int8),
+            }
+
+        started = time.perf_counter()
+        for _ in range(0, rows, 200_000):
+            store.append_columns(synthetic(min(200_000, rows - store.rows)))
+        for month in store.partitions:
+            store.build_index(month)
+        print(f"🏗️  {store.rows:,} rows in {len(store.partitions)} partitions built in "
+              f"{time.perf_counter() - started:.1f}s")
+
+        # A scrape batch lands in the latest month, like a live append
+        append_times = []
+        for _ in range(20):
+            columns = synthetic(batch)
+            columns['ts'] = np.full(batch, first + span - 3600)
+            started = time.perf_counter()
+            store.append_columns(columns)
+            append_times.append(time.perf_counter() - started)
+
+        reopened = SalesStore(root)
+        for label, card in (('hot card', 'card-0'), ('median card', f"card-{cards // 50}"), ('cold card', f"card-{cards - 1}")):
+            for since, until in ((None, None), (date(2025, 1, 1), date(2025, 3, 31))):
+                started = time.perf_counter()
+                history = reopened.history(card, since, until)
+                elapsed = (time.perf_counter() - started) * 1000
+                window = 'all time' if since is None else f"{since}..{until}"
+                print(f"  📈 {label} {window}: {len(history['ts']):,} sales in {elapsed:.2f} ms")
+        print(f"  ➕ append {batch} rows: median {np.median(append_times) * 1000:.2f} ms, "
+              f"max {max(append_times) * 1000:.2f} ms")
+    finally:
+        shutil.rmtree(root)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Append-only columnar sales store')
+    parser.add_argument('--store', default=STORE_DIR)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    ingest_parser = subparsers.add_parser('ingest', help='append new matched sales from NDJSON files')
+    ingest_parser.add_argument('--sales-dir', default=SALES_DIR)
+    ingest_parser.add_argument('--keep-near-duplicates', action='store_true',
+                               help="don't collapse relisted/mirrored listings (scripts/near_duplicates.py)")
+
+    history_parser = subparsers.add_parser('history', help="print one card's sales")
+    history_parser.add_argument('card_id')
+    history_parser.add_argument('--since', type=date.fromisoformat)
+    history_parser.add_argument('--until', type=date.fromisoformat)
+
+    subparsers.add_parser('stats', help='rows per partition')
+
+    bench_parser = subparsers.add_parser('bench', help='time appends and reads on a synthetic store')
+    bench_parser.add_argument('--rows', type=int, default=2_000_000)
+    bench_parser.add_argument('--batch', type=int, default=120, help='rows per append (one scrape)')
+    bench_parser.add_argument('--cards', type=int, default=20_000)
+    args = parser.parse_args()
+
+    if args.command == 'bench':
+        bench(args.rows, args.batch, args.cards)
+        return
+
+    store = SalesStore(args.store)
+    if args.command == 'ingest':
+        started = time.perf_counter()
+        written, dropped, no_card = store.ingest(args.sales_dir, not args.keep_near_duplicates)
+        print(f"✅ Appended {written} sales in {(time.perf_counter() - started) * 1000:.1f} ms "
+              f"({store.rows:,} rows in {len(store.partitions)} partitions); "
+              f"{dropped} near-duplicates collapsed, {no_card} matched no card")
+    elif args.command == 'history':
+        started = time.perf_counter()
+        history = store.history(args.card_id, args.since, args.until)
+        elapsed = (time.perf_counter() - started) * 1000
+        for record in store.decode(history):
+            print(json.dumps(record, ensure_ascii=False))
+        print(f"📈 {len(history['ts'])} sales of {args.card_id} ({int(history['offer'].sum())} accepted offers) "
+              f"in {elapsed:.2f} ms")
+    elif args.command == 'stats':
+        for month, rows in sorted(store.partitions.items()):
+            print(f"  {month}: {rows:,} rows")
+        print(f"📦 {store.rows:,} rows, {len(store.values['card']):,} cards, "
+              f"{len(store.manifest.get('sources', {}))} NDJSON sources ingested")
+
+
+if __name__ == "__main__":
+    main()
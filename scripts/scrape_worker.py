@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""Standalone scrape worker for eBay sold listings.
+
+Polls the keyword, graded-keyword and RSS searches used by
+pages/api/ebay.js for the uk and us marketplaces, parses them with
+scripts/listings.py and appends new sales to
+data/sales/scraped-YYYY-MM-DD.ndjson as each page arrives. Sales already
+recorded (same listing id, or title, price and sold date) are skipped via
+the rotating Bloom filters of scripts/sale_dedupe.py.
+
+All requests share one keep-alive connection pool. Every host has a token
+bucket (--rate requests/second, --burst), failures back off exponentially
+with full jitter (honouring Retry-After), and both marketplaces and their
+sources are fetched concurrently.
+
+Requires aiohttp and lxml (`pip install aiohttp lxml`).
+
+Usage:
+    python3 scripts/scrape_worker.py [--marketplace uk] [--rate 0.5] [--burst 2]
+    python3 scripts/scrape_worker.py --interval 900          # poll every 15 minutes
+    python3 scripts/scrape_worker.py --base-url http://127.0.0.1:8090   # scripts/ebay_standin.py
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import time
+from datetime import datetime, timezone
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from listings import filter_items, parse_rss, parse_search_html
+from sale_dedupe import STATE_PATH as DEDUPE_PATH, SaleDeduper
+from sales import SALES_DIR
+
+MARKETPLACES = {
+    'uk': {'origin': 'https://www.ebay.co.uk', 'accept_language': 'en-GB,en;q=0.9'},
+    'us': {'origin': 'https://www.ebay.com', 'accept_language': 'en-US,en;q=0.9'},
+}
+SEARCH_PATH = '/sch/i.html'
+SEARCH_QUERY = '_sacat=183454&LH_Sold=1&LH_Complete=1&_sop=13&_ipg=120'
+# source -> (search terms, is RSS)
+SOURCES = {
+    'keyword': ('TAG+Pokemon', False),
+    'graded-keyword': ('TAG+graded+Pokemon', False),
+    'rss-keyword': ('TAG+Pokemon', True),
+}
+MOBILE_USER_AGENT = (
+    'Mozilla/5.0 (iPhone; CPU iPhone OS 17_0 like Mac OS X) AppleWebKit/605.1.15 '
+    '(KHTML, like Gecko) Version/17.0 Mobile/15E148 Safari/604.1'
+)
+BLOCKED_PATTERN = re.compile(
+    r'access denied|pardon our interruption|checking your browser|captcha|security check|challenge-',
+    re.IGNORECASE
+)
+RETRY_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+MAX_ITEMS = 60
+
+
+class RetryableError(Exception):
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """`rate` tokens per second, holding at most `burst`"""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+def build_url(marketplace, source, base_url=None):
+    """Search URL for one source; base_url swaps the eBay origin for base_url/<marketplace>"""
+    terms, rss = SOURCES[source]
+    origin = f"{base_url.rstrip('/')}/{marketplace}" if base_url else MARKETPLACES[marketplace]['origin']
+    return f"{origin}{SEARCH_PATH}?_nkw={terms}&{SEARCH_QUERY}{'&_rss=1' if rss else ''}"
+
+
+def request_headers(marketplace, rss):
+    return {
+        'User-Agent': MOBILE_USER_AGENT,
+        'Accept': 'application/rss+xml,application/xml;q=0.9,*/*;q=0.8' if rss
+        else 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+        'Accept-Language': MARKETPLACES[marketplace]['accept_language'],
+    }
+
+
+def backoff_delay(attempt, base=1.0, cap=60.0):
+    """Full jitter: uniform in [0, min(cap, base * 2^attempt)]"""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+def retry_after_seconds(value):
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+class ScrapeWorker:
+    def __init__(self, sales_dir=SALES_DIR, base_url=None, rate=0.5, burst=2, retries=3, timeout=10,
+                 connections=8, verbose=False, dedupe_path=DEDUPE_PATH):
+        self.sales_dir = sales_dir
+        self.base_url = base_url
+        self.rate = rate
+        self.burst = burst
+        self.retries = retries
+        self.timeout = timeout
+        self.connections = connections
+        self.verbose = verbose
+        self.buckets = {}
+        self.deduper = SaleDeduper(dedupe_path, sales_dir)
+        self.stats = {}
+
+    def bucket(self, url):
+        host = urlsplit(url).netloc
+        if host not in self.buckets:
+            self.buckets[host] = TokenBucket(self.rate, self.burst)
+        return self.buckets[host]
+
+    async def fetch(self, session, url, headers):
+        """Body text; rate-limited per host, retried with jittered backoff"""
+        for attempt in range(self.retries + 1):
+            await self.bucket(url).acquire()
+            self.stats['requests'] += 1
+            try:
+                async with session.get(url, headers=headers) as response:
+                    if response.status in RETRY_STATUSES:
+                        raise RetryableError(f"HTTP {response.status}",
+                                             retry_after_seconds(response.headers.get('Retry-After')))
+                    if response.status != 200:
+                        raise aiohttp.ClientResponseError(
+                            response.request_info, response.history, status=response.status,
+                            message=f"HTTP {response.status}")
+                    text = await response.text()
+                if BLOCKED_PATTERN.search(text[:5000]):
+                    raise RetryableError('bot protection page')
+                return text
+            except (RetryableError, aiohttp.ClientConnectionError, asyncio.TimeoutError) as error:
+                if attempt == self.retries:
+                    raise
+                retry_after = getattr(error, 'retry_after', None)
+                delay = retry_after if retry_after is not None else backoff_delay(attempt)
+                self.stats['retries'] += 1
+                if self.verbose:
+                    print(f"  ↻ {url}: {error or type(error).__name__}, retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+
+    async def scrape_source(self, session, marketplace, source, output):
+        _, rss = SOURCES[source]
+        url = build_url(marketplace, source, self.base_url)
+        try:
+            body = await self.fetch(session, url, request_headers(marketplace, rss))
+        except (RetryableError, aiohttp.ClientError, asyncio.TimeoutError) as error:
+            self.stats['failed'] += 1
+            print(f"  ❌ {marketplace}/{source}: {error or type(error).__name__}")
+            return 0
+
+        raw = parse_rss(body, marketplace) if rss else parse_search_html(body, marketplace)
+        sales = filter_items(raw, MAX_ITEMS)
+        self.stats['parsed'] += len(sales)
+        scraped_at = datetime.now(timezone.utc).isoformat(timespec='seconds')
+        written = 0
+        for sale in sales:
+            if self.deduper.seen(sale):
+                continue
+            output.write(json.dumps({**sale, 'source': source, 'scrapedAt': scraped_at}, ensure_ascii=False) + '\n')
+            written += 1
+        output.flush()
+        if written:
+            # The filters now match what is on disk: a crash can't forget these sales
+            self.deduper.save()
+        self.stats['written'] += written
+        if self.verbose:
+            print(f"  {marketplace}/{source}: {len(sales)} sales, {written} new")
+        return written
+
+    async def scrape_marketplace(self, session, marketplace, output):
+        return sum(await asyncio.gather(*(
+            self.scrape_source(session, marketplace, source, output) for source in SOURCES
+        )))
+
+    async def run_once(self, marketplaces):
+        self.stats = {'requests': 0, 'retries': 0, 'failed': 0, 'parsed': 0, 'written': 0}
+        os.makedirs(self.sales_dir, exist_ok=True)
+        path = os.path.join(self.sales_dir, f"scraped-{datetime.now(timezone.utc):%Y-%m-%d}.ndjson")
+        connector = aiohttp.TCPConnector(limit=self.connections, keepalive_timeout=60, ttl_dns_cache=300)
+        client_timeout = aiohttp.ClientTimeout(total=self.timeout)
+        with open(path, 'a', encoding='utf-8') as output:
+            async with aiohttp.ClientSession(connector=connector, timeout=client_timeout) as session:
+                counts = await asyncio.gather(*(
+                    self.scrape_marketplace(session, marketplace, output) for marketplace in marketplaces
+                ))
+        self.deduper.save()
+        return dict(zip(marketplaces, counts)), path
+
+
+async def poll(worker, marketplaces, interval=None):
+    """One round, or rounds every `interval` seconds, all in one event loop
+    (the per-host token buckets are bound to it)"""
+    while True:
+        started = time.perf_counter()
+        counts, path = await worker.run_once(marketplaces)
+        summary = ', '.join(f"{marketplace} {count}" for marketplace, count in counts.items())
+        print(f"✅ {worker.stats['written']} new sales ({summary}) from {worker.stats['requests']} requests "
+              f"in {time.perf_counter() - started:.1f}s; {worker.stats['retries']} retries, "
+              f"{worker.stats['failed']} sources failed")
+        print(f"📁 Sales: {path}")
+        if not interval:
+            break
+        await asyncio.sleep(interval * random.uniform(0.9, 1.1))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Scrape eBay sold listings into the local sales store')
+    parser.add_argument('--marketplace', action='append', choices=sorted(MARKETPLACES), dest='marketplaces',
+                        help='only this marketplace (repeatable; default: all)')
+    parser.add_argument('--sales-dir', default=SALES_DIR)
+    parser.add_argument('--dedupe-state', default=DEDUPE_PATH, help='Bloom filter state (scripts/sale_dedupe.py)')
+    parser.add_argument('--base-url', help='fetch from this origin instead, e.g. scripts/ebay_standin.py')
+    parser.add_argument('--rate', type=float, default=0.5, help='requests per second per host')
+    parser.add_argument('--burst', type=int, default=2, help='token bucket size per host')
+    parser.add_argument('--retries', type=int, default=3)
+    parser.add_argument('--timeout', type=float, default=10, help='per-request timeout in seconds')
+    parser.add_argument('--interval', type=float, help='keep polling, sleeping this many seconds between rounds')
+    parser.add_argument('--verbose', '-v', action='store_true')
+    args = parser.parse_args()
+
+    marketplaces = args.marketplaces or sorted(MARKETPLACES)
+    worker = ScrapeWorker(args.sales_dir, args.base_url, args.rate, args.burst, args.retries, args.timeout,
+                          verbose=args.verbose, dedupe_path=args.dedupe_state)
+    print(f"🔎 Scraping {', '.join(marketplaces)} ({len(SOURCES)} sources each); "
+          f"{sum(bloom.count for _, bloom in worker.deduper.generations):,} sales in the dedupe window "
+          f"since {worker.deduper.window_start}")
+    asyncio.run(poll(worker, marketplaces, args.interval))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""Mergeable t-digest quantile sketch.
+
+A digest summarizes any number of values as at most ~compression/2 weighted
+centroids, small near the tails and large around the median, so extreme
+quantiles stay accurate while memory per digest is bounded. Digests built
+separately (per marketplace, per month, in different worker processes)
+merge into one with the same guarantees, and round-trip through JSON via
+to_dict / from_dict.
+
+Values are buffered and folded in by compress(): points are sorted, each
+gets the integer k-scale bucket of its left cumulative quantile, and points
+sharing a bucket are averaged with np.add.reduceat.
+
+Requires NumPy (`pip install numpy`).
+"""
+
+import math
+
+import numpy as np
+
+DEFAULT_COMPRESSION = 100
+BUFFER_FACTOR = 5
+# Up to this many values a fresh digest stores them as-is instead of compressing
+EXACT_LIMIT = 16
+
+
+class TDigest:
+    def __init__(self, compression=DEFAULT_COMPRESSION):
+        self.compression = compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        self._buffer = []
+
+    @property
+    def count(self):
+        self.compress()
+        return float(self.weights.sum())
+
+    def __len__(self):
+        self.compress()
+        return len(self.means)
+
+    def add(self, value, weight=1):
+        self._buffer.append((float(value), float(weight)))
+        if len(self._buffer) >= BUFFER_FACTOR * self.compression:
+            self.compress()
+
+    def extend(self, values):
+        """Add an array of unit-weight values at once"""
+        values = np.asarray(values, dtype=np.float64)
+        if not len(values):
+            return
+        if not len(self.means) and not self._buffer and len(values) <= EXACT_LIMIT:
+            # A handful of values is kept exactly, one centroid each
+            self.means = np.sort(values)
+            self.weights = np.ones(len(values))
+            self.minimum, self.maximum = float(self.means[0]), float(self.means[-1])
+            return
+        self._fold(values, np.ones(len(values)))
+
+    def merge(self, other):
+        """Fold another digest into this one (in place); returns self"""
+        other.compress()
+        if len(other.means):
+            self._fold(other.means, other.weights, other.minimum, other.maximum)
+        return self
+
+    def compress(self):
+        if self._buffer:
+            buffered = np.array(self._buffer)
+            self._buffer = []
+            self._fold(buffered[:, 0], buffered[:, 1])
+
+    def _fold(self, means, weights, minimum=None, maximum=None):
+        self.compress()
+        self.minimum = min(self.minimum, float(means.min()) if minimum is None else minimum)
+        self.maximum = max(self.maximum, float(means.max()) if maximum is None else maximum)
+
+        means = np.concatenate([self.means, means])
+        weights = np.concatenate([self.weights, weights])
+        order = np.argsort(means, kind='stable')
+        means, weights = means[order], weights[order]
+
+        total = weights.sum()
+        left = (np.cumsum(weights) - weights) / total
+        # k1 scale: buckets are narrow in q near 0 and 1, wide around 0.5
+        buckets = np.floor(self.compression / (2 * math.pi) * np.arcsin(2 * left - 1)).astype(np.int64)
+        starts = np.concatenate([[0], np.flatnonzero(np.diff(buckets)) + 1])
+        merged_weights = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(means * weights, starts) / merged_weights
+        self.weights = merged_weights
+
+    def quantile(self, q):
+        """Estimated value at quantile q (0..1); NaN for an empty digest"""
+        return float(self.quantiles([q])[0])
+
+    def quantiles(self, qs):
+        self.compress()
+        qs = np.asarray(qs, dtype=np.float64)
+        if not len(self.means):
+            return np.full(len(qs), np.nan)
+        if len(self.means) == 1:
+            return np.full(len(qs), self.means[0])
+        total = self.weights.sum()
+        # Centroid means sit at their centre of mass; the ends are pinned to min/max
+        centres = np.cumsum(self.weights) - self.weights / 2
+        positions = np.concatenate([[0.0], centres, [total]])
+        values = np.concatenate([[self.minimum], self.means, [self.maximum]])
+        return np.interp(qs * total, positions, values)
+
+    def to_dict(self, decimals=4):
+        self.compress()
+        return {
+            'compression': self.compression,
+            'min': self.minimum if len(self.means) else None,
+            'max': self.maximum if len(self.means) else None,
+            'centroids': [
+                [round(float(mean), decimals), round(float(weight), decimals)]
+                for mean, weight in zip(self.means, self.weights)
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        digest = cls(data.get('compression', DEFAULT_COMPRESSION))
+        if data.get('centroids'):
+            centroids = np.array(data['centroids'], dtype=np.float64)
+            digest.means, digest.weights = centroids[:, 0], centroids[:, 1]
+            digest.minimum, digest.maximum = data['min'], data['max']
+        return digest
+
+    @classmethod
+    def merged(cls, digests, compression=DEFAULT_COMPRESSION):
+        """One digest from many, folding all their centroids in a single pass"""
+        result = cls(compression)
+        digests = [digest for digest in digests if len(digest)]
+        if digests:
+            result._fold(
+                np.concatenate([digest.means for digest in digests]),
+                np.concatenate([digest.weights for digest in digests]),
+                min(digest.minimum for digest in digests),
+                max(digest.maximum for digest in digests),
+            )
+        return result
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""Validate the card catalog in data/cards; exits non-zero on errors so it can
+gate a build.
+
+Checks: canonical fields present, no legacy field names, ids unique across
+all sets, fullNumber consistent with cardNumber and totalCards, every card
+has matchingKeywords, and no `.backup` leftovers in the catalog directory.
+
+Usage:
+    python3 scripts/validate_catalog.py [--strict] [--workers N]
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+from catalog import (
+    CARD_ALIASES, CARDS_DIR, SET_INFO_FIELDS,
+    backup_files, load_set, same_number, set_files, set_key, split_number
+)
+
+# Fields whose absence breaks matching; the rest only produce warnings
+REQUIRED_CARD_FIELDS = ['id', 'name', 'setName', 'cardNumber', 'fullNumber', 'matchingKeywords']
+OPTIONAL_CARD_FIELDS = ['setCode', 'rarity', 'type', 'imageUrl']
+
+
+def validate_set(path):
+    """Check one set file. Returns (set_key, [card ids], errors, warnings)"""
+    key = set_key(path)
+    errors = []
+    warnings = []
+
+    try:
+        data = load_set(path)
+    except ValueError as e:
+        return key, [], [f"invalid JSON: {e}"], []
+
+    info = data.get('setInfo')
+    if not isinstance(info, dict):
+        return key, [], ['missing setInfo'], []
+    for field in SET_INFO_FIELDS:
+        if not info.get(field):
+            warnings.append(f"setInfo missing '{field}'")
+
+    try:
+        total_cards = int(info.get('totalCards'))
+    except (TypeError, ValueError):
+        total_cards = None
+
+    cards = data.get('cards') or []
+    if total_cards is not None and len(cards) > total_cards:
+        warnings.append(f"{len(cards)} cards listed but totalCards is {total_cards}")
+
+    ids = []
+    missing = Counter()
+    for index, card in enumerate(cards):
+        label = card.get('id') or f"cards[{index}]"
+
+        for field in REQUIRED_CARD_FIELDS:
+            if not card.get(field):
+                errors.append(f"{label}: missing '{field}'")
+        for field in OPTIONAL_CARD_FIELDS:
+            if not card.get(field):
+                missing[field] += 1
+        legacy = sorted(alias for alias in CARD_ALIASES if alias in card)
+        if legacy:
+            errors.append(f"{label}: legacy fields {', '.join(legacy)}")
+
+        if card.get('id'):
+            ids.append(card['id'])
+
+        if card.get('fullNumber') and card.get('cardNumber'):
+            number, denominator = split_number(card['fullNumber'])
+            if not same_number(number, card['cardNumber']):
+                errors.append(f"{label}: fullNumber {card['fullNumber']} does not match cardNumber {card['cardNumber']}")
+            if denominator is None:
+                missing['set total in fullNumber'] += 1
+            elif total_cards is not None and denominator.isdigit() and int(denominator) > total_cards:
+                errors.append(f"{label}: fullNumber {card['fullNumber']} exceeds totalCards {total_cards}")
+
+    for field, count in sorted(missing.items()):
+        warnings.append(f"{count} cards missing {field}")
+
+    return key, ids, errors, warnings
+
+
+def validate_catalog(cards_dir=CARDS_DIR, workers=None):
+    """Validate every set in parallel. Returns {set_key: (errors, warnings)}"""
+    paths = set_files(cards_dir)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(validate_set, paths, chunksize=8))
+
+    report = {}
+    owners = defaultdict(list)
+    for key, ids, errors, warnings in results:
+        report[key] = (errors, warnings)
+        seen = set()
+        for card_id in ids:
+            if card_id in seen:
+                errors.append(f"{card_id}: duplicate id within set")
+            seen.add(card_id)
+            owners[card_id].append(key)
+
+    for card_id, keys in owners.items():
+        other_sets = sorted(set(keys))
+        if len(other_sets) > 1:
+            for key in other_sets:
+                others = ', '.join(k for k in other_sets if k != key)
+                report[key][0].append(f"{card_id}: id also used by {others}")
+
+    leftovers = backup_files(cards_dir)
+    if leftovers:
+        report['(backups)'] = ([f"leftover backup file {os.path.basename(path)}" for path in leftovers], [])
+
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Validate card catalog files')
+    parser.add_argument('--cards-dir', default=CARDS_DIR)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--strict', action='store_true', help='treat warnings as errors')
+    parser.add_argument('--quiet', action='store_true', help='only print the summary')
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    report = validate_catalog(args.cards_dir, args.workers)
+    elapsed = time.perf_counter() - started
+
+    error_count = sum(len(errors) for errors, _ in report.values())
+    warning_count = sum(len(warnings) for _, warnings in report.values())
+
+    if not args.quiet:
+        for key in sorted(report):
+            errors, warnings = report[key]
+            for message in errors:
+                print(f"✗ {key}: {message}")
+            for message in warnings:
+                print(f"⚠ {key}: {message}")
+
+    print(f"\n📊 Validated {len(set_files(args.cards_dir))} sets in {elapsed:.2f}s: "
+          f"{error_count} errors, {warning_count} warnings")
+
+    if error_count or (args.strict and warning_count):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+/**
+ * Client side of scripts/publish_catalog_deltas.py: bring a cached catalog
+ * from version N to the latest by applying the published patches in order.
+ *
+ * A cached catalog has the shape { version, sets: { [setKey]: { setInfo, cards: [] } } }.
+ * The sets page keeps a partial one (`partial: true`) in localStorage with
+ * just the sets it has opened, starting from the shards in public/catalog,
+ * whose manifest records the version they are (scripts/build_catalog_shards.py).
+ */
+
+const CATALOG_BASE_URL = '/catalog';
+const CACHE_KEY = 'catalog-cache';
+
+function applyFieldDiff(target, diff) {
+  const updated = { ...target, ...(diff.set || {}) };
+  for (const field of diff.unset || []) {
+    delete updated[field];
+  }
+  return updated;
+}
+
+/**
+ * Apply one patch to a cached catalog and return the new catalog
+ * @param {object} catalog - Cached catalog at version patch.from
+ * @param {object} patch - Patch file contents
+ * @returns {object} - Catalog at version patch.version
+ */
+export function applyCatalogPatch(catalog, patch) {
+  if (catalog.version !== patch.from) {
+    throw new Error(`Patch ${patch.version} applies to version ${patch.from}, not ${catalog.version}`);
+  }
+
+  const sets = { ...catalog.sets };
+  for (const setKey of patch.removedSets || []) {
+    delete sets[setKey];
+  }
+
+  for (const [setKey, entry] of Object.entries(patch.sets || {})) {
+    // A partial cache fetches sets it doesn't hold whole, when they are opened
+    if (catalog.partial && !sets[setKey]) continue;
+    const current = sets[setKey] || { setInfo: {}, cards: [] };
+    const removed = new Set(entry.removed || []);
+    const changed = entry.changed || {};
+
+    const cards = current.cards
+      .filter(card => !removed.has(card.id))
+      .map(card => (changed[card.id] ? applyFieldDiff(card, changed[card.id]) : card));
+
+    sets[setKey] = {
+      ...current,
+      setInfo: entry.setInfo ? applyFieldDiff(current.setInfo, entry.setInfo) : current.setInfo,
+      cards: cards.concat(entry.added || [])
+    };
+  }
+
+  return { ...catalog, version: patch.version, sets };
+}
+
+/**
+ * Fetch and apply every patch newer than the cached version
+ * @param {object} catalog - Cached catalog
+ * @returns {Promise<object|null>} - Updated catalog, or null when the cache is
+ *   too old for the retained patches and the full catalog must be refetched
+ */
+export async function updateCatalog(catalog) {
+  const response = await fetch(`${CATALOG_BASE_URL}/changelog.json`, { cache: 'no-cache' });
+  if (!response.ok) throw new Error(`Failed to load catalog changelog: HTTP ${response.status}`);
+  const changelog = await response.json();
+
+  if (catalog.version === changelog.latest) return catalog;
+  if (catalog.version < changelog.oldest) return null;
+
+  let updated = catalog;
+  for (const entry of changelog.versions) {
+    if (entry.version <= catalog.version) continue;
+    const patchResponse = await fetch(`${CATALOG_BASE_URL}/${entry.patch}`);
+    if (!patchResponse.ok) return null;
+    updated = applyCatalogPatch(updated, await patchResponse.json());
+  }
+  return updated;
+}
+
+const readCache = () => {
+  try {
+    return JSON.parse(window.localStorage.getItem(CACHE_KEY));
+  } catch (error) {
+    return null;
+  }
+};
+
+const writeCache = (catalog) => {
+  try {
+    window.localStorage.setItem(CACHE_KEY, JSON.stringify(catalog));
+  } catch (error) {
+    // Over quota: start again with only the set just opened
+    const [setKey] = Object.keys(catalog.sets).slice(-1);
+    try {
+      window.localStorage.setItem(CACHE_KEY, JSON.stringify({ ...catalog, sets: { [setKey]: catalog.sets[setKey] } }));
+    } catch (retryError) {
+      window.localStorage.removeItem(CACHE_KEY);
+    }
+  }
+};
+
+/**
+ * Load one set through the local catalog cache: a cached set is patched
+ * forward to the published version, anything else comes from its shard
+ * @param {string} setKey - Set key, e.g. 'surging-sparks'
+ * @returns {Promise<object|null>} - { ...setInfo, cards } like /api/card-matcher?set=, or null for an unknown set
+ */
+export async function loadCatalogSet(setKey) {
+  const manifestResponse = await fetch(`${CATALOG_BASE_URL}/manifest.json`, { cache: 'no-cache' });
+  if (!manifestResponse.ok) throw new Error(`Failed to load catalog manifest: HTTP ${manifestResponse.status}`);
+  const manifest = await manifestResponse.json();
+  const entry = manifest.sets[setKey];
+  if (!entry) return null;
+
+  // Unpublished shards have no version to patch from, so nothing is cached
+  const latest = manifest.catalogVersion ?? null;
+  let cache = latest === null ? null : readCache();
+  if (cache && cache.version !== latest) {
+    cache = await updateCatalog(cache).catch(() => null);
+  }
+  if (!cache || cache.version !== latest) {
+    cache = { version: latest, partial: true, sets: {} };
+  }
+
+  let set = cache.sets[setKey];
+  if (!set) {
+    const shardResponse = await fetch(`${CATALOG_BASE_URL}/${entry.shard}?v=${entry.hash}`);
+    if (!shardResponse.ok) throw new Error(`Failed to load set ${setKey}: HTTP ${shardResponse.status}`);
+    const shard = await shardResponse.json();
+    set = { setInfo: shard.setInfo, cards: shard.cards };
+    cache = { ...cache, sets: { ...cache.sets, [setKey]: set } };
+  }
+  if (latest !== null) writeCache(cache);
+  return { ...set.setInfo, cards: set.cards };
+}
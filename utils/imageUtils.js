@@ -116,4 +116,64 @@ export function getCardImageUrl(card, fallbackOptions = {}) {
   
   // Fallback to placeholder
   return getPlaceholderImageUrl(width, height, placeholderText);
-} 
\ No newline at end of file
+} 
+
+const cardAssetIndexes = {};
+
+/**
+ * Fetch a card-id keyed index from public/card-assets once per page
+ * @param {string} url - Index URL
+ * @returns {Promise<object>} - Its `cards` map ({} if it hasn't been built)
+ */
+function loadCardAssetIndex(url) {
+  if (!cardAssetIndexes[url]) {
+    cardAssetIndexes[url] = fetch(url)
+      .then(response => (response.ok ? response.json() : {}))
+      .then(index => index.cards || {})
+      .catch(() => ({}));
+  }
+  return cardAssetIndexes[url];
+}
+
+/**
+ * Load one set's card image renditions written by scripts/build_renditions.py
+ * @param {string} setKey - Set key, e.g. 'base-set'
+ * @returns {Promise<object>} - Card id -> rendition entry
+ */
+export function loadRenditionManifest(setKey) {
+  return loadCardAssetIndex(`/card-assets/${setKey}/renditions.json`);
+}
+
+/**
+ * Load one set's card image placeholders written by scripts/build_placeholders.py
+ * @param {string} setKey - Set key, e.g. 'base-set'
+ * @returns {Promise<object>} - Card id -> { width, height, color, dataUri }
+ */
+export function loadPlaceholderIndex(setKey) {
+  return loadCardAssetIndex(`/card-assets/${setKey}/placeholders.json`);
+}
+
+/**
+ * Load one set's sprite atlas coordinates written by scripts/build_atlases.py
+ * @param {string} setKey - Set key, e.g. 'base-set'
+ * @returns {Promise<object>} - Card id -> { atlas, atlasWidth, atlasHeight, x, y, w, h }
+ */
+export function loadAtlasIndex(setKey) {
+  return loadCardAssetIndex(`/card-assets/${setKey}/atlases.json`);
+}
+
+/**
+ * Build a srcset for one format of a rendition entry
+ * @param {object} entry - Rendition manifest entry
+ * @param {string} format - 'avif', 'webp' or 'jpg'
+ * @returns {string|null} - e.g. "/card-assets/base-set/renditions/001-160.webp 160w, ..."
+ */
+export function getRenditionSrcSet(entry, format) {
+  const byWidth = entry?.renditions?.[format];
+  if (!byWidth) return null;
+
+  return Object.entries(byWidth)
+    .sort(([a], [b]) => Number(a) - Number(b))
+    .map(([width, url]) => `${url} ${width}w`)
+    .join(', ');
+}
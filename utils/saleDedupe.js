@@ -0,0 +1,79 @@
+// Sale fingerprints and cross-marketplace de-duplication
+//
+// The uk and us searches often return the same sold listing. A sale is
+// identified by its eBay listing id, or, when the URL has none, by its
+// normalized title, price and sold date: the same fingerprint as
+// scripts/sale_dedupe.py, whose persistent Bloom filters keep the scraped
+// sales history free of repeats across runs.
+
+const LISTING_ID_PATTERN = /\/itm\/(?:[^/?#]+\/)?(\d{9,})/i;
+const PRICE_PATTERN = /(US\s*)?([£$€])\s?([\d,]+(?:\.\d{1,2})?)/i;
+const SOLD_DATE_PATTERN = /(\d{1,2})\s+([A-Za-z]{3})[a-z]*,?\s+(\d{4})/;
+const CURRENCY_SYMBOLS = { '£': 'GBP', $: 'USD', '€': 'EUR' };
+const MARKETPLACE_CURRENCIES = { uk: 'GBP', us: 'USD' };
+const MONTHS = ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'];
+
+const normalizeText = (value = '') =>
+  String(value)
+    .normalize('NFKD')
+    .replace(/[\u0300-\u036f]/g, '')
+    .toLowerCase()
+    .replace(/\s+/g, ' ')
+    .trim();
+
+const priceKey = (sale) => {
+  const fallback = MARKETPLACE_CURRENCIES[sale.marketplace] || 'GBP';
+  if (typeof sale.price === 'number') return `${sale.price.toFixed(2)} ${fallback}`;
+  const match = PRICE_PATTERN.exec(String(sale.price || ''));
+  if (!match) return `0.00 ${fallback}`;
+  return `${parseFloat(match[3].replace(/,/g, '')).toFixed(2)} ${CURRENCY_SYMBOLS[match[2]]}`;
+};
+
+const soldDay = (sale) => {
+  for (const field of ['soldAt', 'soldDate']) {
+    const value = sale[field];
+    if (value && /^\d{4}-\d{2}-\d{2}/.test(String(value))) return String(value).slice(0, 10);
+  }
+  for (const field of ['soldDate', 'soldInfo']) {
+    const match = SOLD_DATE_PATTERN.exec(String(sale[field] || ''));
+    const month = match ? MONTHS.indexOf(match[2].toLowerCase()) : -1;
+    if (month >= 0) {
+      return `${match[3]}-${String(month + 1).padStart(2, '0')}-${match[1].padStart(2, '0')}`;
+    }
+  }
+  return '';
+};
+
+export function listingIdFromSale(sale) {
+  if (sale.listingId) return String(sale.listingId);
+  const match = LISTING_ID_PATTERN.exec(sale.listingUrl || '');
+  return match ? match[1] : '';
+}
+
+// 'id:<listing id>', else 'fp:<normalized title>|<amount currency>|<sold date>'
+export function saleFingerprint(sale) {
+  const listingId = listingIdFromSale(sale);
+  if (listingId) return `id:${listingId}`;
+  return `fp:${normalizeText(sale.title)}|${priceKey(sale)}|${soldDay(sale)}`;
+}
+
+// First occurrence of each fingerprint, in order; the marketplaces a sale
+// was seen on are kept in `seenOn`
+export function dedupeSales(sales) {
+  const byFingerprint = new Map();
+  const unique = [];
+  for (const sale of sales) {
+    const key = saleFingerprint(sale);
+    const existing = byFingerprint.get(key);
+    if (existing) {
+      if (sale.marketplace && !existing.seenOn.includes(sale.marketplace)) {
+        existing.seenOn.push(sale.marketplace);
+      }
+      continue;
+    }
+    const kept = { ...sale, seenOn: sale.marketplace ? [sale.marketplace] : [] };
+    byFingerprint.set(key, kept);
+    unique.push(kept);
+  }
+  return { sales: unique, duplicates: sales.length - unique.length };
+}
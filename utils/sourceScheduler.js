@@ -0,0 +1,269 @@
+// Adaptive ordering, hedging and circuit breaking for scraper sources
+//
+// Every attempt records its outcome per `<marketplace>:<source>`: a decayed
+// success rate, a latency histogram and the average item yield. The next
+// scrape tries sources in order of expected items per second, starts a
+// second source once the first has run past its own p90 latency (at most
+// MAX_IN_FLIGHT at a time, so eBay isn't hammered), and skips sources whose
+// breaker is open after repeated failures. Stats persist to a small JSON file.
+
+import fs from 'fs';
+import path from 'path';
+
+const IS_SERVERLESS = !!(process.env.VERCEL || process.env.AWS_LAMBDA_FUNCTION_VERSION);
+const STATS_PATH =
+  process.env.SCRAPER_STATS_PATH ||
+  (IS_SERVERLESS ? '/tmp/scraper-source-stats.json' : path.join(process.cwd(), 'data', 'scraper-source-stats.json'));
+const STATS_VERSION = 1;
+
+// Upper bounds (ms) of the latency histogram buckets; the last one is open-ended
+const LATENCY_BUCKETS_MS = [250, 500, 1000, 1500, 2000, 3000, 4000, 6000, 8000, 10000, 15000, Infinity];
+// Weight kept by old observations on each new one, so stats follow eBay's moods
+const DECAY = 0.95;
+// Below this many (decayed) samples the p90 is a guess; hedge after the default instead
+const MIN_SAMPLES = 3;
+const DEFAULT_HEDGE_MS = 2000;
+const MAX_IN_FLIGHT = 2;
+// Share of scrapes that lead with the least-sampled healthy source, so a
+// source that was never tried (or recovered) gets measured
+const EXPLORE_RATE = 0.05;
+// Consecutive failures that open the breaker, and how long it stays open
+const BREAKER_THRESHOLD = 3;
+const BREAKER_COOLDOWN_MS = 60 * 1000;
+const BREAKER_MAX_COOLDOWN_MS = 15 * 60 * 1000;
+
+let stats = null;
+let saveTimer = null;
+
+function emptyStats() {
+  return { version: STATS_VERSION, sources: {} };
+}
+
+function loadStats() {
+  if (stats) return stats;
+  try {
+    const parsed = JSON.parse(fs.readFileSync(STATS_PATH, 'utf8'));
+    stats = parsed.version === STATS_VERSION ? parsed : emptyStats();
+  } catch (error) {
+    stats = emptyStats();
+  }
+  return stats;
+}
+
+function scheduleSave() {
+  if (saveTimer) return;
+  saveTimer = setTimeout(() => {
+    saveTimer = null;
+    try {
+      fs.mkdirSync(path.dirname(STATS_PATH), { recursive: true });
+      const tmpPath = `${STATS_PATH}.${process.pid}.tmp`;
+      fs.writeFileSync(tmpPath, JSON.stringify(stats));
+      fs.renameSync(tmpPath, STATS_PATH);
+    } catch (error) {
+      console.log('Could not persist scraper source stats:', error.message);
+    }
+  }, 250);
+  saveTimer.unref?.();
+}
+
+function sourceStats(key) {
+  const all = loadStats().sources;
+  if (!all[key]) {
+    all[key] = {
+      samples: 0,
+      successes: 0,
+      itemTotal: 0,
+      latency: LATENCY_BUCKETS_MS.map(() => 0),
+      consecutiveFailures: 0,
+      openUntil: 0,
+      cooldownMs: BREAKER_COOLDOWN_MS,
+      lastError: null,
+      updatedAt: null
+    };
+  }
+  return all[key];
+}
+
+/**
+ * Latency (ms) below which `quantile` of a source's attempts finished
+ * @param {Object} entry - Stats for one source
+ * @param {number} quantile - e.g. 0.9
+ * @returns {number|null} Bucket upper bound, or null without enough samples
+ */
+export function latencyQuantile(entry, quantile) {
+  const total = entry.latency.reduce((sum, count) => sum + count, 0);
+  if (total < MIN_SAMPLES) return null;
+  let cumulative = 0;
+  for (let i = 0; i < LATENCY_BUCKETS_MS.length; i++) {
+    cumulative += entry.latency[i];
+    if (cumulative >= quantile * total) {
+      // The open-ended bucket has no bound; report the last finite one
+      return Number.isFinite(LATENCY_BUCKETS_MS[i]) ? LATENCY_BUCKETS_MS[i] : LATENCY_BUCKETS_MS[i - 1];
+    }
+  }
+  return LATENCY_BUCKETS_MS[LATENCY_BUCKETS_MS.length - 2];
+}
+
+/**
+ * Expected items per second; untried sources start from a neutral prior
+ */
+function score(entry) {
+  const successRate = (entry.successes + 1) / (entry.samples + 2);
+  const yieldPerAttempt = entry.samples > 0 ? entry.itemTotal / entry.samples : 30;
+  const p50 = latencyQuantile(entry, 0.5) ?? DEFAULT_HEDGE_MS;
+  return (successRate * (yieldPerAttempt + 1)) / (p50 / 1000);
+}
+
+function isOpen(entry, now = Date.now()) {
+  return entry.openUntil > now;
+}
+
+/**
+ * Record one attempt's outcome
+ * @param {string} key - `<marketplace>:<source>`
+ * @param {{ ms: number, count?: number, error?: string }} outcome - An empty result counts as a failure
+ */
+export function recordAttempt(key, { ms, count = 0, error = null }) {
+  const entry = sourceStats(key);
+  const success = !error && count > 0;
+
+  entry.samples = entry.samples * DECAY + 1;
+  entry.successes = entry.successes * DECAY + (success ? 1 : 0);
+  entry.itemTotal = entry.itemTotal * DECAY + count;
+  const bucket = LATENCY_BUCKETS_MS.findIndex((bound) => ms <= bound);
+  entry.latency = entry.latency.map((value, i) => value * DECAY + (i === bucket ? 1 : 0));
+  entry.updatedAt = new Date().toISOString();
+
+  if (success) {
+    entry.consecutiveFailures = 0;
+    entry.openUntil = 0;
+    entry.cooldownMs = BREAKER_COOLDOWN_MS;
+    entry.lastError = null;
+  } else {
+    entry.consecutiveFailures += 1;
+    entry.lastError = error || 'No items';
+    if (entry.consecutiveFailures >= BREAKER_THRESHOLD) {
+      // Open (or re-open after a failed half-open trial) with a growing cooldown
+      entry.openUntil = Date.now() + entry.cooldownMs;
+      entry.cooldownMs = Math.min(entry.cooldownMs * 2, BREAKER_MAX_COOLDOWN_MS);
+    }
+  }
+  scheduleSave();
+}
+
+/**
+ * Order sources for a scrape: healthy ones by score, configured order breaking ties,
+ * occasionally led by the least-sampled one. Sources behind an open breaker are
+ * skipped unless every source is open.
+ * @param {string} scope - Marketplace key
+ * @param {Array<[string, Function]>} sources - [name, attempt] pairs in configured order
+ * @returns {{ ordered: Array<[string, Function]>, skipped: string[] }}
+ */
+export function planSources(scope, sources) {
+  const now = Date.now();
+  const ranked = sources
+    .map(([name, attempt], index) => ({ name, attempt, index, entry: sourceStats(`${scope}:${name}`) }))
+    .sort((a, b) => score(b.entry) - score(a.entry) || a.index - b.index);
+  const healthy = ranked.filter(({ entry }) => !isOpen(entry, now));
+  if (healthy.length > 1 && Math.random() < EXPLORE_RATE) {
+    const least = healthy.reduce((min, candidate) => (candidate.entry.samples < min.entry.samples ? candidate : min));
+    healthy.splice(healthy.indexOf(least), 1);
+    healthy.unshift(least);
+  }
+  const ordered = healthy.length > 0 ? healthy : ranked;
+  return {
+    ordered: ordered.map(({ name, attempt }) => [name, attempt]),
+    skipped: healthy.length > 0 ? ranked.filter(({ entry }) => isOpen(entry, now)).map(({ name }) => name) : []
+  };
+}
+
+/**
+ * Run sources until one returns items, hedging slow attempts.
+ *
+ * The first source starts immediately. Another starts as soon as a running
+ * attempt fails or comes back empty, or when the newest one outlives its p90
+ * latency. The first non-empty result wins; attempts still in flight finish in
+ * the background and are recorded too.
+ * @param {string} scope - Marketplace key
+ * @param {Array<[string, Function]>} sources - [name, attempt] pairs; attempt() resolves to items
+ * @param {Function} [onAttempt] - Called with { source, count, error, ms, hedged } per finished attempt
+ * @returns {Promise<{ source: string, data: Array, skipped: string[] }>}
+ */
+export function runScheduled(scope, sources, onAttempt = () => {}) {
+  const { ordered, skipped } = planSources(scope, sources);
+
+  return new Promise((resolve) => {
+    let next = 0;
+    let inFlight = 0;
+    let settled = false;
+    let hedgeTimer = null;
+
+    const finish = (result) => {
+      if (settled) return;
+      settled = true;
+      clearTimeout(hedgeTimer);
+      resolve({ ...result, skipped });
+    };
+
+    const launch = (hedged = false) => {
+      if (settled || next >= ordered.length || inFlight >= MAX_IN_FLIGHT) return;
+      const [source, attempt] = ordered[next++];
+      const key = `${scope}:${source}`;
+      const started = Date.now();
+      inFlight += 1;
+
+      clearTimeout(hedgeTimer);
+      const hedgeAfter = latencyQuantile(sourceStats(key), 0.9) ?? DEFAULT_HEDGE_MS;
+      hedgeTimer = setTimeout(() => launch(true), hedgeAfter);
+
+      Promise.resolve()
+        .then(attempt)
+        .then(
+          (data) => ({ data: Array.isArray(data) ? data : [], error: null }),
+          (error) => ({ data: [], error: error.message || String(error) })
+        )
+        .then(({ data, error }) => {
+          const ms = Date.now() - started;
+          inFlight -= 1;
+          recordAttempt(key, { ms, count: data.length, error });
+          onAttempt({ source, count: data.length, error, ms, hedged, late: settled });
+          if (data.length > 0) {
+            finish({ source, data });
+          } else if (next < ordered.length) {
+            launch();
+          } else if (inFlight === 0) {
+            finish({ source: 'none', data: [] });
+          }
+        });
+    };
+
+    if (ordered.length === 0) {
+      finish({ source: 'none', data: [] });
+    } else {
+      launch();
+    }
+  });
+}
+
+/**
+ * Stats snapshot for debug output: success rate, p50/p90, yield and breaker state per source
+ * @param {string} [scope] - Only sources for this marketplace
+ */
+export function describeSources(scope) {
+  const now = Date.now();
+  return Object.fromEntries(
+    Object.entries(loadStats().sources)
+      .filter(([key]) => !scope || key.startsWith(`${scope}:`))
+      .map(([key, entry]) => [
+        key,
+        {
+          successRate: entry.samples > 0 ? Number((entry.successes / entry.samples).toFixed(3)) : null,
+          p50Ms: latencyQuantile(entry, 0.5),
+          p90Ms: latencyQuantile(entry, 0.9),
+          avgItems: entry.samples > 0 ? Number((entry.itemTotal / entry.samples).toFixed(1)) : null,
+          breaker: isOpen(entry, now) ? 'open' : entry.consecutiveFailures > 0 ? 'degraded' : 'closed',
+          lastError: entry.lastError
+        }
+      ])
+  );
+}
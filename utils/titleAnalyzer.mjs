@@ -0,0 +1,92 @@
+// Single-pass analysis of sold-listing titles
+//
+// One compiled regex with an alternative per signal (grader + grade, grader
+// alone, variant, language, lot, proxy) is run once over the normalized
+// title with matchAll; every hit just sets a field. This replaces the
+// separate includes() checks of detectVariant and lets sales be bucketed by
+// grader and grade, so a TAG 10 and a TAG 8.5 of the same card aren't
+// averaged together.
+
+const GRADERS = { tag: 'TAG', psa: 'PSA', bgs: 'BGS', beckett: 'BGS', cgc: 'CGC' };
+const LANGUAGES = {
+  japanese: 'Japanese', japan: 'Japanese', jpn: 'Japanese', jp: 'Japanese',
+  korean: 'Korean', kor: 'Korean',
+  chinese: 'Chinese', chn: 'Chinese',
+  german: 'German', french: 'French', italian: 'Italian', spanish: 'Spanish'
+};
+const GRADER = '(?:tag(?!\\s*team)|psa|bgs|beckett|cgc)';
+
+const TITLE_PATTERN = new RegExp(
+  [
+    // "tag 9.5", "graded tag 10", "psa gem mint 10", "tag graded 8.5", "tag 9.0"; not "tag 10/147"
+    `\\b(?:graded\\s*[-_:]?\\s*)?(?<grader>${GRADER})\\s*[-_:]?\\s*(?:graded\\s*|gem\\s*mint\\s*|mint\\s*|pristine\\s*)?(?<grade>10(?:\\.0)?|[1-9](?:\\.[05])?)(?![\\d./])`,
+    // "tag graded", "graded tag", "psa" without a readable grade
+    `\\b(?:graded\\s*[-_:]?\\s*)?(?<graderOnly>${GRADER})\\b`,
+    '\\b(?<rainbow>rainbow|secret)\\b',
+    '\\b(?<fullArt>full\\s*art|alt(?:ernate)?\\s*art)\\b',
+    `\\b(?<language>${Object.keys(LANGUAGES).join('|')})\\b`,
+    '\\b(?<lot>lot of|bundle of|collection of|job lot|bulk lot)\\b',
+    '\\b(?<proxy>proxy|replica|custom|fan\\s*art|orica)\\b'
+  ].join('|'),
+  'g'
+);
+
+export function normalizeTitle(title = '') {
+  return String(title)
+    .toLowerCase()
+    .normalize('NFKD')
+    .replace(/[\u0300-\u036f]/g, '')
+    .replace(/\s+/g, ' ')
+    .trim();
+}
+
+// { grader, grade, gradeKey, variant, language, isLot, isProxy } for one title
+export function analyzeTitle(title) {
+  let grader = null;
+  let grade = null;
+  let rainbow = false;
+  let fullArt = false;
+  let language = null;
+  let isLot = false;
+  let isProxy = false;
+
+  for (const match of normalizeTitle(title).matchAll(TITLE_PATTERN)) {
+    const groups = match.groups;
+    if (groups.grade) {
+      // The first grader that comes with a grade wins over a bare mention
+      if (grade === null) {
+        grader = GRADERS[groups.grader];
+        grade = parseFloat(groups.grade);
+      }
+    } else if (groups.graderOnly) {
+      grader = grader || GRADERS[groups.graderOnly];
+    } else if (groups.rainbow) {
+      rainbow = true;
+    } else if (groups.fullArt) {
+      fullArt = true;
+    } else if (groups.language) {
+      language = language || LANGUAGES[groups.language];
+    } else if (groups.lot) {
+      isLot = true;
+    } else if (groups.proxy) {
+      isProxy = true;
+    }
+  }
+
+  return {
+    grader,
+    grade,
+    gradeKey: gradeKey(grader, grade),
+    // Same precedence as the old detectVariant
+    variant: rainbow ? 'Rainbow Rare' : fullArt ? 'Full Art' : 'Regular',
+    language: language || 'English',
+    isLot,
+    isProxy
+  };
+}
+
+// Stats bucket for a grade: "TAG 10", "PSA" (grade unreadable) or "Ungraded"
+export function gradeKey(grader, grade) {
+  if (!grader) return 'Ungraded';
+  return grade === null ? grader : `${grader} ${grade}`;
+}